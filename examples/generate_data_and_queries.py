@@ -115,7 +115,7 @@ def generate_test_queries():
         'domain_mix': domain_mix
     }
     
-    generator.save_queries('data/test_queries.json', metadata=metadata)
+    generator.save_queries('data/test_queries.jsonl', metadata=metadata)
     generator.display_queries(max_display=15)
     
     # Show distribution
@@ -140,7 +140,7 @@ def load_and_use_data():
     
     # Load queries
     query_gen = QueryGenerator()
-    queries = query_gen.load_queries('data/test_queries.json')
+    queries = query_gen.load_queries('data/test_queries.jsonl')
     print(f"Loaded {len(queries)} test queries")
     
     return dataset, queries
@@ -16,11 +16,11 @@ from .config import (
 )
 from .logging import setup_logging, get_logger, LoggerMixin, ProgressLogger, Timer
 from .qdrant_manager import QdrantCollectionManager
-from .embeddings import EmbeddingService
-from .uploader import DataUploader
-from .benchmarking import PerformanceBenchmark
+from .embeddings import EmbeddingCache, EmbeddingService, OnnxEmbeddingBackend
+from .uploader import CircuitOpenError, DataUploader, close_shared_clients
+from .benchmarking import PerformanceBenchmark, Metrics
 from .visualization import BenchmarkVisualizer
-from .data_generator import DatasetGenerator
+from .data_generator import Dataset, DatasetGenerator
 from .query_generator import QueryGenerator
 
 __all__ = [
@@ -38,10 +38,16 @@ __all__ = [
     "ProgressLogger",
     "Timer",
     "QdrantCollectionManager",
+    "EmbeddingCache",
+    "OnnxEmbeddingBackend",
     "EmbeddingService",
     "DataUploader",
+    "CircuitOpenError",
+    "close_shared_clients",
     "PerformanceBenchmark",
+    "Metrics",
     "BenchmarkVisualizer",
+    "Dataset",
     "DatasetGenerator",
     "QueryGenerator",
 ]
\ No newline at end of file
@@ -3,7 +3,7 @@ Performance benchmarking operations for Qdrant collections.
 """
 
 import time
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, NamedTuple, Union
 import numpy as np
 from qdrant_client import QdrantClient, models
 
@@ -11,6 +11,51 @@ from .config import BenchmarkConfig
 from .embeddings import EmbeddingService
 
 
+class Metrics(NamedTuple):
+    """Latency metrics (milliseconds) for a single benchmark run."""
+    avg: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    p995: float
+    p999: float = float("nan")
+    
+    # Serialized key for each field (results files use "p99.5"/"p99.9")
+    _KEYS = {
+        "avg": "avg",
+        "p50": "p50",
+        "p90": "p90",
+        "p95": "p95",
+        "p99": "p99",
+        "p995": "p99.5",
+        "p999": "p99.9",
+    }
+    
+    @classmethod
+    def from_dict(cls, data: Union["Metrics", Dict[str, float]]) -> "Metrics":
+        """
+        Build metrics from a serialized dictionary.
+        
+        Args:
+            data: Dictionary keyed as in results files (or an existing Metrics)
+            
+        Returns:
+            Metrics instance
+        """
+        if isinstance(data, cls):
+            return data
+        return cls(**{
+            field: data[key]
+            for field, key in cls._KEYS.items()
+            if key in data
+        })
+    
+    def as_dict(self) -> Dict[str, float]:
+        """Return metrics as a dictionary keyed as in results files."""
+        return {key: getattr(self, field) for field, key in self._KEYS.items()}
+
+
 class PerformanceBenchmark:
     """Benchmark performance of Qdrant collections."""
     
@@ -63,7 +108,7 @@ class PerformanceBenchmark:
         using: Optional[str] = None,
         label: str = "Benchmark",
         search_params: Optional[models.SearchParams] = None
-    ) -> Dict[str, float]:
+    ) -> Metrics:
         """
         Measure search performance across multiple queries.
         
@@ -75,7 +120,7 @@ class PerformanceBenchmark:
             search_params: Optional search parameters (for quantization)
             
         Returns:
-            Dictionary with latency percentiles
+            Latency metrics
         """
         if test_queries is None:
             test_queries = self.config.test_queries
@@ -117,7 +162,7 @@ class PerformanceBenchmark:
         collection_name: str,
         test_queries: Optional[List[str]] = None,
         method_name: str = "quantized"
-    ) -> Dict[str, Dict[str, float]]:
+    ) -> Dict[str, Metrics]:
         """
         Benchmark quantized collection with and without rescoring.
         
@@ -293,7 +338,7 @@ class PerformanceBenchmark:
         
         return results
     
-    def _calculate_metrics(self, latencies: List[float]) -> Dict[str, float]:
+    def _calculate_metrics(self, latencies: List[float]) -> Metrics:
         """
         Calculate statistical metrics from latency measurements.
         
@@ -301,30 +346,30 @@ class PerformanceBenchmark:
             latencies: List of latency measurements in milliseconds
             
         Returns:
-            Dictionary with calculated metrics
+            Calculated metrics
         """
-        return {
-            "avg": np.mean(latencies),
-            "p50": np.percentile(latencies, 50),
-            "p90": np.percentile(latencies, 90),
-            "p95": np.percentile(latencies, 95),
-            "p99": np.percentile(latencies, 99),
-            "p99.5": np.percentile(latencies, 99.5),
-            "p99.9": np.percentile(latencies, 99.9)
-        }
+        return Metrics(
+            avg=float(np.mean(latencies)),
+            p50=float(np.percentile(latencies, 50)),
+            p90=float(np.percentile(latencies, 90)),
+            p95=float(np.percentile(latencies, 95)),
+            p99=float(np.percentile(latencies, 99)),
+            p995=float(np.percentile(latencies, 99.5)),
+            p999=float(np.percentile(latencies, 99.9))
+        )
     
-    def _print_metrics(self, label: str, metrics: Dict[str, float]) -> None:
+    def _print_metrics(self, label: str, metrics: Metrics) -> None:
         """
         Print metrics in a formatted way.
         
         Args:
             label: Label for this metric set
-            metrics: Dictionary of metrics
+            metrics: Metrics to print
         """
         print(f"{label}:")
-        print(f"  P50:     {metrics['p50']:.2f}ms")
-        print(f"  P90:     {metrics['p90']:.2f}ms")
-        print(f"  P95:     {metrics['p95']:.2f}ms")
-        print(f"  P99:     {metrics['p99']:.2f}ms")
-        print(f"  P99.5:   {metrics['p99.5']:.2f}ms")
-        print(f"  P99.9:   {metrics['p99.9']:.2f}ms")
\ No newline at end of file
+        print(f"  P50:     {metrics.p50:.2f}ms")
+        print(f"  P90:     {metrics.p90:.2f}ms")
+        print(f"  P95:     {metrics.p95:.2f}ms")
+        print(f"  P99:     {metrics.p99:.2f}ms")
+        print(f"  P99.5:   {metrics.p995:.2f}ms")
+        print(f"  P99.9:   {metrics.p999:.2f}ms")
\ No newline at end of file
@@ -6,6 +6,7 @@ import argparse
 import sys
 import json
 from pathlib import Path
+from typing import List
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
 
@@ -16,12 +17,12 @@ from .embeddings import EmbeddingService
 from .uploader import DataUploader
 from .benchmarking import PerformanceBenchmark
 from .visualization import BenchmarkVisualizer
-from .data_generator import DatasetGenerator
+from .data_generator import Dataset, DatasetGenerator
 from .query_generator import QueryGenerator
 
 
-def cmd_generate_data(args: argparse.Namespace) -> None:
-    """Generate test dataset."""
+def cmd_generate_data(args: argparse.Namespace) -> Dataset:
+    """Generate test dataset and return the generated items."""
     log = setup_logging(
         level=args.log_level,
         json_output=args.json_logs,
@@ -47,10 +48,12 @@ def cmd_generate_data(args: argparse.Namespace) -> None:
                 items=len(dataset),
                 output=args.output,
                 domain_mix=domain_mix)
+    
+    return dataset
 
 
-def cmd_generate_queries(args: argparse.Namespace) -> None:
-    """Generate test queries."""
+def cmd_generate_queries(args: argparse.Namespace) -> List[str]:
+    """Generate test queries and return the saved query list."""
     log = setup_logging(
         level=args.log_level,
         json_output=args.json_logs,
@@ -84,8 +87,10 @@ def cmd_generate_queries(args: argparse.Namespace) -> None:
             generator.display_queries()
         
         log.info("queries_generated",
-                count=len(generator.queries),
+                count=len(generator),
                 output=args.output)
+    
+    return generator.get_queries()
 
 
 def cmd_upload(args: argparse.Namespace) -> None:
@@ -108,12 +113,14 @@ def cmd_upload(args: argparse.Namespace) -> None:
         config = BenchmarkSuiteConfig.from_env(logging_config)
         config.upload.batch_size = args.batch_size
         config.upload.enable_retry = args.enable_retry
+        config.upload.pool_size = args.pool_size
         
         log.info("upload_started",
                 collection=args.collection,
                 dataset=args.dataset,
                 batch_size=args.batch_size,
-                retry_enabled=args.enable_retry)
+                retry_enabled=args.enable_retry,
+                pool_size=args.pool_size)
         
         # Initialize clients
         client = QdrantClient(
@@ -206,7 +213,7 @@ def cmd_benchmark(args: argparse.Namespace) -> None:
             using="dense",
             label="Baseline (No Quantization)"
         )
-        log.info("baseline_completed", metrics=baseline_metrics)
+        log.info("baseline_completed", metrics=baseline_metrics.as_dict())
         
         # Run quantization benchmarks if requested
         quantization_results = {}
@@ -225,8 +232,11 @@ def cmd_benchmark(args: argparse.Namespace) -> None:
         # Save results
         if args.output:
             results = {
-                "baseline": baseline_metrics,
-                "quantization": quantization_results
+                "baseline": baseline_metrics.as_dict(),
+                "quantization": {
+                    method: {mode: metrics.as_dict() for mode, metrics in method_results.items()}
+                    for method, method_results in quantization_results.items()
+                }
             }
             
             output_path = Path(args.output)
@@ -389,7 +399,7 @@ Examples:
   qdrant-qbench generate-data --size 10000 --output data/dataset.json
   
   # Generate queries
-  qdrant-qbench generate-queries --num-queries 20 --output data/queries.json
+  qdrant-qbench generate-queries --num-queries 20 --output data/queries.jsonl
   
   # Upload to Qdrant
   qdrant-qbench upload --collection test --dataset data/dataset.json
@@ -398,7 +408,7 @@ Examples:
   qdrant-qbench create-quantized --dataset data/dataset.json --methods scalar binary
   
   # Run benchmarks
-  qdrant-qbench benchmark --collection test --queries data/queries.json --quantization scalar binary
+  qdrant-qbench benchmark --collection test --queries data/queries.jsonl --quantization scalar binary
   
   # Generate visualization
   qdrant-qbench visualize --results results.json --output report.png
@@ -429,7 +439,7 @@ Note: You can use either 'qdrant-qbench' (short) or 'qdrant-quantization-benchma
     # Generate queries command
     gen_queries = subparsers.add_parser('generate-queries', help='Generate test queries')
     gen_queries.add_argument('-n','--num-queries', type=int, default=20, help='Number of queries')
-    gen_queries.add_argument('-o', '--output', default='data/queries.json', help='Output file path')
+    gen_queries.add_argument('-o', '--output', default='data/queries.jsonl', help='Output file path')
     gen_queries.add_argument('--tech', type=float, default=0.25, help='Tech query proportion')
     gen_queries.add_argument('--medical', type=float, default=0.25, help='Medical query proportion')
     gen_queries.add_argument('--pharma', type=float, default=0.25, help='Pharmaceutical proportion')
@@ -444,6 +454,7 @@ Note: You can use either 'qdrant-qbench' (short) or 'qdrant-quantization-benchma
     upload.add_argument('-d', '--dataset', required=True, help='Dataset file path')
     upload.add_argument('-b', '--batch-size', type=int, default=50, help='Batch size for upload')
     upload.add_argument('--enable-retry', action='store_true', help='Enable retry on timeout')
+    upload.add_argument('--pool-size', type=int, default=1, help='Concurrent upserts in flight (default: 1)')
     upload.add_argument('--recreate', action='store_true', help='Recreate collection if exists')
     add_logging_arguments(upload)
     
@@ -4,7 +4,7 @@ Configuration management for Qdrant benchmark suite.
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, Optional, Sequence
 from qdrant_client import models
 
 
@@ -22,6 +22,28 @@ class EmbeddingConfig:
     """Configuration for embedding model."""
     model_name: str = "all-MiniLM-L6-v2"
     vector_size: int = 384
+    cache_path: Optional[str] = None  # SQLite file for cached embeddings (disabled if None)
+    device: Optional[str] = None  # e.g. "cuda", "cpu"; None picks CUDA when available
+    fp16: bool = False  # Half-precision weights (CUDA only)
+    backend: str = "sentence-transformers"  # or "onnx" (int8-quantized, CPU)
+    onnx_dir: Optional[str] = None  # Where the ONNX export is kept (default: models/onnx/<model>)
+    torch_threads: Optional[int] = None  # Intra-op CPU threads (None keeps the torch default)
+    multi_process: bool = False  # Spread CPU batch encoding over worker processes
+    num_workers: Optional[int] = None  # Worker processes (default: os.cpu_count())
+    output_dim: Optional[int] = None  # Truncate to this many dimensions (Matryoshka models)
+    
+    def __post_init__(self) -> None:
+        """Validate the truncation size."""
+        if self.output_dim is not None and not 0 < self.output_dim <= self.vector_size:
+            raise ValueError(
+                f"output_dim must be between 1 and vector_size ({self.vector_size}), "
+                f"got {self.output_dim}"
+            )
+    
+    @property
+    def effective_vector_size(self) -> int:
+        """Dimension of the stored vectors (output_dim when truncating)."""
+        return self.output_dim or self.vector_size
     
 
 @dataclass
@@ -39,6 +61,15 @@ class UploadConfig:
     enable_retry: bool = False
     max_retries: int = 3
     initial_backoff: float = 2.0
+    max_backoff: float = 30.0  # Cap on a single retry wait (seconds)
+    jitter: bool = False  # Full jitter: wait a random time up to the backoff
+    pool_size: int = 1  # Concurrent upserts in flight (1 uploads batches serially)
+    breaker_threshold: int = 0  # Consecutive failed upserts that stop further attempts (0 disables)
+    breaker_cooldown: float = 30.0  # Seconds before a single probe upsert is allowed again
+    skip_seen: bool = False  # Skip batches whose points (ID, vector, payload) this uploader already upserted to the collection
+    use_grpc_raw: bool = False  # Build gRPC points directly (uploaders created with prefer_grpc=True only)
+    adaptive: bool = False  # Double the batch after each success, halve it after a failure (serial upload)
+    max_batch_size: int = 1000  # Upper bound on the adaptive batch size
     
 
 @dataclass
@@ -46,14 +77,15 @@ class BenchmarkConfig:
     """Configuration for benchmarking."""
     warmup_enabled: bool = True
     limit: int = 10
-    oversampling_factors: List[float] = field(default_factory=lambda: [2.0, 3.0, 5.0, 8.0, 10.0])
-    test_queries: List[str] = field(default_factory=lambda: [
+    # Immutable defaults are shared by every instance; pass a list to override
+    oversampling_factors: Sequence[float] = (2.0, 3.0, 5.0, 8.0, 10.0)
+    test_queries: Sequence[str] = (
         "python machine learning tutorial",
         "javascript web development",
         "learn rust programming security",
         "intermediate algorithms and data structures",
         "practical examples best practices"
-    ])
+    )
 
 
 @dataclass
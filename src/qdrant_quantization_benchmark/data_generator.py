@@ -4,10 +4,150 @@ Supports tech, medical, pharmaceutical, and health insurance items.
 """
 
 import random
-import json
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import IO, List, Dict, Any, Iterable, Iterator, Tuple, Union
 from pathlib import Path
 
+import numpy as np
+
+from . import json_io
+
+
+DOMAINS: Tuple[str, ...] = ("tech", "medical", "pharmaceutical", "health_insurance")
+
+# Per-domain vocabularies, built once at import rather than on every item
+_TECH_LANGUAGES = ("Python", "JavaScript", "Java", "C++", "Ruby", "Go", "Rust",
+                   "TypeScript", "Kotlin", "Swift", "PHP", "C#", "Scala", "R")
+_TECH_TOPICS = ("web development", "data science", "machine learning", "algorithms",
+                "system design", "testing", "security", "DevOps", "mobile apps",
+                "game development", "embedded systems", "cloud computing", "AI/ML",
+                "blockchain", "microservices", "containerization", "API design")
+_TECH_INTRO_PHRASES = (
+    "Comprehensive guide to", "Learn", "Master", "Deep dive into",
+    "Practical introduction to", "Advanced techniques for", "Getting started with",
+    "Professional", "Essential", "Complete", "Hands-on", "Modern approach to"
+)
+_TECH_DETAIL_PHRASES = (
+    "Covers practical examples, best practices, and real-world applications.",
+    "Includes hands-on projects and code samples throughout.",
+    "Features expert insights and industry-tested patterns.",
+    "Step-by-step tutorials with detailed explanations.",
+    "Real-world case studies and production-ready code.",
+    "Comprehensive coverage from basics to advanced concepts.",
+    "Interactive exercises and project-based learning.",
+    "Industry-standard techniques and cutting-edge practices.",
+    "Battle-tested solutions for modern development challenges."
+)
+_TECH_AUDIENCE_PHRASES = (
+    "Suitable for intermediate developers",
+    "Perfect for beginners and intermediate programmers",
+    "Designed for experienced developers",
+    "Ideal for software engineers",
+    "Great for aspiring professionals",
+    "Built for self-learners and bootcamp students",
+    "Tailored for enterprise developers"
+)
+_TECH_DIFFICULTIES = ("beginner", "intermediate", "advanced")
+
+_MEDICAL_SPECIALTIES = ("Cardiology", "Neurology", "Oncology", "Pediatrics", "Surgery",
+                        "Radiology", "Psychiatry", "Dermatology", "Orthopedics", "Endocrinology",
+                        "Gastroenterology", "Pulmonology", "Nephrology", "Rheumatology")
+_MEDICAL_TOPICS = ("diagnosis", "treatment protocols", "patient management", "clinical practice",
+                   "surgical techniques", "emergency medicine", "preventive care", "pathology",
+                   "pharmacotherapy", "diagnostic imaging", "interventional procedures")
+_MEDICAL_FORMATS = ("Textbook", "Clinical Guide", "Reference Manual", "Handbook", "Atlas",
+                    "Case Studies", "Review", "Protocols", "Guidelines")
+_MEDICAL_AUDIENCES = ("medical students", "residents", "practicing physicians", "specialists",
+                      "healthcare professionals", "clinical researchers")
+
+_PHARMA_DRUG_CLASSES = ("Antibiotic", "Antihypertensive", "Analgesic", "Antidepressant",
+                        "Anticoagulant", "Bronchodilator", "Antihistamine", "Antidiarrheal",
+                        "Immunosuppressant", "Anticonvulsant", "Antiviral", "Statin")
+_PHARMA_CONDITIONS = ("bacterial infections", "hypertension", "chronic pain", "depression",
+                      "blood clots", "asthma", "allergies", "type 2 diabetes",
+                      "autoimmune disorders", "epilepsy", "viral infections", "high cholesterol")
+_PHARMA_FORMS = ("tablet", "capsule", "injection", "syrup", "inhaler", "topical cream",
+                 "extended-release", "sublingual", "transdermal patch")
+_PHARMA_PREFIXES = ("Ama", "Ben", "Car", "Dex", "Epo", "Flu", "Gab", "Hyd", "Ibu", "Ket")
+_PHARMA_SUFFIXES = ("pine", "zole", "cin", "pril", "statin", "mab", "tinib", "oxin", "phen")
+_PHARMA_DOSAGES = ("10mg", "25mg", "50mg", "100mg", "200mg", "500mg", "1g")
+
+_INSURANCE_PLAN_TYPES = ("HMO", "PPO", "EPO", "POS", "HDHP", "Catastrophic")
+_INSURANCE_TIERS = ("Bronze", "Silver", "Gold", "Platinum")
+_INSURANCE_COVERAGE_AREAS = ("Individual", "Family", "Medicare Supplement", "Short-term",
+                             "Employer Group", "Student")
+_INSURANCE_FEATURES = (
+    "preventive care coverage", "prescription drug coverage", "mental health services",
+    "dental and vision options", "telehealth services", "wellness programs",
+    "specialist access", "emergency services", "hospitalization coverage",
+    "maternity care", "rehabilitation services", "chronic disease management"
+)
+_INSURANCE_DEDUCTIBLES = (1000, 2000, 3000, 4000, 5000, 6000, 7500)
+_INSURANCE_NETWORK_SIZES = ("Small", "Medium", "Large", "National")
+
+
+@dataclass(eq=False)
+class Dataset:
+    """
+    Generated items stored column-wise.
+    
+    Iterating, indexing and slicing yield the same item dicts that were
+    previously returned as a list, so a Dataset can be passed anywhere a
+    list of items is expected.
+    """
+    ids: np.ndarray
+    domains: np.ndarray
+    titles: List[str]
+    descriptions: List[str]
+    metadata: List[Dict[str, Any]]
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "Dataset":
+        """Build a Dataset from item dicts."""
+        records = list(records)
+        return cls(
+            ids=np.fromiter((item["id"] for item in records), dtype=np.int64, count=len(records)),
+            domains=np.array([item["domain"] for item in records], dtype=str),
+            titles=[item["title"] for item in records],
+            descriptions=[item["description"] for item in records],
+            metadata=[item["metadata"] for item in records],
+        )
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Return the items as a list of dicts."""
+        return list(self)
+    
+    def _record(self, index: int) -> Dict[str, Any]:
+        return {
+            "id": int(self.ids[index]),
+            "domain": str(self.domains[index]),
+            "title": self.titles[index],
+            "description": self.descriptions[index],
+            "metadata": self.metadata[index],
+        }
+    
+    def __len__(self) -> int:
+        return len(self.titles)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return map(self._record, range(len(self)))
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], "Dataset"]:
+        if isinstance(index, slice):
+            return Dataset(
+                ids=self.ids[index],
+                domains=self.domains[index],
+                titles=self.titles[index],
+                descriptions=self.descriptions[index],
+                metadata=self.metadata[index],
+            )
+        return self._record(index)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Dataset, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
 
 class DatasetGenerator:
     """Generate synthetic data across multiple domains with minimal duplication."""
@@ -15,6 +155,7 @@ class DatasetGenerator:
     def __init__(self, seed: int = 42):
         """Initialize generator with random seed for reproducibility."""
         random.seed(seed)
+        # Keys follow DOMAINS order
         self.domains = {
             'tech': self._generate_tech_item,
             'medical': self._generate_medical_item,
@@ -22,7 +163,7 @@ class DatasetGenerator:
             'health_insurance': self._generate_health_insurance_item
         }
     
-    def generate(self, n: int = 100, domain_mix: Dict[str, float] = None) -> List[Dict[str, Any]]:
+    def generate(self, n: int = 100, domain_mix: Dict[str, float] = None) -> Dataset:
         """
         Generate n items distributed across domains.
         
@@ -32,89 +173,45 @@ class DatasetGenerator:
                        If None, distributes evenly across all domains
         
         Returns:
-            List of dictionaries containing generated items
+            Dataset of generated items (iterates as dicts)
+            
+        Raises:
+            ValueError: If the domain_mix weights do not sum to a positive value
         """
         if domain_mix is None:
             # Even distribution across all domains
-            domain_mix = {domain: 1.0 for domain in self.domains.keys()}
+            domain_mix = {domain: 1.0 for domain in DOMAINS}
         
-        # Normalize weights
-        total_weight = sum(domain_mix.values())
-        domain_mix = {k: v/total_weight for k, v in domain_mix.items()}
+        # Normalize weights and calculate items per domain in one pass
+        weights = np.fromiter(domain_mix.values(), dtype=float, count=len(domain_mix))
+        if not weights.sum() > 0:
+            raise ValueError(f"domain_mix weights must sum to a positive value, got {domain_mix}")
+        counts = (n * (weights / weights.sum())).astype(int)
         
-        # Calculate items per domain
-        items_per_domain = {}
-        remaining = n
-        for domain, weight in domain_mix.items():
-            count = int(n * weight)
-            items_per_domain[domain] = count
-            remaining -= count
+        # Distribute remaining items to the first domains
+        counts[:n - counts.sum()] += 1
         
-        # Distribute remaining items
-        if remaining > 0:
-            for domain in list(items_per_domain.keys())[:remaining]:
-                items_per_domain[domain] += 1
+        # Generate items (IDs are contiguous across domains)
+        records = []
         
-        # Generate items
-        dataset = []
-        item_id = 0
-        
-        for domain, count in items_per_domain.items():
+        for domain, count in zip(domain_mix, counts.tolist()):
             generator_func = self.domains.get(domain)
             if generator_func:
-                for i in range(count):
-                    item = generator_func(item_id, i)
-                    dataset.append(item)
-                    item_id += 1
+                start_id = len(records)
+                records.extend([generator_func(start_id + i, i) for i in range(count)])
         
-        return dataset
+        return Dataset.from_records(records)
     
     def _generate_tech_item(self, item_id: int, domain_index: int) -> Dict[str, Any]:
         """Generate tech/programming book item."""
-        languages = ["Python", "JavaScript", "Java", "C++", "Ruby", "Go", "Rust", 
-                    "TypeScript", "Kotlin", "Swift", "PHP", "C#", "Scala", "R"]
+        lang = _TECH_LANGUAGES[domain_index % len(_TECH_LANGUAGES)]
+        topic = _TECH_TOPICS[(domain_index // len(_TECH_LANGUAGES)) % len(_TECH_TOPICS)]
         
-        topics = ["web development", "data science", "machine learning", "algorithms", 
-                 "system design", "testing", "security", "DevOps", "mobile apps", 
-                 "game development", "embedded systems", "cloud computing", "AI/ML",
-                 "blockchain", "microservices", "containerization", "API design"]
+        intro = random.choice(_TECH_INTRO_PHRASES)
+        detail = random.choice(_TECH_DETAIL_PHRASES)
+        audience = random.choice(_TECH_AUDIENCE_PHRASES)
         
-        intro_phrases = [
-            "Comprehensive guide to", "Learn", "Master", "Deep dive into",
-            "Practical introduction to", "Advanced techniques for", "Getting started with",
-            "Professional", "Essential", "Complete", "Hands-on", "Modern approach to"
-        ]
-        
-        detail_phrases = [
-            "Covers practical examples, best practices, and real-world applications.",
-            "Includes hands-on projects and code samples throughout.",
-            "Features expert insights and industry-tested patterns.",
-            "Step-by-step tutorials with detailed explanations.",
-            "Real-world case studies and production-ready code.",
-            "Comprehensive coverage from basics to advanced concepts.",
-            "Interactive exercises and project-based learning.",
-            "Industry-standard techniques and cutting-edge practices.",
-            "Battle-tested solutions for modern development challenges."
-        ]
-        
-        audience_phrases = [
-            "Suitable for intermediate developers",
-            "Perfect for beginners and intermediate programmers",
-            "Designed for experienced developers",
-            "Ideal for software engineers",
-            "Great for aspiring professionals",
-            "Built for self-learners and bootcamp students",
-            "Tailored for enterprise developers"
-        ]
-        
-        lang = languages[domain_index % len(languages)]
-        topic = topics[(domain_index // len(languages)) % len(topics)]
-        
-        intro = random.choice(intro_phrases)
-        detail = random.choice(detail_phrases)
-        audience = random.choice(audience_phrases)
-        
-        edition = (domain_index // (len(languages) * len(topics))) + 1
+        edition = (domain_index // (len(_TECH_LANGUAGES) * len(_TECH_TOPICS))) + 1
         year = 2020 + (domain_index % 5)
         
         return {
@@ -128,33 +225,19 @@ class DatasetGenerator:
                 "topic": topic,
                 "edition": edition,
                 "pages": 200 + (domain_index * 7) % 300,
-                "difficulty": ["beginner", "intermediate", "advanced"][domain_index % 3],
+                "difficulty": _TECH_DIFFICULTIES[domain_index % 3],
                 "year": year
             }
         }
     
     def _generate_medical_item(self, item_id: int, domain_index: int) -> Dict[str, Any]:
         """Generate medical textbook/resource item."""
-        specialties = ["Cardiology", "Neurology", "Oncology", "Pediatrics", "Surgery",
-                      "Radiology", "Psychiatry", "Dermatology", "Orthopedics", "Endocrinology",
-                      "Gastroenterology", "Pulmonology", "Nephrology", "Rheumatology"]
-        
-        topics = ["diagnosis", "treatment protocols", "patient management", "clinical practice",
-                 "surgical techniques", "emergency medicine", "preventive care", "pathology",
-                 "pharmacotherapy", "diagnostic imaging", "interventional procedures"]
+        specialty = _MEDICAL_SPECIALTIES[domain_index % len(_MEDICAL_SPECIALTIES)]
+        topic = _MEDICAL_TOPICS[(domain_index // len(_MEDICAL_SPECIALTIES)) % len(_MEDICAL_TOPICS)]
+        format_type = _MEDICAL_FORMATS[domain_index % len(_MEDICAL_FORMATS)]
+        audience = _MEDICAL_AUDIENCES[domain_index % len(_MEDICAL_AUDIENCES)]
         
-        formats = ["Textbook", "Clinical Guide", "Reference Manual", "Handbook", "Atlas",
-                  "Case Studies", "Review", "Protocols", "Guidelines"]
-        
-        audiences = ["medical students", "residents", "practicing physicians", "specialists",
-                    "healthcare professionals", "clinical researchers"]
-        
-        specialty = specialties[domain_index % len(specialties)]
-        topic = topics[(domain_index // len(specialties)) % len(topics)]
-        format_type = formats[domain_index % len(formats)]
-        audience = audiences[domain_index % len(audiences)]
-        
-        edition = (domain_index // (len(specialties) * 2)) + 1
+        edition = (domain_index // (len(_MEDICAL_SPECIALTIES) * 2)) + 1
         year = 2018 + (domain_index % 7)
         
         title = f"{specialty} {format_type}: {topic.title()} - {edition}th Edition"
@@ -183,30 +266,15 @@ class DatasetGenerator:
     
     def _generate_pharmaceutical_item(self, item_id: int, domain_index: int) -> Dict[str, Any]:
         """Generate pharmaceutical drug/medication item."""
-        drug_classes = ["Antibiotic", "Antihypertensive", "Analgesic", "Antidepressant",
-                       "Anticoagulant", "Bronchodilator", "Antihistamine", "Antidiarrheal",
-                       "Immunosuppressant", "Anticonvulsant", "Antiviral", "Statin"]
-        
-        conditions = ["bacterial infections", "hypertension", "chronic pain", "depression",
-                     "blood clots", "asthma", "allergies", "type 2 diabetes",
-                     "autoimmune disorders", "epilepsy", "viral infections", "high cholesterol"]
-        
-        forms = ["tablet", "capsule", "injection", "syrup", "inhaler", "topical cream",
-                "extended-release", "sublingual", "transdermal patch"]
-        
-        drug_class = drug_classes[domain_index % len(drug_classes)]
-        condition = conditions[domain_index % len(conditions)]
-        form = forms[domain_index % len(forms)]
+        drug_class = _PHARMA_DRUG_CLASSES[domain_index % len(_PHARMA_DRUG_CLASSES)]
+        condition = _PHARMA_CONDITIONS[domain_index % len(_PHARMA_CONDITIONS)]
+        form = _PHARMA_FORMS[domain_index % len(_PHARMA_FORMS)]
         
         # Generate semi-realistic drug name
-        prefixes = ["Ama", "Ben", "Car", "Dex", "Epo", "Flu", "Gab", "Hyd", "Ibu", "Ket"]
-        suffixes = ["pine", "zole", "cin", "pril", "statin", "mab", "tinib", "oxin", "phen"]
-        
-        drug_name = (prefixes[domain_index % len(prefixes)] + 
-                    suffixes[(domain_index // len(prefixes)) % len(suffixes)])
+        drug_name = (_PHARMA_PREFIXES[domain_index % len(_PHARMA_PREFIXES)] + 
+                    _PHARMA_SUFFIXES[(domain_index // len(_PHARMA_PREFIXES)) % len(_PHARMA_SUFFIXES)])
         
-        dosages = ["10mg", "25mg", "50mg", "100mg", "200mg", "500mg", "1g"]
-        dosage = dosages[domain_index % len(dosages)]
+        dosage = _PHARMA_DOSAGES[domain_index % len(_PHARMA_DOSAGES)]
         
         title = f"{drug_name} {dosage} - {drug_class} ({form})"
         
@@ -233,30 +301,15 @@ class DatasetGenerator:
     
     def _generate_health_insurance_item(self, item_id: int, domain_index: int) -> Dict[str, Any]:
         """Generate health insurance plan item."""
-        plan_types = ["HMO", "PPO", "EPO", "POS", "HDHP", "Catastrophic"]
-        
-        tiers = ["Bronze", "Silver", "Gold", "Platinum"]
-        
-        coverage_areas = ["Individual", "Family", "Medicare Supplement", "Short-term",
-                         "Employer Group", "Student"]
-        
-        features = [
-            "preventive care coverage", "prescription drug coverage", "mental health services",
-            "dental and vision options", "telehealth services", "wellness programs",
-            "specialist access", "emergency services", "hospitalization coverage",
-            "maternity care", "rehabilitation services", "chronic disease management"
-        ]
+        plan_type = _INSURANCE_PLAN_TYPES[domain_index % len(_INSURANCE_PLAN_TYPES)]
+        tier = _INSURANCE_TIERS[domain_index % len(_INSURANCE_TIERS)]
+        coverage = _INSURANCE_COVERAGE_AREAS[domain_index % len(_INSURANCE_COVERAGE_AREAS)]
         
-        plan_type = plan_types[domain_index % len(plan_types)]
-        tier = tiers[domain_index % len(tiers)]
-        coverage = coverage_areas[domain_index % len(coverage_areas)]
-        
-        # Select 3-5 features
+        # Select 3-5 _INSURANCE_FEATURES
         num_features = 3 + (domain_index % 3)
-        selected_features = random.sample(features, min(num_features, len(features)))
+        selected_features = random.sample(_INSURANCE_FEATURES, min(num_features, len(_INSURANCE_FEATURES)))
         
-        deductibles = [1000, 2000, 3000, 4000, 5000, 6000, 7500]
-        deductible = deductibles[domain_index % len(deductibles)]
+        deductible = _INSURANCE_DEDUCTIBLES[domain_index % len(_INSURANCE_DEDUCTIBLES)]
         
         title = f"{tier} {plan_type} - {coverage} Health Insurance Plan"
         
@@ -277,24 +330,49 @@ class DatasetGenerator:
                 "coverage_type": coverage,
                 "deductible": deductible,
                 "features": selected_features,
-                "network_size": ["Small", "Medium", "Large", "National"][domain_index % 4]
+                "network_size": _INSURANCE_NETWORK_SIZES[domain_index % 4]
             }
         }
     
-    def save_dataset(self, dataset: List[Dict[str, Any]], filepath: str):
+    def save_dataset(self, dataset: Union[Dataset, List[Dict[str, Any]]], filepath: str):
         """Save dataset to JSON file."""
+        if isinstance(dataset, Dataset):
+            dataset = dataset.to_records()
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(dataset, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(json_io.dumps(dataset, indent=True))
         print(f"✓ Saved {len(dataset)} items to {filepath}")
     
     @staticmethod
-    def load_dataset(filepath: str) -> List[Dict[str, Any]]:
-        """Load dataset from JSON file."""
-        with open(filepath, 'r') as f:
-            dataset = json.load(f)
+    def load_dataset(filepath: Union[str, Path, IO]) -> List[Dict[str, Any]]:
+        """Load dataset from a JSON file path or an open file-like object."""
+        if hasattr(filepath, 'read'):
+            dataset = json_io.loads(filepath.read())
+            filepath = getattr(filepath, 'name', '<stream>')
+        else:
+            with open(filepath, 'rb') as f:
+                dataset = json_io.loads(f.read())
         print(f"✓ Loaded {len(dataset)} items from {filepath}")
         return dataset
+    
+    def save_dataset_seq(self, dataset: Iterable[Dict[str, Any]], filepath: str):
+        """Save dataset as newline-delimited JSON (one item per line)."""
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with open(filepath, 'wb') as f:
+            for item in dataset:
+                f.write(json_io.dumps(item))
+                f.write(b'\n')
+                count += 1
+        print(f"✓ Saved {count} items to {filepath}")
+    
+    @staticmethod
+    def load_dataset_seq(filepath: str) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate items from a newline-delimited JSON dataset file."""
+        with open(filepath, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json_io.loads(line)
 
 
 # Command-line interface
@@ -331,12 +409,9 @@ if __name__ == "__main__":
     generator.save_dataset(dataset, args.output)
     
     # Print statistics
-    domain_counts = {}
-    for item in dataset:
-        domain = item['domain']
-        domain_counts[domain] = domain_counts.get(domain, 0) + 1
+    domains, counts = np.unique(dataset.domains, return_counts=True)
     
     print("\nDataset Statistics:")
     print(f"  Total items: {len(dataset)}")
-    for domain, count in sorted(domain_counts.items()):
+    for domain, count in zip(domains.tolist(), counts.tolist()):
         print(f"  {domain}: {count} ({count/len(dataset)*100:.1f}%)")
\ No newline at end of file
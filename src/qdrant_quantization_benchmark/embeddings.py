@@ -2,10 +2,247 @@
 Embedding generation and management.
 """
 
-from typing import List, Dict, Any
+import hashlib
+import os
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from .config import EmbeddingConfig
+from .data_generator import Dataset
+from .logging import get_logger
+
+
+# Dataset columns that can be read without building item dicts
+_DATASET_COLUMNS = {"title": "titles", "description": "descriptions"}
+
+
+def _column(dataset: Sequence[Dict[str, Any]], field: str) -> Sequence[Any]:
+    """Extract one field from every item, using Dataset columns when available."""
+    if isinstance(dataset, Dataset) and field in _DATASET_COLUMNS:
+        return getattr(dataset, _DATASET_COLUMNS[field])
+    return [item.get(field, "") for item in dataset]
+
+
+@lru_cache(maxsize=4)
+def _load_model(model_name: str, device: Optional[str], fp16: bool) -> SentenceTransformer:
+    """Load a SentenceTransformer once per (model, device, precision) and reuse it."""
+    # device=None lets sentence-transformers pick CUDA when available
+    model = SentenceTransformer(model_name, device=device)
+    if fp16 and model.device.type == "cuda":
+        model.half()
+    return model
+
+
+class EmbeddingCache:
+    """Persistent embedding cache keyed by (model variant, SHA-256 of text)."""
+    
+    # Stay well below SQLite's bound-parameter limit
+    _CHUNK_SIZE = 500
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path: SQLite database file
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, key))"
+        )
+    
+    @staticmethod
+    def key(text: str) -> str:
+        """Return the cache key for a text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def variant(model_name: str, backend: str, precision: str) -> str:
+        """
+        Return the model column value for one embedding configuration.
+        
+        The same model yields different vectors per backend and precision,
+        so each combination is cached separately. Entries are full-size
+        model output, so every output_dim shares one variant.
+        
+        Args:
+            model_name: Embedding model name
+            backend: Inference backend ("sentence-transformers" or "onnx")
+            precision: Weight precision ("fp32", "fp16" or "int8")
+            
+        Returns:
+            Model variant string
+        """
+        return f"{model_name}|{backend}|{precision}"
+    
+    def get_many(
+        self,
+        model_name: str,
+        keys: Sequence[str]
+    ) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up cached embeddings.
+        
+        Args:
+            model_name: Embedding model name or variant()
+            keys: Cache keys, one per text
+            
+        Returns:
+            Tuple of (position -> embedding for hits, positions of misses)
+        """
+        stored = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for i in range(0, len(unique_keys), self._CHUNK_SIZE):
+            chunk = unique_keys[i:i + self._CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                [model_name, *chunk]
+            )
+            stored.update(rows)
+        
+        found = {}
+        misses = []
+        for position, key in enumerate(keys):
+            if key in stored:
+                found[position] = np.frombuffer(stored[key], dtype=np.float32)
+            else:
+                misses.append(position)
+        return found, misses
+    
+    def put_many(self, model_name: str, keys: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        Store embeddings.
+        
+        Args:
+            model_name: Embedding model name or variant()
+            keys: Cache keys, one per embedding row
+            embeddings: Array of shape (len(keys), vector_size)
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                [(model_name, key, row.tobytes()) for key, row in zip(keys, embeddings)]
+            )
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+class OnnxEmbeddingBackend:
+    """
+    CPU inference on an int8-quantized ONNX export of a sentence-transformers model.
+    
+    Implements the part of the SentenceTransformer interface that
+    EmbeddingService uses: mean pooling followed by L2 normalization.
+    """
+    
+    device = "cpu"
+    
+    def __init__(self, tokenizer: Any, model: Any):
+        """
+        Initialize backend from a loaded tokenizer and ONNX Runtime model.
+        
+        Args:
+            tokenizer: Hugging Face fast tokenizer
+            model: optimum ORTModelForFeatureExtraction
+        """
+        self.tokenizer = tokenizer
+        self.model = model
+    
+    @classmethod
+    def from_pretrained(cls, model_name: str, export_dir: Optional[str] = None) -> "OnnxEmbeddingBackend":
+        """
+        Load the quantized model, exporting and quantizing it on first use.
+        
+        Args:
+            model_name: sentence-transformers model name or Hugging Face model id
+            export_dir: Directory for the exported model
+            
+        Returns:
+            Backend instance
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The ONNX backend requires optimum[onnxruntime]: pip install -e \".[onnx]\""
+            ) from e
+        
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        export_path = Path(export_dir or Path("models") / "onnx" / model_id.replace("/", "__"))
+        
+        if not (export_path / "model_quantized.onnx").exists():
+            model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=export_path,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False)
+            )
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(export_path)
+            get_logger("OnnxEmbeddingBackend").info(
+                "onnx_exported", model=model_id, path=str(export_path), precision="int8"
+            )
+        
+        return cls(
+            tokenizer=AutoTokenizer.from_pretrained(export_path),
+            model=ORTModelForFeatureExtraction.from_pretrained(
+                export_path, file_name="model_quantized.onnx"
+            )
+        )
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 64,
+        **kwargs: Any
+    ) -> np.ndarray:
+        """
+        Encode sentences to normalized embeddings.
+        
+        Args:
+            sentences: A text or list of texts
+            batch_size: Number of texts per ONNX Runtime call
+            **kwargs: Accepted for SentenceTransformer compatibility and ignored
+            
+        Returns:
+            (vector_size,) array for a text, (N, vector_size) array for a list
+        """
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size=batch_size)[0]
+        
+        # Group similar lengths per batch to minimize padding, then restore order
+        order = np.argsort([-len(sentence) for sentence in sentences], kind="stable")
+        batches = []
+        for i in range(0, len(order), batch_size):
+            batch = [sentences[j] for j in order[i:i + batch_size]]
+            batches.append(self._encode_batch(batch))
+        
+        embeddings = np.empty((len(sentences), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.concatenate(batches)
+        return embeddings
+    
+    def _encode_batch(self, batch: List[str]) -> np.ndarray:
+        """Mean-pool and L2-normalize token embeddings for one batch."""
+        inputs = self.tokenizer(batch, padding=True, truncation=True, return_tensors="np")
+        token_embeddings = self.model(**inputs).last_hidden_state
+        
+        mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
 
 
 class EmbeddingService:
@@ -19,8 +256,28 @@ class EmbeddingService:
             config: Embedding configuration
         """
         self.config = config or EmbeddingConfig()
-        self.model = SentenceTransformer(self.config.model_name)
-        print(f"✓ Loaded embedding model: {self.config.model_name}")
+        if self.config.backend == "onnx":
+            self.model = OnnxEmbeddingBackend.from_pretrained(
+                self.config.model_name, self.config.onnx_dir
+            )
+            self.device = OnnxEmbeddingBackend.device
+        else:
+            if self.config.torch_threads:
+                import torch
+                torch.set_num_threads(self.config.torch_threads)
+            self.model = _load_model(self.config.model_name, self.config.device, self.config.fp16)
+            self.device = str(self.model.device)
+        self.cache = EmbeddingCache(self.config.cache_path) if self.config.cache_path else None
+        if self.config.backend == "onnx":
+            precision = "int8"
+        elif self.config.fp16 and self.device.startswith("cuda"):
+            precision = "fp16"
+        else:
+            precision = "fp32"
+        self._cache_variant = EmbeddingCache.variant(
+            self.config.model_name, self.config.backend, precision
+        )
+        print(f"✓ Loaded embedding model: {self.config.model_name} on {self.device}")
     
     def encode_text(self, text: str) -> List[float]:
         """
@@ -32,34 +289,114 @@ class EmbeddingService:
         Returns:
             Embedding vector as list of floats
         """
-        return self.model.encode(text).tolist()
+        return self._truncate(np.asarray(self.model.encode(text), dtype=np.float32)).tolist()
     
-    def encode_batch(self, texts: List[str], show_progress: bool = True) -> List[List[float]]:
+    def encode_batch(
+        self,
+        texts: List[str],
+        show_progress: bool = True,
+        batch_size: int = 64
+    ) -> np.ndarray:
         """
-        Encode a batch of texts to embedding vectors.
+        Encode a batch of texts to embedding vectors with a single model call.
+        
+        With a cache configured, only texts missing from the cache are encoded.
         
         Args:
             texts: List of texts to encode
             show_progress: Whether to show progress bar
+            batch_size: Number of texts per forward pass
             
         Returns:
-            List of embedding vectors
+            Contiguous float32 array with shape (len(texts), vector_size)
         """
-        embeddings = []
-        batch_size = 1000
+        if not texts:
+            return np.empty((0, self.vector_size), dtype=np.float32)
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_embeddings = [self.model.encode(text).tolist() for text in batch]
-            embeddings.extend(batch_embeddings)
-            
-            if show_progress and (i + batch_size) % 1000 == 0:
-                print(f"  Encoded {min(i + batch_size, len(texts))}/{len(texts)} items...")
+        if self.cache is None:
+            embeddings = self._truncate(self._encode(texts, show_progress, batch_size))
+            if show_progress:
+                print(f"✓ Encoded {len(texts)} items")
+            return embeddings
+        
+        model_name = self._cache_variant
+        keys = [EmbeddingCache.key(text) for text in texts]
+        found, misses = self.cache.get_many(model_name, keys)
+        
+        encoded = None
+        if misses:
+            encoded = self._encode([texts[i] for i in misses], show_progress, batch_size)
+            self.cache.put_many(model_name, [keys[i] for i in misses], encoded)
+        
+        # The cache holds full-size model output, independent of output_dim;
+        # size the buffer from that output rather than trusting config.vector_size
+        width = (encoded if encoded is not None else next(iter(found.values()))).shape[-1]
+        embeddings = np.empty((len(texts), width), dtype=np.float32)
+        for position, embedding in found.items():
+            embeddings[position] = embedding
+        if encoded is not None:
+            embeddings[misses] = encoded
         
         if show_progress:
-            print(f"✓ Encoded {len(texts)} items")
+            print(f"✓ Encoded {len(misses)} items ({len(found)} from cache)")
         
-        return embeddings
+        return self._truncate(embeddings)
+    
+    def encode_multi_process(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        num_workers: Optional[int] = None,
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """
+        Encode texts on CPU across worker processes, each with its own model copy.
+        
+        Args:
+            texts: List of texts to encode
+            batch_size: Batch size within each worker
+            num_workers: Number of processes (default: config.num_workers or CPU count)
+            show_progress: Whether to show a progress bar
+            
+        Returns:
+            (N, vector_size) float32 array, in input order
+        """
+        num_workers = num_workers or self.config.num_workers or os.cpu_count() or 1
+        pool = self.model.start_multi_process_pool(target_devices=["cpu"] * num_workers)
+        try:
+            embeddings = self.model.encode_multi_process(
+                texts, pool, batch_size=batch_size, show_progress_bar=show_progress
+            )
+        finally:
+            self.model.stop_multi_process_pool(pool)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+    
+    def _encode(self, texts: List[str], show_progress: bool, batch_size: int) -> np.ndarray:
+        """Run the model over texts in one call."""
+        if self.config.multi_process and self.device == "cpu" and self.config.backend != "onnx":
+            return self.encode_multi_process(
+                texts, batch_size=batch_size, show_progress=show_progress
+            )
+        
+        # Passing the whole list lets the model group texts of similar length
+        # into each forward pass (less padding) and restore input order after
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=show_progress,
+            convert_to_numpy=True
+        )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+    
+    def _truncate(self, embeddings: np.ndarray) -> np.ndarray:
+        """Keep the first output_dim dimensions and L2-renormalize (Matryoshka truncation)."""
+        output_dim = self.config.output_dim
+        if not output_dim or output_dim >= embeddings.shape[-1]:
+            return embeddings
+        
+        truncated = embeddings[..., :output_dim]
+        norms = np.linalg.norm(truncated, axis=-1, keepdims=True)
+        return np.ascontiguousarray(truncated / np.maximum(norms, 1e-12), dtype=np.float32)
     
     def encode_dataset(
         self, 
@@ -68,7 +405,7 @@ class EmbeddingService:
         title_field: str = "title",
         combine_fields: bool = True,
         show_progress: bool = True
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Encode dataset items to embeddings.
         
@@ -80,15 +417,14 @@ class EmbeddingService:
             show_progress: Whether to show progress
             
         Returns:
-            List of embedding vectors
+            Array of embeddings with shape (len(dataset), vector_size)
         """
         if combine_fields:
-            texts = [
-                f"{item.get(title_field, '')} {item.get(text_field, '')}"
-                for item in dataset
-            ]
+            titles = _column(dataset, title_field)
+            bodies = _column(dataset, text_field)
+            texts = [f"{title} {body}" for title, body in zip(titles, bodies)]
         else:
-            texts = [item.get(text_field, "") for item in dataset]
+            texts = list(_column(dataset, text_field))
         
         if show_progress:
             print(f"Pre-computing embeddings for {len(texts)} items...")
@@ -97,5 +433,5 @@ class EmbeddingService:
     
     @property
     def vector_size(self) -> int:
-        """Get the vector size of the embedding model."""
-        return self.config.vector_size
\ No newline at end of file
+        """Get the size of the vectors this service returns."""
+        return self.config.effective_vector_size
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+JSON encoding helpers that use orjson when it is installed.
+"""
+
+import json
+from typing import Any, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(obj: Any) -> Any:
+    """Serialize NumPy values for the stdlib json fallback."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode an object to UTF-8 JSON bytes.
+
+    Args:
+        obj: Object to encode (NumPy arrays and scalars are supported)
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        Encoded JSON
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=_default).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON from bytes or str.
+
+    Args:
+        data: Encoded JSON
+
+    Returns:
+        Decoded object
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
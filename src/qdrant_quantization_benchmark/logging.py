@@ -4,6 +4,8 @@ Structured logging configuration using structlog.
 
 import logging
 import sys
+import time
+from functools import lru_cache
 from typing import Optional
 import structlog
 from structlog.types import EventDict, WrappedLogger
@@ -85,6 +87,8 @@ def setup_logging(
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
     )
+    # Loggers handed out earlier were bound against the previous configuration
+    get_logger.cache_clear()
     
     logger = structlog.get_logger()
     
@@ -100,10 +104,13 @@ def setup_logging(
     return logger
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
     """
     Get a logger instance.
     
+    Loggers are cached per name until setup_logging() reconfigures structlog.
+    
     Args:
         name: Optional logger name (typically module name)
         
@@ -164,6 +171,7 @@ class ProgressLogger:
         self.total = total
         self.update_interval = update_interval
         self.processed = 0
+        self._next_log = self._next_log_at(0)
         
         self.logger.info(
             f"{operation}_started",
@@ -180,7 +188,9 @@ class ProgressLogger:
         """
         self.processed += count
         
-        if self.processed % self.update_interval == 0 or self.processed == self.total:
+        # A single comparison per update; the threshold is recomputed only when logging
+        if self.processed >= self._next_log:
+            self._next_log = self._next_log_at(self.processed)
             percent = (self.processed / self.total) * 100
             self.logger.info(
                 f"{self.operation}_progress",
@@ -190,6 +200,13 @@ class ProgressLogger:
                 percent=f"{percent:.1f}"
             )
     
+    def _next_log_at(self, processed: int) -> int:
+        """Next progress count to log at: the next interval multiple, capped at total."""
+        next_log = (processed // self.update_interval + 1) * self.update_interval
+        if processed < self.total:
+            next_log = min(next_log, self.total)
+        return next_log
+    
     def complete(self) -> None:
         """Mark operation as complete."""
         self.logger.info(
@@ -204,38 +221,41 @@ class ProgressLogger:
 class Timer:
     """Context manager for timing operations with structured logging."""
     
-    def __init__(self, logger: structlog.BoundLogger, operation: str, **kwargs):
+    def __init__(
+        self,
+        logger: structlog.BoundLogger,
+        operation: str,
+        threshold_ms: float = 0.0,
+        **kwargs
+    ):
         """
         Initialize timer.
         
         Args:
             logger: Structlog logger instance
             operation: Name of the operation being timed
+            threshold_ms: Only log completions taking at least this long
             **kwargs: Additional context to include in logs
         """
         self.logger = logger
         self.operation = operation
+        self.threshold_ms = threshold_ms
         self.context = kwargs
         self.start_time = None
         self.duration_ms = None
     
     def __enter__(self):
-        """Start timing."""
-        import time
-        self.start_time = time.time()
-        self.logger.debug(
-            f"{self.operation}_started",
-            operation=self.operation,
-            **self.context
-        )
+        """Start timing (no event is logged on entry)."""
+        self.start_time = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """End timing and log results."""
-        import time
-        self.duration_ms = (time.time() - self.start_time) * 1000
+        self.duration_ms = (time.perf_counter_ns() - self.start_time) / 1e6
         
         if exc_type is None:
+            if self.duration_ms < self.threshold_ms:
+                return
             self.logger.info(
                 f"{self.operation}_completed",
                 operation=self.operation,
@@ -4,11 +4,13 @@ Qdrant collection management operations.
 
 from typing import Optional
 from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
 
 from .config import CollectionConfig, EmbeddingConfig
+from .logging import LoggerMixin
 
 
-class QdrantCollectionManager:
+class QdrantCollectionManager(LoggerMixin):
     """Manages Qdrant collection lifecycle operations."""
     
     def __init__(
@@ -28,6 +30,7 @@ class QdrantCollectionManager:
         self.client = client
         self.collection_config = collection_config or CollectionConfig()
         self.embedding_config = embedding_config or EmbeddingConfig()
+        self.setup_logger("QdrantCollectionManager")
     
     def collection_exists(self, collection_name: str) -> bool:
         """
@@ -48,9 +51,17 @@ class QdrantCollectionManager:
         Args:
             collection_name: Name of the collection to delete
         """
-        if self.collection_exists(collection_name):
-            self.client.delete_collection(collection_name)
-            print(f"✓ Deleted existing collection: {collection_name}")
+        # Attempt the delete directly rather than paying a round trip for an
+        # existence check; a missing collection is not an error here
+        try:
+            deleted = self.client.delete_collection(collection_name)
+        except UnexpectedResponse as e:
+            if e.status_code != 404:
+                raise
+            return
+        
+        if deleted:
+            self.log.info("collection_deleted", collection=collection_name)
     
     def create_hybrid_collection(self, collection_name: str) -> None:
         """
@@ -63,7 +74,7 @@ class QdrantCollectionManager:
             collection_name=collection_name,
             vectors_config={
                 "dense": models.VectorParams(
-                    size=self.embedding_config.vector_size,
+                    size=self.embedding_config.effective_vector_size,
                     distance=self.collection_config.distance
                 )
             },
@@ -73,7 +84,7 @@ class QdrantCollectionManager:
                 )
             }
         )
-        print(f"✓ Created hybrid collection: {collection_name}")
+        self.log.info("collection_created", collection=collection_name, type="hybrid")
     
     def create_standard_collection(self, collection_name: str) -> None:
         """
@@ -85,12 +96,12 @@ class QdrantCollectionManager:
         self.client.create_collection(
             collection_name=collection_name,
             vectors_config=models.VectorParams(
-                size=self.embedding_config.vector_size,
+                size=self.embedding_config.effective_vector_size,
                 distance=self.collection_config.distance,
                 on_disk=self.collection_config.on_disk
             )
         )
-        print(f"✓ Created standard collection: {collection_name}")
+        self.log.info("collection_created", collection=collection_name, type="standard")
     
     def create_quantized_collection(
         self, 
@@ -107,13 +118,13 @@ class QdrantCollectionManager:
         self.client.create_collection(
             collection_name=collection_name,
             vectors_config=models.VectorParams(
-                size=self.embedding_config.vector_size,
+                size=self.embedding_config.effective_vector_size,
                 distance=self.collection_config.distance,
                 on_disk=True,  # Store originals on disk for quantization
             ),
             quantization_config=quantization_config
         )
-        print(f"✓ Created quantized collection: {collection_name}")
+        self.log.info("collection_created", collection=collection_name, type="quantized")
     
     def recreate_collection(
         self, 
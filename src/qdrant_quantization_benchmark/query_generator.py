@@ -3,19 +3,131 @@ Query generator for creating test queries across multiple domains.
 Supports auto-generation and manual curation of test queries.
 """
 
-import json
-import random
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
+from . import json_io
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on environment
+    ahocorasick = None
+
+
+# Lowercase keywords that mark a query as belonging to a domain (substring match)
+DOMAIN_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    'tech': frozenset(['python', 'javascript', 'programming', 'code', 'algorithm', 'web', 'api']),
+    'medical': frozenset(['cardiology', 'surgery', 'clinical', 'patient', 'diagnosis', 'treatment']),
+    'pharmaceutical': frozenset(['medication', 'drug', 'dosage', 'prescription', 'antibiotic', 'pharmaceutical']),
+    'health_insurance': frozenset(['insurance', 'coverage', 'plan', 'hmo', 'ppo', 'deductible', 'premium']),
+}
+
+
+# Query templates and vocabularies per domain, built once at import
+_TECH_TEMPLATES = (
+    "{language} {topic} tutorial",
+    "learn {language} programming {topic}",
+    "{difficulty} {topic} and {topic2}",
+    "{language} for {topic}",
+    "{topic} best practices {language}",
+    "advanced {topic} techniques",
+    "{language} {topic} examples",
+    "beginner guide to {language}",
+    "{topic} patterns in {language}",
+    "modern {language} development"
+)
+_TECH_LANGUAGES = ("python", "javascript", "java", "rust", "go", "c++", "typescript")
+_TECH_TOPICS = ("machine learning", "web development", "data science", "algorithms",
+                "security", "testing", "cloud computing", "API design", "microservices")
+_TECH_DIFFICULTIES = ("beginner", "intermediate", "advanced")
+
+_MEDICAL_TEMPLATES = (
+    "{specialty} {topic} guide",
+    "clinical {topic} for {specialty}",
+    "{specialty} diagnosis and {topic}",
+    "{topic} in {specialty} practice",
+    "{specialty} patient {topic}",
+    "evidence-based {specialty} {topic}",
+    "{specialty} treatment protocols",
+    "latest {specialty} research {topic}",
+    "{topic} management in {specialty}",
+    "{specialty} clinical guidelines"
+)
+_MEDICAL_SPECIALTIES = ("cardiology", "neurology", "oncology", "pediatrics", "surgery",
+                        "radiology", "psychiatry", "orthopedics", "emergency medicine")
+_MEDICAL_TOPICS = ("treatment", "diagnosis", "management", "procedures", "guidelines",
+                   "case studies", "pharmacotherapy", "interventions", "protocols")
+
+_PHARMA_TEMPLATES = (
+    "{drug_class} for {condition}",
+    "{condition} medication {form}",
+    "{drug_class} side effects and dosing",
+    "treatment for {condition}",
+    "{form} medications for {condition}",
+    "{drug_class} mechanism of action",
+    "{condition} drug therapy",
+    "prescription {drug_class}",
+    "{drug_class} pharmacology",
+    "{condition} pharmaceutical treatment"
+)
+_PHARMA_DRUG_CLASSES = ("antibiotic", "antihypertensive", "analgesic", "antidepressant",
+                        "anticoagulant", "bronchodilator", "antihistamine", "statin")
+_PHARMA_CONDITIONS = ("hypertension", "diabetes", "depression", "pain", "infection",
+                      "asthma", "allergies", "high cholesterol", "anxiety")
+_PHARMA_FORMS = ("tablet", "capsule", "injection", "inhaler", "syrup")
+
+_INSURANCE_TEMPLATES = (
+    "{tier} {plan_type} health insurance",
+    "{coverage} health plan with {feature}",
+    "affordable {plan_type} insurance",
+    "{tier} tier health coverage",
+    "{coverage} insurance with low deductible",
+    "{plan_type} plans with {feature}",
+    "comprehensive {coverage} coverage",
+    "{tier} health insurance options",
+    "{plan_type} with {feature} benefits",
+    "best {tier} {coverage} plans"
+)
+_INSURANCE_TIERS = ("bronze", "silver", "gold", "platinum")
+_INSURANCE_PLAN_TYPES = ("HMO", "PPO", "EPO", "HDHP")
+_INSURANCE_COVERAGE_TYPES = ("individual", "family", "employer", "student")
+_INSURANCE_FEATURES = ("prescription coverage", "dental", "vision", "mental health",
+                       "telehealth", "preventive care", "maternity")
+
+
+@lru_cache(maxsize=None)
+def _keyword_automaton() -> Optional[Any]:
+    """Build an Aho-Corasick automaton over DOMAIN_KEYWORDS (None without pyahocorasick)."""
+    if ahocorasick is None:
+        return None
+    
+    keyword_domains: Dict[str, set] = {}
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_domains.setdefault(keyword, set()).add(domain)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, domains in keyword_domains.items():
+        automaton.add_word(keyword, frozenset(domains))
+    automaton.make_automaton()
+    return automaton
+
 
 class QueryGenerator:
     """Generate and manage test queries for benchmarking."""
     
     def __init__(self, seed: int = 42):
         """Initialize query generator with random seed."""
-        random.seed(seed)
-        self.queries = []
+        self._rng = np.random.default_rng(seed)
+        # A plain list in benchmark order; callers may mutate it directly
+        self.queries: List[str] = []
+    
+    def __len__(self) -> int:
+        """Number of queries, counting duplicates."""
+        return len(self.queries)
     
     def generate_auto_queries(self, n: int = 20, domain_mix: Dict[str, float] = None) -> List[str]:
         """
@@ -27,6 +139,10 @@ class QueryGenerator:
         
         Returns:
             List of query strings
+        
+        Raises:
+            ValueError: If domain_mix has no known domain or its weights do not
+                sum to a positive value
         """
         if domain_mix is None:
             domain_mix = {
@@ -36,168 +152,83 @@ class QueryGenerator:
                 'health_insurance': 0.25
             }
         
-        # Normalize weights
-        total_weight = sum(domain_mix.values())
-        domain_mix = {k: v/total_weight for k, v in domain_mix.items()}
+        generators = {
+            'tech': self._generate_tech_queries,
+            'medical': self._generate_medical_queries,
+            'pharmaceutical': self._generate_pharmaceutical_queries,
+            'health_insurance': self._generate_insurance_queries,
+        }
+        domains = [domain for domain in domain_mix if domain in generators]
+        if not domains:
+            raise ValueError(f"domain_mix must include at least one of {list(generators)}")
         
-        queries = []
+        # Normalize weights and calculate queries per domain
+        weights = np.array([domain_mix[domain] for domain in domains], dtype=float)
+        if not weights.sum() > 0:
+            raise ValueError(f"domain_mix weights must sum to a positive value, got {domain_mix}")
+        counts = (n * weights / weights.sum()).astype(int)
         
-        # Calculate queries per domain
-        for domain, weight in domain_mix.items():
-            count = int(n * weight)
-            if domain == 'tech':
-                queries.extend(self._generate_tech_queries(count))
-            elif domain == 'medical':
-                queries.extend(self._generate_medical_queries(count))
-            elif domain == 'pharmaceutical':
-                queries.extend(self._generate_pharmaceutical_queries(count))
-            elif domain == 'health_insurance':
-                queries.extend(self._generate_insurance_queries(count))
+        # Fill remaining slots with randomly chosen domains
+        np.add.at(counts, self._rng.integers(len(domains), size=n - counts.sum()), 1)
         
-        # Fill remaining slots
-        while len(queries) < n:
-            domain = random.choice(list(domain_mix.keys()))
-            if domain == 'tech':
-                queries.extend(self._generate_tech_queries(1))
-            elif domain == 'medical':
-                queries.extend(self._generate_medical_queries(1))
-            elif domain == 'pharmaceutical':
-                queries.extend(self._generate_pharmaceutical_queries(1))
-            elif domain == 'health_insurance':
-                queries.extend(self._generate_insurance_queries(1))
+        queries = []
+        for domain, count in zip(domains, counts):
+            queries.extend(generators[domain](int(count)))
         
-        return queries[:n]
+        return queries
+    
+    def _choose(self, words: Tuple[str, ...], n: int) -> List[str]:
+        """Draw n words uniformly, in one vectorized call."""
+        return [words[i] for i in self._rng.integers(len(words), size=n)]
+    
+    def _fill_templates(self, templates: Tuple[str, ...], n: int, **columns: List[str]) -> List[str]:
+        """Format n randomly chosen templates, filling the i-th with the i-th word of each column."""
+        template_ids = self._rng.integers(len(templates), size=n)
+        return [
+            templates[t].format(**{name: words[i] for name, words in columns.items()})
+            for i, t in enumerate(template_ids)
+        ]
     
     def _generate_tech_queries(self, n: int) -> List[str]:
         """Generate tech-related queries."""
-        templates = [
-            "{language} {topic} tutorial",
-            "learn {language} programming {topic}",
-            "{difficulty} {topic} and {topic2}",
-            "{language} for {topic}",
-            "{topic} best practices {language}",
-            "advanced {topic} techniques",
-            "{language} {topic} examples",
-            "beginner guide to {language}",
-            "{topic} patterns in {language}",
-            "modern {language} development"
-        ]
+        topic_ids = self._rng.integers(len(_TECH_TOPICS), size=n)
+        # Offset the second topic so it always differs from the first
+        topic2_ids = (topic_ids + self._rng.integers(1, len(_TECH_TOPICS), size=n)) % len(_TECH_TOPICS)
         
-        languages = ["python", "javascript", "java", "rust", "go", "c++", "typescript"]
-        topics = ["machine learning", "web development", "data science", "algorithms",
-                 "security", "testing", "cloud computing", "API design", "microservices"]
-        difficulties = ["beginner", "intermediate", "advanced"]
-        
-        queries = []
-        for _ in range(n):
-            template = random.choice(templates)
-            query = template.format(
-                language=random.choice(languages),
-                topic=random.choice(topics),
-                topic2=random.choice([t for t in topics if t != random.choice(topics)]),
-                difficulty=random.choice(difficulties)
-            )
-            queries.append(query)
-        
-        return queries
+        return self._fill_templates(
+            _TECH_TEMPLATES, n,
+            language=self._choose(_TECH_LANGUAGES, n),
+            topic=[_TECH_TOPICS[i] for i in topic_ids],
+            topic2=[_TECH_TOPICS[i] for i in topic2_ids],
+            difficulty=self._choose(_TECH_DIFFICULTIES, n)
+        )
     
     def _generate_medical_queries(self, n: int) -> List[str]:
         """Generate medical-related queries."""
-        templates = [
-            "{specialty} {topic} guide",
-            "clinical {topic} for {specialty}",
-            "{specialty} diagnosis and {topic}",
-            "{topic} in {specialty} practice",
-            "{specialty} patient {topic}",
-            "evidence-based {specialty} {topic}",
-            "{specialty} treatment protocols",
-            "latest {specialty} research {topic}",
-            "{topic} management in {specialty}",
-            "{specialty} clinical guidelines"
-        ]
-        
-        specialties = ["cardiology", "neurology", "oncology", "pediatrics", "surgery",
-                      "radiology", "psychiatry", "orthopedics", "emergency medicine"]
-        topics = ["treatment", "diagnosis", "management", "procedures", "guidelines",
-                 "case studies", "pharmacotherapy", "interventions", "protocols"]
-        
-        queries = []
-        for _ in range(n):
-            template = random.choice(templates)
-            query = template.format(
-                specialty=random.choice(specialties),
-                topic=random.choice(topics)
-            )
-            queries.append(query)
-        
-        return queries
+        return self._fill_templates(
+            _MEDICAL_TEMPLATES, n,
+            specialty=self._choose(_MEDICAL_SPECIALTIES, n),
+            topic=self._choose(_MEDICAL_TOPICS, n)
+        )
     
     def _generate_pharmaceutical_queries(self, n: int) -> List[str]:
         """Generate pharmaceutical-related queries."""
-        templates = [
-            "{drug_class} for {condition}",
-            "{condition} medication {form}",
-            "{drug_class} side effects and dosing",
-            "treatment for {condition}",
-            "{form} medications for {condition}",
-            "{drug_class} mechanism of action",
-            "{condition} drug therapy",
-            "prescription {drug_class}",
-            "{drug_class} pharmacology",
-            "{condition} pharmaceutical treatment"
-        ]
-        
-        drug_classes = ["antibiotic", "antihypertensive", "analgesic", "antidepressant",
-                       "anticoagulant", "bronchodilator", "antihistamine", "statin"]
-        conditions = ["hypertension", "diabetes", "depression", "pain", "infection",
-                     "asthma", "allergies", "high cholesterol", "anxiety"]
-        forms = ["tablet", "capsule", "injection", "inhaler", "syrup"]
-        
-        queries = []
-        for _ in range(n):
-            template = random.choice(templates)
-            query = template.format(
-                drug_class=random.choice(drug_classes),
-                condition=random.choice(conditions),
-                form=random.choice(forms)
-            )
-            queries.append(query)
-        
-        return queries
+        return self._fill_templates(
+            _PHARMA_TEMPLATES, n,
+            drug_class=self._choose(_PHARMA_DRUG_CLASSES, n),
+            condition=self._choose(_PHARMA_CONDITIONS, n),
+            form=self._choose(_PHARMA_FORMS, n)
+        )
     
     def _generate_insurance_queries(self, n: int) -> List[str]:
         """Generate health insurance-related queries."""
-        templates = [
-            "{tier} {plan_type} health insurance",
-            "{coverage} health plan with {feature}",
-            "affordable {plan_type} insurance",
-            "{tier} tier health coverage",
-            "{coverage} insurance with low deductible",
-            "{plan_type} plans with {feature}",
-            "comprehensive {coverage} coverage",
-            "{tier} health insurance options",
-            "{plan_type} with {feature} benefits",
-            "best {tier} {coverage} plans"
-        ]
-        
-        tiers = ["bronze", "silver", "gold", "platinum"]
-        plan_types = ["HMO", "PPO", "EPO", "HDHP"]
-        coverage_types = ["individual", "family", "employer", "student"]
-        features = ["prescription coverage", "dental", "vision", "mental health",
-                   "telehealth", "preventive care", "maternity"]
-        
-        queries = []
-        for _ in range(n):
-            template = random.choice(templates)
-            query = template.format(
-                tier=random.choice(tiers),
-                plan_type=random.choice(plan_types),
-                coverage=random.choice(coverage_types),
-                feature=random.choice(features)
-            )
-            queries.append(query)
-        
-        return queries
+        return self._fill_templates(
+            _INSURANCE_TEMPLATES, n,
+            tier=self._choose(_INSURANCE_TIERS, n),
+            plan_type=self._choose(_INSURANCE_PLAN_TYPES, n),
+            coverage=self._choose(_INSURANCE_COVERAGE_TYPES, n),
+            feature=self._choose(_INSURANCE_FEATURES, n)
+        )
     
     def add_manual_queries(self, queries: List[str]):
         """Add manually created queries to the collection."""
@@ -211,11 +242,13 @@ class QueryGenerator:
     
     def remove_query(self, query: str):
         """Remove a specific query."""
-        if query in self.queries:
+        try:
+            # One scan, rather than a membership test followed by remove()
             self.queries.remove(query)
-            print(f"✓ Removed query: '{query}'")
-        else:
+        except ValueError:
             print(f"✗ Query not found: '{query}'")
+        else:
+            print(f"✓ Removed query: '{query}'")
     
     def get_queries(self) -> List[str]:
         """Get all queries."""
@@ -227,83 +260,101 @@ class QueryGenerator:
         print("✓ Cleared all queries")
     
     def save_queries(self, filepath: str, metadata: Dict[str, Any] = None):
-        """Save queries to JSON file with optional metadata."""
-        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        """
+        Save queries as JSON Lines with optional metadata.
         
-        data = {
-            "queries": self.queries,
-            "metadata": metadata or {},
-            "count": len(self.queries)
-        }
+        The first line is a header object with metadata and count, followed
+        by one JSON string per query.
+        """
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
-        print(f"✓ Saved {len(self.queries)} queries to {filepath}")
+        count = len(self)
+        with open(filepath, 'wb') as f:
+            f.write(json_io.dumps({"metadata": metadata or {}, "count": count}) + b"\n")
+            f.writelines(json_io.dumps(query) + b"\n" for query in self.queries)
+        print(f"✓ Saved {count} queries to {filepath}")
     
     def load_queries(self, filepath: str) -> List[str]:
-        """Load queries from JSON file."""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        if isinstance(data, list):
-            # Legacy format: just a list of queries
-            self.queries = data
-        elif isinstance(data, dict) and 'queries' in data:
-            # New format: dict with queries and metadata
-            self.queries = data['queries']
-        else:
-            raise ValueError("Invalid query file format")
+        """Load queries from a JSON Lines file, or a legacy single-document JSON file."""
+        with open(filepath, 'rb') as f:
+            first = self._parse_jsonl_head(f.readline())
+            
+            if first is not None:
+                # JSON Lines: stream the remaining lines
+                self.queries = [first] if isinstance(first, str) else []
+                self.queries.extend(json_io.loads(line) for line in f if line.strip())
+            else:
+                f.seek(0)
+                data = json_io.loads(f.read())
+                if isinstance(data, list):
+                    # Legacy format: just a list of queries
+                    self.queries = data
+                elif isinstance(data, dict) and 'queries' in data:
+                    # Legacy format: dict with queries and metadata
+                    self.queries = data['queries']
+                else:
+                    raise ValueError("Invalid query file format")
         
-        print(f"✓ Loaded {len(self.queries)} queries from {filepath}")
+        print(f"✓ Loaded {len(self)} queries from {filepath}")
         return self.queries
     
+    @staticmethod
+    def _parse_jsonl_head(line: bytes) -> Optional[Any]:
+        """
+        Parse the first line of a JSON Lines query file.
+        
+        Returns:
+            Header dict, or the first query for files without a header;
+            None if the file is not JSON Lines
+        """
+        try:
+            value = json_io.loads(line)
+        except ValueError:
+            return None
+        
+        if isinstance(value, str) or (isinstance(value, dict) and 'queries' not in value):
+            return value
+        return None
+    
     def display_queries(self, max_display: int = None):
         """Display all queries (or first N queries)."""
-        display_count = min(len(self.queries), max_display) if max_display else len(self.queries)
+        queries = self.queries
+        display_count = min(len(queries), max_display) if max_display else len(queries)
         
         print(f"\n{'='*60}")
-        print(f"Test Queries ({display_count}/{len(self.queries)} shown)")
+        print(f"Test Queries ({display_count}/{len(queries)} shown)")
         print(f"{'='*60}")
         
-        for i, query in enumerate(self.queries[:display_count], 1):
+        for i, query in enumerate(queries[:display_count], 1):
             print(f"{i:3d}. {query}")
         
-        if max_display and len(self.queries) > max_display:
-            print(f"\n... and {len(self.queries) - max_display} more queries")
+        if max_display and len(queries) > max_display:
+            print(f"\n... and {len(queries) - max_display} more queries")
     
     def get_domain_distribution(self) -> Dict[str, int]:
         """Analyze domain distribution of queries (basic keyword matching)."""
-        distribution = {
-            'tech': 0,
-            'medical': 0,
-            'pharmaceutical': 0,
-            'health_insurance': 0,
-            'unknown': 0
-        }
+        distribution = dict.fromkeys(DOMAIN_KEYWORDS, 0)
+        distribution['unknown'] = 0
         
-        tech_keywords = ['python', 'javascript', 'programming', 'code', 'algorithm', 'web', 'api']
-        medical_keywords = ['cardiology', 'surgery', 'clinical', 'patient', 'diagnosis', 'treatment']
-        pharma_keywords = ['medication', 'drug', 'dosage', 'prescription', 'antibiotic', 'pharmaceutical']
-        insurance_keywords = ['insurance', 'coverage', 'plan', 'hmo', 'ppo', 'deductible', 'premium']
+        automaton = _keyword_automaton()
         
         for query in self.queries:
             query_lower = query.lower()
-            categorized = False
             
-            if any(keyword in query_lower for keyword in tech_keywords):
-                distribution['tech'] += 1
-                categorized = True
-            if any(keyword in query_lower for keyword in medical_keywords):
-                distribution['medical'] += 1
-                categorized = True
-            if any(keyword in query_lower for keyword in pharma_keywords):
-                distribution['pharmaceutical'] += 1
-                categorized = True
-            if any(keyword in query_lower for keyword in insurance_keywords):
-                distribution['health_insurance'] += 1
-                categorized = True
+            if automaton is not None:
+                # One pass over the query finds every keyword of every domain
+                matched = set()
+                for _, domains in automaton.iter(query_lower):
+                    matched.update(domains)
+            else:
+                matched = {
+                    domain for domain, keywords in DOMAIN_KEYWORDS.items()
+                    if any(keyword in query_lower for keyword in keywords)
+                }
             
-            if not categorized:
+            for domain in matched:
+                distribution[domain] += 1
+            if not matched:
                 distribution['unknown'] += 1
         
         return distribution
@@ -316,8 +367,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Generate test queries')
     parser.add_argument('-n', '--num-queries', type=int, default=20,
                        help='Number of auto-generated queries (default: 20)')
-    parser.add_argument('-o', '--output', type=str, default='data/queries.json',
-                       help='Output filepath (default: data/queries.json)')
+    parser.add_argument('-o', '--output', type=str, default='data/queries.jsonl',
+                       help='Output filepath (default: data/queries.jsonl)')
     parser.add_argument('--tech', type=float, default=0.25,
                        help='Proportion of tech queries (default: 0.25)')
     parser.add_argument('--medical', type=float, default=0.25,
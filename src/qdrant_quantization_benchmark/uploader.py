@@ -2,33 +2,291 @@
 Data upload operations for Qdrant with batch processing and retry logic.
 """
 
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import threading
 import time
-from typing import List, Dict, Any, Optional
-from qdrant_client import QdrantClient, models
+import traceback
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+import numpy as np
+from qdrant_client import QdrantClient, grpc, models
+from qdrant_client.conversions.conversion import RestToGrpc
 from qdrant_client.http.exceptions import ResponseHandlingException
 
 from .config import UploadConfig
+from .logging import LoggerMixin
 
 
-class DataUploader:
+class CircuitOpenError(Exception):
+    """Raised instead of attempting an upsert while the circuit breaker is open."""
+
+
+class _CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker: closed -> open -> half-open -> closed.
+    
+    Opens after `threshold` consecutive failures. While open, calls are
+    rejected until `cooldown` seconds pass; then a single probe is let
+    through, which closes the breaker on success or reopens it on failure.
+    """
+    
+    def __init__(self, threshold: int, cooldown: float):
+        """
+        Initialize breaker.
+        
+        Args:
+            threshold: Consecutive failures that open the breaker
+            cooldown: Seconds to stay open before allowing a probe
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return whether a call may proceed now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                return True
+            # Open and cooling down, or a half-open probe is already in flight
+            return False
+    
+    def on_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+    
+    def on_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class _RegisterBlockedBloom:
+    """
+    Bloom filter of 64-bit integer keys with all of a key's bits in one 64-bit word.
+    
+    Each key touches a single register, so a lookup is one memory access
+    and a batch of keys is checked with a few vectorized NumPy operations.
+    False positives are possible; false negatives are not.
+    """
+    
+    def __init__(self, m_bits: int = 1 << 24, k: int = 8):
+        """
+        Initialize filter.
+        
+        Args:
+            m_bits: Filter size in bits (rounded up to whole 64-bit words)
+            k: Bits set per key (at most 10; each uses 6 bits of the hash)
+        """
+        self.k = k
+        self.words = np.zeros(max(1, -(-m_bits // 64)), dtype=np.uint64)
+    
+    @staticmethod
+    def _mix(keys: np.ndarray) -> np.ndarray:
+        """SplitMix64 finalizer: spread integer keys over 64 bits."""
+        h = keys.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return h ^ (h >> np.uint64(31))
+    
+    def _locate(self, keys: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return each key's register index and bit mask."""
+        h = self._mix(np.fromiter(keys, dtype=np.int64))
+        index = (h % np.uint64(len(self.words))).astype(np.intp)
+        masks = np.zeros_like(h)
+        for i in range(self.k):
+            masks |= np.uint64(1) << ((h >> np.uint64(64 - 6 * (i + 1))) & np.uint64(63))
+        return index, masks
+    
+    def add(self, keys: Iterable[int]) -> None:
+        """Add keys to the filter."""
+        index, masks = self._locate(keys)
+        np.bitwise_or.at(self.words, index, masks)
+    
+    def contains_all(self, keys: Iterable[int]) -> bool:
+        """Return whether every key may have been added."""
+        index, masks = self._locate(keys)
+        return bool(np.all(self.words[index] & masks == masks))
+
+
+def _chunks(iterable: Iterable[Any], size: int) -> Iterator[Tuple[Any, ...]]:
+    """Yield successive tuples of up to `size` items from an iterable."""
+    iterator = iter(iterable)
+    while chunk := tuple(islice(iterator, size)):
+        yield chunk
+
+
+# Clients shared by DataUploader.from_endpoint, least recently used first
+_SHARED_CLIENTS_MAX = 8
+_shared_clients: "OrderedDict[Tuple[Any, ...], QdrantClient]" = OrderedDict()
+_shared_clients_lock = threading.Lock()
+
+
+def _get_client(
+    url: str,
+    api_key: Optional[str],
+    prefer_grpc: bool,
+    pool_size: int,
+    timeout: Optional[int]
+) -> QdrantClient:
+    """
+    Return a shared client per endpoint and settings.
+    
+    Reusing one client keeps its HTTP/2 (or gRPC) connections open across
+    uploaders instead of paying a TLS handshake for each new one. At most
+    _SHARED_CLIENTS_MAX clients are kept; an evicted client is closed once
+    no uploader holds it any more.
+    """
+    # Key on a digest so the cache itself never holds API keys
+    key_digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None
+    key = (url, key_digest, prefer_grpc, pool_size, timeout)
+    
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is not None:
+            _shared_clients.move_to_end(key)
+            return client
+        
+        client = QdrantClient(
+            url=url,
+            api_key=api_key,
+            prefer_grpc=prefer_grpc,
+            pool_size=pool_size,
+            timeout=timeout
+        )
+        _shared_clients[key] = client
+        if len(_shared_clients) > _SHARED_CLIENTS_MAX:
+            _shared_clients.popitem(last=False)
+        return client
+
+
+def close_shared_clients() -> None:
+    """Close every client shared by DataUploader.from_endpoint and forget them."""
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        client.close()
+
+
+class DataUploader(LoggerMixin):
     """Handles batch upload of data to Qdrant collections."""
     
-    def __init__(self, client: QdrantClient, config: Optional[UploadConfig] = None):
+    def __init__(
+        self,
+        client: QdrantClient,
+        config: Optional[UploadConfig] = None,
+        prefer_grpc: bool = False
+    ):
         """
         Initialize data uploader.
         
         Args:
             client: Qdrant client instance
             config: Upload configuration
+            prefer_grpc: Whether client is a remote client created with
+                prefer_grpc=True; config.use_grpc_raw only applies then
         """
         self.client = client
         self.config = config or UploadConfig()
+        # Shared by all batches and upload_batch calls, so an outage is
+        # detected once instead of every batch exhausting its retries
+        self._breaker = (
+            _CircuitBreaker(self.config.breaker_threshold, self.config.breaker_cooldown)
+            if self.config.breaker_threshold > 0 else None
+        )
+        # Per-collection filters of upserted point hashes (config.skip_seen), built on first use
+        self._seen_points: Dict[str, _RegisterBlockedBloom] = {}
+        self._seen_lock = threading.Lock()
+        # Upload outcome counters; upserts may run in worker threads
+        self._stats = {"uploaded": 0, "retried": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        self.setup_logger("DataUploader")
+        # Local (":memory:" or path) and REST clients only accept REST models
+        self._grpc_raw = self.config.use_grpc_raw and prefer_grpc
+        if self.config.use_grpc_raw and not prefer_grpc:
+            self.log.warning(
+                "grpc_raw_unsupported",
+                reason="client is not a prefer_grpc remote client; sending REST points"
+            )
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of points uploaded and batch retries/failures so far."""
+        with self._stats_lock:
+            return dict(self._stats)
+    
+    def flush_stats(self) -> Dict[str, int]:
+        """
+        Log the upload counters as a single upload_stats event.
+        
+        Returns:
+            The counters that were logged
+        """
+        stats = self.stats
+        self.log.info("upload_stats", **stats)
+        return stats
+    
+    def _count(self, key: str, n: int = 1) -> None:
+        """Add n to an upload counter."""
+        with self._stats_lock:
+            self._stats[key] += n
+    
+    @classmethod
+    def from_endpoint(
+        cls,
+        url: str,
+        api_key: Optional[str] = None,
+        config: Optional[UploadConfig] = None,
+        prefer_grpc: bool = True,
+        pool_size: int = 100,
+        timeout: Optional[int] = None
+    ) -> "DataUploader":
+        """
+        Create an uploader with a client shared by all uploaders for the endpoint.
+        
+        Shared clients stay open until close_shared_clients() is called.
+        
+        Args:
+            url: Qdrant URL
+            api_key: Qdrant API key
+            config: Upload configuration
+            prefer_grpc: Talk to Qdrant over gRPC
+            pool_size: Connections kept by the client (at least config.pool_size)
+            timeout: Request timeout in seconds
+            
+        Returns:
+            DataUploader using the shared client
+        """
+        config = config or UploadConfig()
+        client = _get_client(
+            url, api_key, prefer_grpc, max(pool_size, config.pool_size), timeout
+        )
+        return cls(client, config, prefer_grpc=prefer_grpc)
     
     def upload_batch(
         self,
         collection_name: str,
         dataset: List[Dict[str, Any]],
-        embeddings: List[List[float]],
+        embeddings: Union[np.ndarray, List[List[float]]],
         named_vector: bool = True,
         vector_name: str = "dense",
         show_progress: bool = True
@@ -39,7 +297,96 @@ class DataUploader:
         Args:
             collection_name: Name of the collection
             dataset: List of data items
-            embeddings: Precomputed embeddings
+            embeddings: Precomputed embeddings (2D array or list of vectors)
+            named_vector: Whether to use named vectors
+            vector_name: Name of the vector field (if named_vector=True)
+            show_progress: Whether to show progress
+            
+        Returns:
+            Total number of points uploaded
+        """
+        if self.config.adaptive:
+            uploaded_counts = self._upload_adaptively(
+                collection_name, dataset, embeddings, named_vector, vector_name
+            )
+            return self._track_progress(
+                collection_name, uploaded_counts, len(dataset), show_progress
+            )
+        
+        batches = self._batches(dataset, embeddings, named_vector, vector_name)
+        return self._upload_batches(collection_name, batches, len(dataset), show_progress)
+    
+    def upload_batch_shm(
+        self,
+        collection_name: str,
+        shm_name: str,
+        shape: Tuple[int, int],
+        dtype: Union[str, np.dtype],
+        dataset: List[Dict[str, Any]],
+        named_vector: bool = True,
+        vector_name: str = "dense",
+        show_progress: bool = True
+    ) -> int:
+        """
+        Upload embeddings that another process wrote to shared memory.
+        
+        The block is mapped and batches are sliced from it in place, so the
+        embeddings are never pickled or copied between processes. The caller
+        (the process that created the block) remains responsible for
+        unlinking it.
+        
+        Args:
+            collection_name: Name of the collection
+            shm_name: Name of the SharedMemory block holding the embeddings
+            shape: (number of vectors, dimension) of the embeddings array
+            dtype: Element type of the embeddings array (e.g. "float32")
+            dataset: List of data items, one per embedding row
+            named_vector: Whether to use named vectors
+            vector_name: Name of the vector field (if named_vector=True)
+            show_progress: Whether to show progress
+            
+        Returns:
+            Total number of points uploaded
+        """
+        shm = shared_memory.SharedMemory(name=shm_name)
+        embeddings = None
+        try:
+            embeddings = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            return self.upload_batch(
+                collection_name, dataset, embeddings, named_vector, vector_name, show_progress
+            )
+        except BaseException as e:
+            # Frames of the failed upload still hold views of the block; drop
+            # them so none outlives the mapping
+            traceback.clear_frames(e.__traceback__)
+            raise
+        finally:
+            # Release the view before unmapping
+            del embeddings
+            shm.close()
+    
+    async def upload_batch_async(
+        self,
+        collection_name: str,
+        dataset: List[Dict[str, Any]],
+        embeddings: Union[np.ndarray, List[List[float]]],
+        named_vector: bool = True,
+        vector_name: str = "dense",
+        show_progress: bool = True
+    ) -> int:
+        """
+        Upload dataset with precomputed embeddings in batches, without blocking the event loop.
+        
+        Upserts run in a worker thread and retry backoff awaits asyncio.sleep,
+        so other tasks (e.g. concurrent uploads) keep running while a batch
+        waits to be retried. Up to config.pool_size batches are in flight at
+        once; if one fails, no further batches are started and the first
+        error is raised once the in-flight ones finish.
+        
+        Args:
+            collection_name: Name of the collection
+            dataset: List of data items
+            embeddings: Precomputed embeddings (2D array or list of vectors)
             named_vector: Whether to use named vectors
             vector_name: Name of the vector field (if named_vector=True)
             show_progress: Whether to show progress
@@ -47,50 +394,270 @@ class DataUploader:
         Returns:
             Total number of points uploaded
         """
+        slots = asyncio.Semaphore(self.config.pool_size)
+        errors: List[BaseException] = []
+        total_uploaded = 0
+        
+        async def upload(batch_num: int, points: List[models.PointStruct]) -> None:
+            nonlocal total_uploaded
+            try:
+                uploaded = await self._upload_points_async(collection_name, points, batch_num)
+            except Exception as e:
+                errors.append(e)
+                return
+            finally:
+                slots.release()
+            if show_progress:
+                self._report_progress(total_uploaded, total_uploaded + uploaded, len(dataset))
+            total_uploaded += uploaded
+        
+        tasks = []
+        for batch_num, points in self._batches(dataset, embeddings, named_vector, vector_name):
+            # Wait for a free slot, so at most pool_size upserts are in flight
+            await slots.acquire()
+            if errors:
+                break
+            tasks.append(asyncio.ensure_future(upload(batch_num, points)))
+        
+        await asyncio.gather(*tasks)
+        if errors:
+            raise errors[0]
+        
+        if show_progress:
+            print(f"✓ Uploaded {total_uploaded} points to {collection_name}")
+        
+        return total_uploaded
+    
+    def _batches(
+        self,
+        dataset: List[Dict[str, Any]],
+        embeddings: Union[np.ndarray, List[List[float]]],
+        named_vector: bool,
+        vector_name: str
+    ) -> Iterator[Tuple[int, List[models.PointStruct]]]:
+        """
+        Validate a dataset/embeddings pair and lazily prepare its batches.
+        
+        Raises:
+            ValueError: If dataset and embeddings sizes differ
+        """
+        embeddings = self._check_embeddings(dataset, embeddings)
+        batch_size = self.config.batch_size
+        
+        return (
+            (i // batch_size, self._prepare_points(
+                dataset[i:i + batch_size],
+                embeddings[i:i + batch_size],
+                start_id=i,
+                named_vector=named_vector,
+                vector_name=vector_name
+            ))
+            for i in range(0, len(dataset), batch_size)
+        )
+    
+    @staticmethod
+    def _check_embeddings(
+        dataset: List[Dict[str, Any]],
+        embeddings: Union[np.ndarray, List[List[float]]]
+    ) -> Union[np.ndarray, List[List[float]]]:
+        """
+        Validate embeddings against the dataset and normalize arrays.
+        
+        Raises:
+            ValueError: If dataset and embeddings sizes differ
+        """
         if len(dataset) != len(embeddings):
             raise ValueError(
                 f"Dataset size ({len(dataset)}) doesn't match embeddings size ({len(embeddings)})"
             )
         
-        total_uploaded = 0
-        batch_size = self.config.batch_size
+        # Normalize once so every batch is a zero-copy row slice of a
+        # contiguous float32 buffer (no copy if it already is one)
+        if isinstance(embeddings, np.ndarray):
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        return embeddings
+    
+    def _upload_adaptively(
+        self,
+        collection_name: str,
+        dataset: List[Dict[str, Any]],
+        embeddings: Union[np.ndarray, List[List[float]]],
+        named_vector: bool,
+        vector_name: str
+    ) -> Iterator[int]:
+        """
+        Upload batches sized by feedback from the server.
+        
+        Starts at config.batch_size, doubles after each successful upsert (up
+        to config.max_batch_size) and halves after a failed one, retrying the
+        same items; a failure at batch size 1 is raised.
         
-        for i in range(0, len(dataset), batch_size):
-            batch_dataset = dataset[i:i + batch_size]
-            batch_embeddings = embeddings[i:i + batch_size]
+        Args:
+            collection_name: Name of the collection
+            dataset: List of data items
+            embeddings: Precomputed embeddings (2D array or list of vectors)
+            named_vector: Whether to use named vectors
+            vector_name: Name of the vector field
+            
+        Yields:
+            Number of points uploaded per batch
             
+        Raises:
+            ValueError: If dataset and embeddings sizes differ
+            ResponseHandlingException: If a single-point batch fails
+        """
+        embeddings = self._check_embeddings(dataset, embeddings)
+        batch_size = self.config.batch_size
+        start = batch_num = 0
+        
+        while start < len(dataset):
+            end = start + batch_size
             points = self._prepare_points(
-                batch_dataset, 
-                batch_embeddings, 
-                start_id=i,
+                dataset[start:end],
+                embeddings[start:end],
+                start_id=start,
                 named_vector=named_vector,
                 vector_name=vector_name
             )
+            try:
+                uploaded = self._upload_points(collection_name, points, batch_num)
+            except ResponseHandlingException:
+                if batch_size == 1:
+                    raise
+                batch_size //= 2
+                self._count("retried")
+                self.log.warning("upload_batch_shrunk", batch=batch_num + 1, batch_size=batch_size)
+                continue
             
-            if self.config.enable_retry:
-                uploaded = self._upload_with_retry(collection_name, points, batch_num=i // batch_size)
-            else:
-                self.client.upsert(collection_name=collection_name, points=points)
-                uploaded = len(points)
+            yield uploaded
+            start, batch_num = end, batch_num + 1
+            batch_size = min(batch_size * 2, self.config.max_batch_size)
+    
+    def upload_stream(
+        self,
+        collection_name: str,
+        items: Iterable[Tuple[Dict[str, Any], Union[np.ndarray, List[float]]]],
+        named_vector: bool = True,
+        vector_name: str = "dense",
+        show_progress: bool = True,
+        total: Optional[int] = None
+    ) -> int:
+        """
+        Upload (payload, vector) pairs from an iterable in batches.
+        
+        Items are consumed batch_size at a time, so only the batches being
+        prepared or uploaded are held in memory; a generator that embeds
+        lazily is pipelined with the upload.
+        
+        Args:
+            collection_name: Name of the collection
+            items: Iterable of (data item, embedding) pairs
+            named_vector: Whether to use named vectors
+            vector_name: Name of the vector field (if named_vector=True)
+            show_progress: Whether to show progress
+            total: Expected number of items (for progress output only)
             
-            total_uploaded += uploaded
+        Returns:
+            Total number of points uploaded
+        """
+        batches = (
+            (batch_num, self._prepare_points(
+                [item for item, _ in chunk],
+                [
+                    embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+                    for _, embedding in chunk
+                ],
+                start_id=batch_num * self.config.batch_size,
+                named_vector=named_vector,
+                vector_name=vector_name
+            ))
+            for batch_num, chunk in enumerate(_chunks(items, self.config.batch_size))
+        )
+        
+        return self._upload_batches(collection_name, batches, total, show_progress)
+    
+    def _upload_batches(
+        self,
+        collection_name: str,
+        batches: Iterable[Tuple[int, List[models.PointStruct]]],
+        total: Optional[int],
+        show_progress: bool
+    ) -> int:
+        """
+        Upload prepared batches, concurrently if config.pool_size > 1.
+        
+        Args:
+            collection_name: Name of the collection
+            batches: (batch number, points) pairs
+            total: Expected number of points (for progress output), if known
+            show_progress: Whether to show progress
             
-            if show_progress and total_uploaded % 1000 == 0:
-                print(f"  Progress: {total_uploaded}/{len(dataset)} points...")
+        Returns:
+            Total number of points uploaded
+        """
+        if self.config.pool_size > 1:
+            uploaded_counts = self._upload_concurrently(collection_name, batches)
+        else:
+            uploaded_counts = (
+                self._upload_points(collection_name, points, batch_num)
+                for batch_num, points in batches
+            )
+        
+        return self._track_progress(collection_name, uploaded_counts, total, show_progress)
+    
+    def _track_progress(
+        self,
+        collection_name: str,
+        uploaded_counts: Iterable[int],
+        total: Optional[int],
+        show_progress: bool
+    ) -> int:
+        """
+        Consume per-batch upload counts, printing progress every 1000 points.
+        
+        Args:
+            collection_name: Name of the collection
+            uploaded_counts: Number of points uploaded per batch
+            total: Expected number of points (for progress output), if known
+            show_progress: Whether to show progress
+            
+        Returns:
+            Total number of points uploaded
+        """
+        total_uploaded = 0
+        for uploaded in uploaded_counts:
+            if show_progress:
+                self._report_progress(total_uploaded, total_uploaded + uploaded, total)
+            total_uploaded += uploaded
         
         if show_progress:
             print(f"✓ Uploaded {total_uploaded} points to {collection_name}")
         
         return total_uploaded
     
+    @staticmethod
+    def _report_progress(before: int, after: int, total: Optional[int]) -> None:
+        """
+        Print progress if a 1000-point mark was crossed between two counts.
+        
+        Args:
+            before: Points uploaded before the batch
+            after: Points uploaded after the batch
+            total: Expected number of points, if known
+        """
+        # Batch sizes may vary, so report each 1000-point mark crossed
+        if before // 1000 < after // 1000:
+            of_total = f"/{total}" if total is not None else ""
+            print(f"  Progress: {after}{of_total} points...")
+    
     def _prepare_points(
         self,
         batch_dataset: List[Dict[str, Any]],
-        batch_embeddings: List[List[float]],
+        batch_embeddings: Union[np.ndarray, List[List[float]]],
         start_id: int,
         named_vector: bool,
         vector_name: str
-    ) -> List[models.PointStruct]:
+    ) -> List[Union[models.PointStruct, grpc.PointStruct]]:
         """
         Prepare PointStruct objects for upload.
         
@@ -102,22 +669,274 @@ class DataUploader:
             vector_name: Name of the vector field
             
         Returns:
-            List of PointStruct objects
+            List of PointStruct objects (gRPC messages if config.use_grpc_raw
+            and the client sends gRPC)
+        """
+        if isinstance(batch_embeddings, np.ndarray):
+            return self._prepare_points_np(
+                batch_dataset, batch_embeddings, start_id, named_vector, vector_name
+            )
+        else:
+            # Points are built unvalidated below, so nothing else would turn
+            # NumPy rows into the lists the serializer expects
+            batch_embeddings = [
+                embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+                for embedding in batch_embeddings
+            ]
+        
+        ids = range(start_id, start_id + len(batch_dataset))
+        
+        if self._grpc_raw:
+            return self._prepare_grpc_points(
+                ids, batch_dataset, batch_embeddings, named_vector, vector_name
+            )
+        
+        # IDs, vectors and payloads are built here with the right types, so
+        # skip pydantic validating every point (and every float in it)
+        # model_construct on pydantic v2, construct on v1
+        construct = (
+            getattr(models.PointStruct, "model_construct", None) or models.PointStruct.construct
+        )
+        if named_vector:
+            # One interned key object shared by every point's vector dict
+            vector_name = sys.intern(vector_name)
+            return [
+                construct(id=point_id, vector={vector_name: embedding}, payload=item)
+                for point_id, embedding, item in zip(ids, batch_embeddings, batch_dataset)
+            ]
+        return [
+            construct(id=point_id, vector=embedding, payload=item)
+            for point_id, embedding, item in zip(ids, batch_embeddings, batch_dataset)
+        ]
+    
+    @staticmethod
+    def _prepare_grpc_points(
+        ids: Iterable[int],
+        batch_dataset: List[Dict[str, Any]],
+        batch_embeddings: List[List[float]],
+        named_vector: bool,
+        vector_name: str
+    ) -> List[grpc.PointStruct]:
         """
-        points = []
+        Prepare gRPC PointStruct messages for upload.
+        
+        A gRPC client sends these as-is, skipping pydantic validation of
+        each REST point and its REST-to-gRPC conversion inside upsert.
         
-        for idx, (item, embedding) in enumerate(zip(batch_dataset, batch_embeddings)):
-            vector_data = {vector_name: embedding} if named_vector else embedding
+        Args:
+            ids: Point IDs
+            batch_dataset: Batch of dataset items
+            batch_embeddings: Batch of embeddings
+            named_vector: Whether to use named vectors
+            vector_name: Name of the vector field
             
-            points.append(
-                models.PointStruct(
-                    id=start_id + idx,
-                    vector=vector_data,
-                    payload=item
-                )
+        Returns:
+            List of gRPC PointStruct messages
+        """
+        if named_vector:
+            vector_name = sys.intern(vector_name)
+            
+            def vectors(embedding: List[float]) -> grpc.Vectors:
+                return grpc.Vectors(vectors=grpc.NamedVectors(
+                    vectors={vector_name: grpc.Vector(dense=grpc.DenseVector(data=embedding))}
+                ))
+        else:
+            def vectors(embedding: List[float]) -> grpc.Vectors:
+                return grpc.Vectors(vector=grpc.Vector(dense=grpc.DenseVector(data=embedding)))
+        
+        return [
+            grpc.PointStruct(
+                id=grpc.PointId(num=point_id),
+                vectors=vectors(embedding),
+                payload=RestToGrpc.convert_payload(item)
+            )
+            for point_id, embedding, item in zip(ids, batch_embeddings, batch_dataset)
+        ]
+    
+    def _prepare_points_np(
+        self,
+        batch_dataset: List[Dict[str, Any]],
+        batch_embeddings: np.ndarray,
+        start_id: int,
+        named_vector: bool,
+        vector_name: str
+    ) -> List[Union[models.PointStruct, grpc.PointStruct]]:
+        """
+        Prepare PointStruct objects from a float32 embedding array.
+        
+        The whole batch is converted to Python lists in one C-level tolist()
+        pass over contiguous memory, rather than letting the point model
+        validate NumPy scalars one at a time.
+        
+        Args:
+            batch_dataset: Batch of dataset items
+            batch_embeddings: 2D C-contiguous float32 array, one row per item
+            start_id: Starting ID for this batch
+            named_vector: Whether to use named vectors
+            vector_name: Name of the vector field
+            
+        Returns:
+            List of PointStruct objects
+        """
+        if batch_embeddings.dtype != np.float32 or not batch_embeddings.flags.c_contiguous:
+            batch_embeddings = np.ascontiguousarray(batch_embeddings, dtype=np.float32)
+        
+        return self._prepare_points(
+            batch_dataset, batch_embeddings.tolist(), start_id, named_vector, vector_name
+        )
+    
+    def _upload_points(
+        self,
+        collection_name: str,
+        points: List[models.PointStruct],
+        batch_num: int
+    ) -> int:
+        """
+        Upload one batch, with retries if enabled, and return its point count.
+        
+        With config.skip_seen, a batch whose points (ID, vector and payload)
+        were all upserted to the collection earlier by this uploader is
+        skipped and counts as 0. A Bloom filter false positive on the only
+        new point of an otherwise seen batch skips that batch too.
+        """
+        if not self.config.skip_seen:
+            return self._send_points(collection_name, points, batch_num)
+        
+        if self._already_seen(collection_name, points):
+            return 0
+        uploaded = self._send_points(collection_name, points, batch_num)
+        self._mark_seen(collection_name, points)
+        return uploaded
+    
+    async def _upload_points_async(
+        self,
+        collection_name: str,
+        points: List[models.PointStruct],
+        batch_num: int
+    ) -> int:
+        """Async counterpart of _upload_points."""
+        if self.config.skip_seen and self._already_seen(collection_name, points):
+            return 0
+        
+        if self.config.enable_retry:
+            uploaded = await self._upload_with_retry_async(collection_name, points, batch_num)
+        else:
+            await self._upsert_async(collection_name, points)
+            uploaded = len(points)
+        
+        if self.config.skip_seen:
+            self._mark_seen(collection_name, points)
+        return uploaded
+    
+    @staticmethod
+    def _point_keys(points: List[models.PointStruct]) -> List[int]:
+        """
+        Return a 64-bit hash of each REST or gRPC point's ID, vector and payload.
+        
+        Keying on content rather than ID alone means a different dataset
+        upserted under the same positional IDs is sent, not skipped.
+        """
+        keys = []
+        for point in points:
+            if isinstance(point, grpc.PointStruct):
+                data = point.SerializeToString(deterministic=True)
+            else:
+                data = json.dumps(
+                    [point.id, point.vector, point.payload], sort_keys=True, default=str
+                ).encode("utf-8")
+            digest = hashlib.blake2b(data, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+    
+    def _already_seen(self, collection_name: str, points: List[models.PointStruct]) -> bool:
+        """Return whether every point was already upserted to the collection."""
+        keys = self._point_keys(points)
+        with self._seen_lock:
+            seen = self._seen_points.get(collection_name)
+            return seen is not None and seen.contains_all(keys)
+    
+    def _mark_seen(self, collection_name: str, points: List[models.PointStruct]) -> None:
+        """Record points as upserted to the collection."""
+        keys = self._point_keys(points)
+        with self._seen_lock:
+            seen = self._seen_points.setdefault(collection_name, _RegisterBlockedBloom())
+            seen.add(keys)
+    
+    def _send_points(
+        self,
+        collection_name: str,
+        points: List[models.PointStruct],
+        batch_num: int
+    ) -> int:
+        """Upsert one batch, with retries if enabled, and return its point count."""
+        if self.config.enable_retry:
+            return self._upload_with_retry(collection_name, points, batch_num=batch_num)
+        
+        self._upsert(collection_name, points)
+        return len(points)
+    
+    def _upsert(self, collection_name: str, points: List[models.PointStruct]) -> None:
+        """
+        Upsert points through the circuit breaker.
+        
+        Raises:
+            CircuitOpenError: If the breaker is open
+            ResponseHandlingException: If the upsert fails
+        """
+        if self._breaker is None:
+            self.client.upsert(collection_name=collection_name, points=points)
+            self._count("uploaded", len(points))
+            return
+        
+        if not self._breaker.allow():
+            raise CircuitOpenError(
+                f"Upload to {collection_name} short-circuited after "
+                f"{self._breaker.failures} consecutive failed upserts"
             )
+        try:
+            self.client.upsert(collection_name=collection_name, points=points)
+        except Exception:
+            # Any failure must be recorded, or a failed half-open probe
+            # would leave the breaker rejecting calls forever
+            self._breaker.on_failure()
+            raise
+        self._breaker.on_success()
+        self._count("uploaded", len(points))
+    
+    async def _upsert_async(self, collection_name: str, points: List[models.PointStruct]) -> None:
+        """Run _upsert in the event loop's default executor."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self._upsert, collection_name, points))
+    
+    def _upload_concurrently(
+        self,
+        collection_name: str,
+        batches: Iterable[Tuple[int, List[models.PointStruct]]]
+    ) -> Iterator[int]:
+        """
+        Upload batches with up to config.pool_size upserts in flight.
         
-        return points
+        Batches are prepared lazily, so at most pool_size prepared batches are
+        held in memory. Upserts are network-bound and release the GIL, so
+        threads overlap their round trips.
+        
+        Args:
+            collection_name: Name of the collection
+            batches: (batch number, points) pairs
+            
+        Yields:
+            Number of points uploaded per batch, in batch order
+        """
+        with ThreadPoolExecutor(max_workers=self.config.pool_size) as executor:
+            pending = deque()
+            for batch_num, points in batches:
+                if len(pending) >= self.config.pool_size:
+                    yield pending.popleft().result()
+                pending.append(
+                    executor.submit(self._upload_points, collection_name, points, batch_num)
+                )
+            while pending:
+                yield pending.popleft().result()
     
     def _upload_with_retry(
         self, 
@@ -138,31 +957,105 @@ class DataUploader:
             
         Raises:
             ResponseHandlingException: If all retries fail
+            CircuitOpenError: If the circuit breaker opens
         """
         max_retries = self.config.max_retries
         
         for attempt in range(max_retries):
             try:
-                self.client.upsert(collection_name=collection_name, points=points)
+                self._upsert(collection_name, points)
                 return len(points)
-            except ResponseHandlingException as e:
+            except ResponseHandlingException:
                 if attempt < max_retries - 1:
-                    wait_time = self.config.initial_backoff * (attempt + 1)
-                    print(
-                        f"  ⚠ Timeout on batch {batch_num + 1}, "
-                        f"retrying in {wait_time}s... "
-                        f"(attempt {attempt + 1}/{max_retries})"
-                    )
+                    wait_time = self._backoff(attempt)
+                    self._log_retry(batch_num, attempt, wait_time)
                     time.sleep(wait_time)
                 else:
-                    print(
-                        f"  ✗ Failed batch {batch_num + 1} "
-                        f"after {max_retries} attempts"
-                    )
+                    self._log_failure(batch_num)
                     raise
         
         return 0  # Should never reach here
     
+    async def _upload_with_retry_async(
+        self,
+        collection_name: str,
+        points: List[models.PointStruct],
+        batch_num: int
+    ) -> int:
+        """
+        Async counterpart of _upload_with_retry.
+        
+        The upsert runs in a worker thread and the backoff awaits
+        asyncio.sleep, so waiting never blocks the event loop.
+        
+        Args:
+            collection_name: Name of the collection
+            points: Points to upload
+            batch_num: Batch number (for logging)
+            
+        Returns:
+            Number of points uploaded
+            
+        Raises:
+            ResponseHandlingException: If all retries fail
+            CircuitOpenError: If the circuit breaker opens
+        """
+        max_retries = self.config.max_retries
+        
+        for attempt in range(max_retries):
+            try:
+                await self._upsert_async(collection_name, points)
+                return len(points)
+            except ResponseHandlingException:
+                if attempt < max_retries - 1:
+                    wait_time = self._backoff(attempt)
+                    self._log_retry(batch_num, attempt, wait_time)
+                    await asyncio.sleep(wait_time)
+                else:
+                    self._log_failure(batch_num)
+                    raise
+        
+        return 0  # Should never reach here
+    
+    def _log_retry(self, batch_num: int, attempt: int, wait_time: float) -> None:
+        """Count and log a failed attempt that will be retried."""
+        self._count("retried")
+        self.log.warning(
+            "upload_retry",
+            batch=batch_num + 1,
+            attempt=attempt + 1,
+            max_retries=self.config.max_retries,
+            wait_s=round(wait_time, 2)
+        )
+    
+    def _log_failure(self, batch_num: int) -> None:
+        """Count and log a batch that failed on every attempt."""
+        self._count("failed")
+        self.log.error(
+            "upload_failed",
+            batch=batch_num + 1,
+            attempts=self.config.max_retries
+        )
+    
+    def _backoff(self, attempt: int) -> float:
+        """
+        Wait time before retrying after a failed attempt.
+        
+        Exponential (initial_backoff * 2**attempt) capped at max_backoff; with
+        jitter, a uniformly random time up to that, so clients that failed
+        together don't retry in lockstep.
+        
+        Args:
+            attempt: Zero-based index of the failed attempt
+            
+        Returns:
+            Seconds to wait
+        """
+        backoff = min(self.config.max_backoff, self.config.initial_backoff * 2 ** attempt)
+        if self.config.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+    
     # PRESERVED COMMENTED RETRY CODE FOR REFERENCE
     """
     # Alternative retry implementation with more detailed error handling
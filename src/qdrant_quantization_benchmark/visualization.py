@@ -2,9 +2,60 @@
 Visualization and analysis of benchmark results.
 """
 
-from typing import Dict, List
-import matplotlib.pyplot as plt
+from typing import Dict, List, NamedTuple
 import numpy as np
+# Figures are built with the object-oriented API rather than pyplot: they
+# are only ever saved to files, so no GUI backend or global figure state is
+# needed, and importing the package leaves the user's backend untouched
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+
+from .benchmarking import Metrics
+
+
+# Axis indices into _ResultArrays.latencies / .speedups
+_NO_RESCORING, _WITH_RESCORING = 0, 1
+_AVG, _P95 = Metrics._fields.index('avg'), Metrics._fields.index('p95')
+# Percentiles shown in the percentile comparison: (label, metric index)
+_PLOT_PERCENTILES = [
+    ('P50', Metrics._fields.index('p50')),
+    ('P90', Metrics._fields.index('p90')),
+    ('P95', Metrics._fields.index('p95')),
+    ('P99', Metrics._fields.index('p99')),
+    ('P99.5', Metrics._fields.index('p995')),
+]
+
+
+class _ResultArrays(NamedTuple):
+    """Benchmark results as arrays, with metrics in Metrics field order."""
+    methods: List[str]
+    baseline: np.ndarray  # (n_metrics,)
+    latencies: np.ndarray  # (n_methods, 2, n_metrics): no rescoring, with rescoring
+    speedups: np.ndarray  # baseline / latencies, same shape as latencies
+
+
+def _to_arrays(
+    baseline_metrics: Dict[str, float],
+    quantization_results: Dict[str, Dict[str, Dict[str, float]]]
+) -> _ResultArrays:
+    """
+    Convert baseline/quantization results (dicts or Metrics) to arrays in one pass.
+    
+    Args:
+        baseline_metrics: Baseline performance metrics
+        quantization_results: Results from quantization benchmarks
+        
+    Returns:
+        Arrays shared by all plots and the printed summary
+    """
+    baseline = np.array(Metrics.from_dict(baseline_metrics), dtype=float)
+    latencies = np.array([
+        [Metrics.from_dict(results['no_rescoring']), Metrics.from_dict(results['with_rescoring'])]
+        for results in quantization_results.values()
+    ], dtype=float).reshape(-1, 2, len(Metrics._fields))
+    with np.errstate(divide='ignore'):
+        speedups = baseline / latencies
+    return _ResultArrays(list(quantization_results), baseline, latencies, speedups)
 
 
 class BenchmarkVisualizer:
@@ -24,61 +75,42 @@ class BenchmarkVisualizer:
             quantization_results: Results from quantization benchmarks
             output_path: Path to save the output figure
         """
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+        data = _to_arrays(baseline_metrics, quantization_results)
+        fig = Figure(figsize=(16, 12))
+        axes = fig.subplots(2, 2)
         fig.suptitle('Quantization Performance Analysis', fontsize=16, fontweight='bold')
         
         # 1. PERCENTILE COMPARISON (Top Left)
-        BenchmarkVisualizer._plot_percentile_comparison(
-            axes[0, 0], baseline_metrics, quantization_results
-        )
+        BenchmarkVisualizer._plot_percentile_comparison(axes[0, 0], data)
         
         # 2. SPEEDUP COMPARISON (Top Right)
-        BenchmarkVisualizer._plot_speedup_comparison(
-            axes[0, 1], baseline_metrics, quantization_results
-        )
+        BenchmarkVisualizer._plot_speedup_comparison(axes[0, 1], data)
         
         # 3. WITH vs WITHOUT RESCORING (Bottom Left)
-        BenchmarkVisualizer._plot_rescoring_impact(
-            axes[1, 0], baseline_metrics, quantization_results
-        )
+        BenchmarkVisualizer._plot_rescoring_impact(axes[1, 0], data)
         
         # 4. P95 COMPARISON TABLE (Bottom Right)
-        BenchmarkVisualizer._plot_p95_table(
-            axes[1, 1], baseline_metrics, quantization_results
-        )
+        BenchmarkVisualizer._plot_p95_table(axes[1, 1], data)
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.tight_layout()
+        fig.savefig(output_path, dpi=300, bbox_inches='tight')
         print(f"✓ Saved visualization to {output_path}")
     
     @staticmethod
-    def _plot_percentile_comparison(
-        ax: plt.Axes,
-        baseline_metrics: Dict[str, float],
-        quantization_results: Dict[str, Dict[str, Dict[str, float]]]
-    ) -> None:
+    def _plot_percentile_comparison(ax: Axes, data: _ResultArrays) -> None:
         """Plot percentile comparison across methods."""
-        percentiles = ['P50', 'P90', 'P95', 'P99', 'P99.5']
-        x = np.arange(len(percentiles))
+        labels, indices = zip(*_PLOT_PERCENTILES)
+        indices = list(indices)
+        x = np.arange(len(labels))
         width = 0.15
         
         # Baseline
-        baseline_values = [
-            baseline_metrics['p50'], baseline_metrics['p90'],
-            baseline_metrics['p95'], baseline_metrics['p99'],
-            baseline_metrics['p99.5']
-        ]
-        ax.bar(x - 2*width, baseline_values, width, label='Baseline', color='#2E86AB')
+        ax.bar(x - 2*width, data.baseline[indices], width, label='Baseline', color='#2E86AB')
         
         # Quantized methods
         colors = {'scalar': '#A23B72', 'binary': '#F18F01', 'binary_2bit': '#C73E1D'}
-        for i, (method, results) in enumerate(quantization_results.items()):
-            no_rescore = results['no_rescoring']
-            values = [
-                no_rescore['p50'], no_rescore['p90'], no_rescore['p95'],
-                no_rescore['p99'], no_rescore['p99.5']
-            ]
-            ax.bar(x + (i-1)*width, values, width,
+        for i, method in enumerate(data.methods):
+            ax.bar(x + (i-1)*width, data.latencies[i, _NO_RESCORING, indices], width,
                   label=f'{method.upper()} (No Rescore)',
                   color=colors.get(method, '#999999'), alpha=0.7)
         
@@ -86,29 +118,18 @@ class BenchmarkVisualizer:
         ax.set_ylabel('Latency (ms)', fontweight='bold')
         ax.set_title('Latency Distribution Across Percentiles')
         ax.set_xticks(x)
-        ax.set_xticklabels(percentiles)
+        ax.set_xticklabels(labels)
         ax.legend(loc='upper left', fontsize=8)
         ax.grid(axis='y', alpha=0.3)
     
     @staticmethod
-    def _plot_speedup_comparison(
-        ax: plt.Axes,
-        baseline_metrics: Dict[str, float],
-        quantization_results: Dict[str, Dict[str, Dict[str, float]]]
-    ) -> None:
+    def _plot_speedup_comparison(ax: Axes, data: _ResultArrays) -> None:
         """Plot speedup comparison."""
-        methods = list(quantization_results.keys())
+        methods = data.methods
         x_pos = np.arange(len(methods))
         
-        speedup_no_rescore = []
-        speedup_with_rescore = []
-        
-        for method in methods:
-            results = quantization_results[method]
-            speedup_no = baseline_metrics['avg'] / results['no_rescoring']['avg']
-            speedup_with = baseline_metrics['avg'] / results['with_rescoring']['avg']
-            speedup_no_rescore.append(speedup_no)
-            speedup_with_rescore.append(speedup_with)
+        speedup_no_rescore = data.speedups[:, _NO_RESCORING, _AVG]
+        speedup_with_rescore = data.speedups[:, _WITH_RESCORING, _AVG]
         
         bar_width = 0.35
         ax.barh(x_pos - bar_width/2, speedup_no_rescore, bar_width,
@@ -132,29 +153,22 @@ class BenchmarkVisualizer:
                    va='center', fontsize=9, fontweight='bold')
     
     @staticmethod
-    def _plot_rescoring_impact(
-        ax: plt.Axes,
-        baseline_metrics: Dict[str, float],
-        quantization_results: Dict[str, Dict[str, Dict[str, float]]]
-    ) -> None:
+    def _plot_rescoring_impact(ax: Axes, data: _ResultArrays) -> None:
         """Plot impact of rescoring on latency."""
-        methods = list(quantization_results.keys())
+        methods = data.methods
         x_pos = np.arange(len(methods))
+        baseline_avg = data.baseline[_AVG]
         
-        no_rescore_avg = [
-            quantization_results[m]['no_rescoring']['avg'] for m in methods
-        ]
-        with_rescore_avg = [
-            quantization_results[m]['with_rescoring']['avg'] for m in methods
-        ]
+        no_rescore_avg = data.latencies[:, _NO_RESCORING, _AVG]
+        with_rescore_avg = data.latencies[:, _WITH_RESCORING, _AVG]
         
         bar_width = 0.35
         ax.bar(x_pos - bar_width/2, no_rescore_avg, bar_width,
               label='Without Rescoring', color='#E63946', alpha=0.8)
         ax.bar(x_pos + bar_width/2, with_rescore_avg, bar_width,
               label='With Rescoring', color='#06A77D', alpha=0.8)
-        ax.axhline(y=baseline_metrics['avg'], color='#2E86AB', linestyle='--',
-                  linewidth=2, label=f'Baseline ({baseline_metrics["avg"]:.1f}ms)')
+        ax.axhline(y=baseline_avg, color='#2E86AB', linestyle='--',
+                  linewidth=2, label=f'Baseline ({baseline_avg:.1f}ms)')
         
         ax.set_xticks(x_pos)
         ax.set_xticklabels([m.upper() for m in methods])
@@ -164,26 +178,23 @@ class BenchmarkVisualizer:
         ax.grid(axis='y', alpha=0.3)
     
     @staticmethod
-    def _plot_p95_table(
-        ax: plt.Axes,
-        baseline_metrics: Dict[str, float],
-        quantization_results: Dict[str, Dict[str, Dict[str, float]]]
-    ) -> None:
+    def _plot_p95_table(ax: Axes, data: _ResultArrays) -> None:
         """Create P95 comparison table."""
         ax.axis('off')
+        baseline_p95 = data.baseline[_P95]
         
         # Create table data
         table_data = [['Method', 'Baseline\nP95 (ms)', 'Quantized\nP95 (ms)', 'Speedup']]
-        table_data.append(['Baseline', f"{baseline_metrics['p95']:.1f}", '-', '1.0x'])
+        table_data.append(['Baseline', f"{baseline_p95:.1f}", '-', '1.0x'])
         
-        methods = list(quantization_results.keys())
-        for method in methods:
-            results = quantization_results[method]
-            quant_p95 = results['with_rescoring']['p95']
-            speedup = baseline_metrics['p95'] / quant_p95
+        for method, quant_p95, speedup in zip(
+            data.methods,
+            data.latencies[:, _WITH_RESCORING, _P95],
+            data.speedups[:, _WITH_RESCORING, _P95]
+        ):
             table_data.append([
                 method.upper(),
-                f"{baseline_metrics['p95']:.1f}",
+                f"{baseline_p95:.1f}",
                 f"{quant_p95:.1f}",
                 f"{speedup:.2f}x"
             ])
@@ -219,35 +230,38 @@ class BenchmarkVisualizer:
             baseline_metrics: Baseline performance metrics
             quantization_results: Results from quantization benchmarks
         """
+        data = _to_arrays(baseline_metrics, quantization_results)
+        baseline_metrics = Metrics(*data.baseline)
+        
         print("=" * 60)
         print("QUANTIZATION PERFORMANCE ANALYSIS")
         print("=" * 60)
         
         print(f"\nBaseline Performance:")
-        print(f"  Average: {baseline_metrics['avg']:.2f}ms")
-        print(f"  P50:     {baseline_metrics['p50']:.2f}ms")
-        print(f"  P90:     {baseline_metrics['p90']:.2f}ms")
-        print(f"  P95:     {baseline_metrics['p95']:.2f}ms")
-        print(f"  P99:     {baseline_metrics['p99']:.2f}ms")
-        print(f"  P99.5:   {baseline_metrics['p99.5']:.2f}ms")
+        print(f"  Average: {baseline_metrics.avg:.2f}ms")
+        print(f"  P50:     {baseline_metrics.p50:.2f}ms")
+        print(f"  P90:     {baseline_metrics.p90:.2f}ms")
+        print(f"  P95:     {baseline_metrics.p95:.2f}ms")
+        print(f"  P99:     {baseline_metrics.p99:.2f}ms")
+        print(f"  P99.5:   {baseline_metrics.p995:.2f}ms")
         
         print(f"\nQuantization Results:")
-        for method, results in quantization_results.items():
-            no_rescoring = results['no_rescoring']
-            with_rescoring = results['with_rescoring']
+        for method, latencies, speedups in zip(data.methods, data.latencies, data.speedups):
+            no_rescoring = Metrics(*latencies[_NO_RESCORING])
+            with_rescoring = Metrics(*latencies[_WITH_RESCORING])
             
-            speedup_avg_no = baseline_metrics['avg'] / no_rescoring['avg']
-            speedup_avg_with = baseline_metrics['avg'] / with_rescoring['avg']
-            speedup_p95_no = baseline_metrics['p95'] / no_rescoring['p95']
-            speedup_p95_with = baseline_metrics['p95'] / with_rescoring['p95']
+            speedup_avg_no = speedups[_NO_RESCORING, _AVG]
+            speedup_avg_with = speedups[_WITH_RESCORING, _AVG]
+            speedup_p95_no = speedups[_NO_RESCORING, _P95]
+            speedup_p95_with = speedups[_WITH_RESCORING, _P95]
             
             print(f"\n{method.upper()}:")
             print(f"  Without rescoring:")
-            print(f"    Average: {no_rescoring['avg']:.2f}ms ({speedup_avg_no:.1f}x)")
-            print(f"    P95:     {no_rescoring['p95']:.2f}ms ({speedup_p95_no:.1f}x)")
+            print(f"    Average: {no_rescoring.avg:.2f}ms ({speedup_avg_no:.1f}x)")
+            print(f"    P95:     {no_rescoring.p95:.2f}ms ({speedup_p95_no:.1f}x)")
             print(f"  With rescoring:")
-            print(f"    Average: {with_rescoring['avg']:.2f}ms ({speedup_avg_with:.1f}x)")
-            print(f"    P95:     {with_rescoring['p95']:.2f}ms ({speedup_p95_with:.1f}x)")
+            print(f"    Average: {with_rescoring.avg:.2f}ms ({speedup_avg_with:.1f}x)")
+            print(f"    P95:     {with_rescoring.p95:.2f}ms ({speedup_p95_with:.1f}x)")
     
     @staticmethod
     def print_oversampling_analysis(
@@ -265,11 +279,25 @@ class BenchmarkVisualizer:
         print("OVERSAMPLING FACTOR OPTIMIZATION")
         print("=" * 60)
         
-        for factor in sorted(oversampling_results_latency.keys()):
-            latency = oversampling_results_latency[factor]
-            accuracy = oversampling_results_accuracy[factor]
-            
-            print(f"\n  {factor}x:")
-            print(f"    {latency['avg_latency']:.2f}ms avg latency, "
-                  f"{latency['p95_latency']:.2f}ms P95 latency")
-            print(f"    {accuracy['avg_accuracy']:.2f} avg accuracy retention")
\ No newline at end of file
+        factors = sorted(oversampling_results_latency)
+        if not factors:
+            return
+        # (n_factors, 3): avg latency, P95 latency, avg accuracy
+        values = np.array([
+            (
+                oversampling_results_latency[factor]['avg_latency'],
+                oversampling_results_latency[factor]['p95_latency'],
+                oversampling_results_accuracy[factor]['avg_accuracy']
+            )
+            for factor in factors
+        ], dtype=float)
+        
+        # Render every factor with one template and write the table at once
+        template = (
+            "\n  {}x:\n"
+            "    {:.2f}ms avg latency, {:.2f}ms P95 latency\n"
+            "    {:.2f} avg accuracy retention"
+        )
+        print("\n".join(
+            template.format(factor, *row) for factor, row in zip(factors, values.tolist())
+        ))
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Benchmarks for dataset generation.
+
+Not collected by the regular test run (only test_*.py files are); run with:
+    pytest tests/bench_data_generator.py --benchmark-only -n 0 --no-cov
+"""
+
+import pytest
+
+from qdrant_quantization_benchmark.data_generator import DatasetGenerator
+
+pytest.importorskip("pytest_benchmark")
+
+
+class TestBenchDatasetGenerator:
+    """Benchmarks for DatasetGenerator.generate."""
+
+    @pytest.mark.parametrize(
+        "domain_mix",
+        [{'tech': 1.0}, None],
+        ids=["tech", "even"]
+    )
+    def test_bench_generate(self, benchmark, domain_mix):
+        """Benchmark generating 10k items."""
+        generator = DatasetGenerator(seed=42)
+
+        dataset = benchmark.pedantic(
+            generator.generate,
+            kwargs={"n": 10_000, "domain_mix": domain_mix},
+            rounds=5,
+            iterations=1
+        )
+
+        assert len(dataset) == 10_000
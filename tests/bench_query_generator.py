@@ -0,0 +1,25 @@
+"""
+Benchmarks for query analysis.
+
+Not collected by the regular test run (only test_*.py files are); run with:
+    pytest tests/bench_query_generator.py --benchmark-only -n 0 --no-cov
+"""
+
+import pytest
+
+from qdrant_quantization_benchmark.query_generator import QueryGenerator
+
+pytest.importorskip("pytest_benchmark")
+
+
+class TestBenchQueryGenerator:
+    """Benchmarks for QueryGenerator.get_domain_distribution."""
+
+    def test_bench_domain_distribution(self, benchmark):
+        """Benchmark classifying 10k queries."""
+        generator = QueryGenerator(seed=42)
+        generator.add_manual_queries(generator.generate_auto_queries(n=10_000))
+
+        distribution = benchmark(generator.get_domain_distribution)
+
+        assert sum(distribution.values()) >= 10_000
@@ -0,0 +1,42 @@
+"""
+Benchmarks for result visualization.
+
+Not collected by the regular test run (only test_*.py files are); run with:
+    pytest tests/bench_visualization.py --benchmark-only -n 0 --no-cov
+"""
+
+import pytest
+from matplotlib.figure import Figure
+
+from qdrant_quantization_benchmark.visualization import BenchmarkVisualizer, _to_arrays
+
+pytest.importorskip("pytest_benchmark")
+
+
+class TestBenchVisualizer:
+    """Benchmarks for BenchmarkVisualizer.plot_quantization_results."""
+
+    def test_bench_plot_quantization_results(self, benchmark, mock_benchmark_results, tmp_path):
+        """Benchmark drawing and saving the full 2x2 figure."""
+        baseline, quantization = mock_benchmark_results
+
+        benchmark.pedantic(
+            BenchmarkVisualizer.plot_quantization_results,
+            args=(baseline, quantization, str(tmp_path / "plot.png")),
+            rounds=3,
+            iterations=1
+        )
+
+    def test_bench_draw_subplots(self, benchmark, mock_benchmark_results):
+        """Benchmark data extraction and drawing alone, without savefig."""
+        baseline, quantization = mock_benchmark_results
+
+        def draw():
+            axes = Figure(figsize=(16, 12)).subplots(2, 2)
+            data = _to_arrays(baseline, quantization)
+            BenchmarkVisualizer._plot_percentile_comparison(axes[0, 0], data)
+            BenchmarkVisualizer._plot_speedup_comparison(axes[0, 1], data)
+            BenchmarkVisualizer._plot_rescoring_impact(axes[1, 0], data)
+            BenchmarkVisualizer._plot_p95_table(axes[1, 1], data)
+
+        benchmark(draw)
@@ -2,12 +2,26 @@
 Shared pytest fixtures for qdrant-quantization-benchmark tests.
 """
 
+import os
+import sys
+
+# Use the non-interactive backend before anything imports matplotlib.pyplot
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import logging
+
 import pytest
 import numpy as np
+import structlog
+from argparse import Namespace
+from multiprocessing import shared_memory
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from unittest.mock import Mock, MagicMock
+from typing import List, Optional
+from unittest.mock import Mock, MagicMock, create_autospec
 from qdrant_client import QdrantClient
 from qdrant_client.models import CollectionInfo, Distance, VectorParams
+from structlog.testing import LogCapture
 
 from qdrant_quantization_benchmark.config import (
     BenchmarkSuiteConfig,
@@ -20,13 +34,92 @@ from qdrant_quantization_benchmark.config import (
     LoggingConfig,
 )
 from qdrant_quantization_benchmark.data_generator import DatasetGenerator
+from qdrant_quantization_benchmark.logging import get_logger
 from qdrant_quantization_benchmark.query_generator import QueryGenerator
 
 
+def pytest_addoption(parser):
+    """Register custom command line options."""
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="Run tests marked as slow (large-input variants)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --run-slow is given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@dataclass
+class CliArgs:
+    """
+    CLI arguments with test-friendly defaults for every subcommand.
+    
+    Tests set only the fields they care about:
+        cmd_generate_data(CliArgs(size=10, output=path, tech=1.0).to_namespace())
+    """
+    # Logging options (quiet to reduce output noise)
+    log_level: str = "ERROR"
+    json_logs: bool = False
+    verbose: bool = False
+    quiet: bool = True
+    
+    # generate-data / generate-queries
+    size: int = 10
+    num_queries: int = 5
+    output: Optional[str] = None
+    tech: float = 0.25
+    medical: float = 0.25
+    pharma: float = 0.25
+    insurance: float = 0.25
+    seed: int = 42
+    display: bool = False
+    
+    # upload / create-quantized / benchmark / visualize
+    collection: Optional[str] = None
+    dataset: Optional[str] = None
+    batch_size: int = 50
+    enable_retry: bool = False
+    pool_size: int = 1
+    recreate: bool = False
+    methods: List[str] = field(default_factory=lambda: ['scalar', 'binary', 'binary_2bit'])
+    queries: Optional[str] = None
+    quantization: Optional[List[str]] = None
+    results: Optional[str] = None
+    
+    def to_namespace(self) -> Namespace:
+        """Return the arguments as an argparse Namespace."""
+        return Namespace(**asdict(self))
+
+
+@pytest.fixture(scope="session")
+def _mock_qdrant_client_template():
+    """Autospec QdrantClient once per session; introspection is the costly part."""
+    return create_autospec(QdrantClient, instance=True)
+
+
+@pytest.fixture(scope="session")
+def _mock_sentence_transformer_template():
+    """Autospec SentenceTransformer once per session."""
+    # Imported here so only tests that mock the model need sentence-transformers
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+    return create_autospec(sentence_transformers.SentenceTransformer, instance=True)
+
+
 @pytest.fixture
-def mock_qdrant_client():
+def mock_qdrant_client(_mock_qdrant_client_template):
     """Mock QdrantClient for testing without actual Qdrant connection."""
-    client = Mock(spec=QdrantClient)
+    # Child mocks are shared with the template, so reset rather than copy
+    client = _mock_qdrant_client_template
+    client.reset_mock(return_value=True, side_effect=True)
     
     # Mock collection_exists
     client.collection_exists.return_value = False
@@ -49,22 +142,56 @@ def mock_qdrant_client():
     return client
 
 
+@dataclass(frozen=True)
+class FakeDevice:
+    """Minimal stand-in for torch.device."""
+    type: str = "cpu"
+    
+    def __str__(self):
+        return self.type
+
+
+# Preallocated embeddings; encode() returns views into this block
+_EMBEDDINGS = np.zeros((4096, 384), dtype=np.float32)
+
+
+def _encode_precomputed(sentences, **kwargs):
+    """Stand-in for SentenceTransformer.encode that never allocates."""
+    if isinstance(sentences, str):
+        return _EMBEDDINGS[0]
+    return _EMBEDDINGS[:len(sentences)]
+
+
 @pytest.fixture
-def mock_sentence_transformer(mocker):
+def mock_sentence_transformer(_mock_sentence_transformer_template, monkeypatch):
     """Mock SentenceTransformer to avoid downloading models."""
-    mock_model = Mock()
+    mock_model = _mock_sentence_transformer_template
+    mock_model.reset_mock(return_value=True, side_effect=True)
     
-    # encode() returns a numpy array of shape (384,)
-    mock_model.encode.return_value = np.random.rand(384)
+    # encode() mirrors the real model: (384,) for a string, (n, 384) for a list
+    mock_model.encode.side_effect = _encode_precomputed
+    mock_model.device = FakeDevice()
     
-    mocker.patch(
+    monkeypatch.setattr(
         'qdrant_quantization_benchmark.embeddings.SentenceTransformer',
-        return_value=mock_model
+        lambda *args, **kwargs: mock_model
     )
     
     return mock_model
 
 
+@pytest.fixture
+def log_output():
+    """Capture structlog events as dicts, at every level, for one test."""
+    capture = LogCapture()
+    structlog.configure(
+        processors=[capture],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG)
+    )
+    get_logger.cache_clear()
+    return capture.entries
+
+
 @pytest.fixture
 def embedding_config():
     """Standard embedding configuration."""
@@ -127,6 +254,41 @@ def logging_config():
     )
 
 
+@pytest.fixture(autouse=True)
+def _reset_structlog():
+    """Undo structlog configuration (setup_logging, log_output) after each test.
+    
+    Keeps tests independent of which other tests share their xdist worker.
+    """
+    yield
+    structlog.reset_defaults()
+    get_logger.cache_clear()
+
+
+def _clear_loaded_models() -> None:
+    """Clear the embeddings model cache, if the module has been imported at all."""
+    embeddings = sys.modules.get("qdrant_quantization_benchmark.embeddings")
+    if embeddings is not None:
+        embeddings._load_model.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_model_cache():
+    """Drop cached models so each test sees its own SentenceTransformer patch."""
+    _clear_loaded_models()
+    yield
+    _clear_loaded_models()
+
+
+@pytest.fixture(autouse=True)
+def _qdrant_env(monkeypatch, request):
+    """Provide Qdrant credentials in the environment unless marked no_qdrant_env."""
+    if "no_qdrant_env" in request.keywords:
+        return
+    monkeypatch.setenv("QDRANT_URL", "http://test:6333")
+    monkeypatch.setenv("QDRANT_API_KEY", "test-key")
+
+
 @pytest.fixture
 def qdrant_connection_config(monkeypatch):
     """Mock Qdrant connection configuration with environment variables."""
@@ -143,9 +305,9 @@ def full_config(monkeypatch, logging_config):
     return BenchmarkSuiteConfig.from_env(logging_config)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_dataset():
-    """Generate a small test dataset."""
+    """Generate a small test dataset (seeded, so shared across the session)."""
     generator = DatasetGenerator(seed=42)
     return generator.generate(
         n=20,
@@ -156,9 +318,9 @@ def sample_dataset():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_queries():
-    """Generate sample test queries."""
+    """Generate sample test queries (seeded, so shared across the session)."""
     generator = QueryGenerator(seed=42)
     return generator.generate_auto_queries(
         n=5,
@@ -169,36 +331,48 @@ def sample_queries():
     )
 
 
-@pytest.fixture
-def temp_dataset_file(tmp_path, sample_dataset):
-    """Create a temporary dataset file."""
-    filepath = tmp_path / "test_dataset.json"
+@pytest.fixture(scope="session")
+def temp_dataset_file(tmp_path_factory, sample_dataset):
+    """Create a temporary dataset file (read-only, written once per session)."""
+    filepath = tmp_path_factory.mktemp("dataset") / "test_dataset.json"
     generator = DatasetGenerator()
     generator.save_dataset(sample_dataset, str(filepath))
     return filepath
 
 
-@pytest.fixture
-def temp_queries_file(tmp_path, sample_queries):
-    """Create a temporary queries file."""
-    filepath = tmp_path / "test_queries.json"
+@pytest.fixture(scope="session")
+def temp_queries_file(tmp_path_factory, sample_queries):
+    """Create a temporary queries file (read-only, written once per session)."""
+    filepath = tmp_path_factory.mktemp("queries") / "test_queries.jsonl"
     generator = QueryGenerator()
     generator.add_manual_queries(sample_queries)
     generator.save_queries(str(filepath))
     return filepath
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_embeddings():
-    """Generate sample embeddings matching sample_dataset."""
-    # 20 embeddings of size 384
-    return [np.random.rand(384).tolist() for _ in range(20)]
+    """Generate sample embeddings matching sample_dataset, as encode_dataset returns them."""
+    # 20 float32 embeddings of size 384, shared by the session so read-only
+    embeddings = np.random.default_rng(0).random((20, 384), dtype=np.float32)
+    embeddings.setflags(write=False)
+    return embeddings
+
+
+@pytest.fixture
+def shm_embeddings(sample_embeddings):
+    """sample_embeddings copied into a SharedMemory block: (name, shape, dtype)."""
+    shm = shared_memory.SharedMemory(create=True, size=sample_embeddings.nbytes)
+    np.ndarray(sample_embeddings.shape, np.float32, shm.buf)[:] = sample_embeddings
+    yield shm.name, sample_embeddings.shape, "float32"
+    shm.close()
+    shm.unlink()
 
 
 @pytest.fixture
-def mock_benchmark_results():
-    """Mock benchmark results for testing visualization."""
-    baseline = {
+def _baseline_results():
+    """Mock baseline metrics for testing visualization."""
+    return {
         "avg": 45.23,
         "p50": 42.15,
         "p90": 52.18,
@@ -207,8 +381,12 @@ def mock_benchmark_results():
         "p99.5": 59.45,
         "p99.9": 59.87
     }
-    
-    quantization = {
+
+
+@pytest.fixture
+def _quantization_results():
+    """Mock quantization metrics for testing visualization."""
+    return {
         "scalar": {
             "no_rescoring": {
                 "avg": 22.15,
@@ -250,5 +428,12 @@ def mock_benchmark_results():
             }
         }
     }
-    
-    return baseline, quantization
\ No newline at end of file
+
+
+@pytest.fixture
+def mock_benchmark_results(request):
+    """Mock benchmark results for testing visualization (baseline, quantization)."""
+    return (
+        request.getfixturevalue("_baseline_results"),
+        request.getfixturevalue("_quantization_results")
+    )
@@ -7,7 +7,7 @@ import time
 from unittest.mock import Mock
 import numpy as np
 
-from qdrant_quantization_benchmark.benchmarking import PerformanceBenchmark
+from qdrant_quantization_benchmark.benchmarking import PerformanceBenchmark, Metrics
 from qdrant_quantization_benchmark.config import BenchmarkConfig
 
 
@@ -76,13 +76,8 @@ class TestPerformanceBenchmark:
         )
         
         # Check all expected metrics are present
-        assert "avg" in metrics
-        assert "p50" in metrics
-        assert "p90" in metrics
-        assert "p95" in metrics
-        assert "p99" in metrics
-        assert "p99.5" in metrics
-        assert "p99.9" in metrics
+        assert isinstance(metrics, Metrics)
+        assert set(metrics.as_dict()) == {"avg", "p50", "p90", "p95", "p99", "p99.5", "p99.9"}
         
         # Should be called for warmup + 3 queries
         assert mock_qdrant_client.query_points.call_count == 4
@@ -97,10 +92,10 @@ class TestPerformanceBenchmark:
         latencies = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
         metrics = benchmark._calculate_metrics(latencies)
         
-        assert metrics["avg"] == 55.0
-        assert metrics["p50"] == 55.0  # Median of 10 values
-        assert metrics["p90"] == 91.0
-        assert metrics["p99"] == 99.1
+        assert metrics.avg == 55.0
+        assert metrics.p50 == 55.0  # Median of 10 values
+        assert metrics.p90 == 91.0
+        assert metrics.p99 == 99.1
     
     def test_benchmark_quantization(self, mock_qdrant_client, mock_sentence_transformer):
         """Test benchmarking quantized collections."""
@@ -125,8 +120,8 @@ class TestPerformanceBenchmark:
         assert "with_rescoring" in results
         
         # Each should have metrics
-        assert "avg" in results["no_rescoring"]
-        assert "avg" in results["with_rescoring"]
+        assert isinstance(results["no_rescoring"], Metrics)
+        assert isinstance(results["with_rescoring"], Metrics)
     
     def test_tune_oversampling(self, mock_qdrant_client, mock_sentence_transformer):
         """Test oversampling factor tuning."""
@@ -212,10 +207,10 @@ class TestPerformanceBenchmark:
         )
         
         # Latencies should be positive and in milliseconds (reasonable range)
-        assert metrics["avg"] > 0
-        assert metrics["avg"] < 10000  # Less than 10 seconds
-        assert metrics["p50"] > 0
-        assert metrics["p99"] >= metrics["p50"]  # P99 should be >= P50
+        assert metrics.avg > 0
+        assert metrics.avg < 10000  # Less than 10 seconds
+        assert metrics.p50 > 0
+        assert metrics.p99 >= metrics.p50  # P99 should be >= P50
     
     def test_custom_test_queries(self, mock_qdrant_client, mock_sentence_transformer):
         """Test using custom test queries."""
@@ -272,15 +267,15 @@ class TestPerformanceBenchmark:
         embedding_service = EmbeddingService()
         benchmark = PerformanceBenchmark(mock_qdrant_client, embedding_service)
         
-        metrics = {
-            "avg": 45.23,
-            "p50": 42.15,
-            "p90": 52.18,
-            "p95": 55.67,
-            "p99": 58.92,
-            "p99.5": 59.45,
-            "p99.9": 59.87
-        }
+        metrics = Metrics(
+            avg=45.23,
+            p50=42.15,
+            p90=52.18,
+            p95=55.67,
+            p99=58.92,
+            p995=59.45,
+            p999=59.87
+        )
         
         benchmark._print_metrics("Test Label", metrics)
         
@@ -288,4 +283,26 @@ class TestPerformanceBenchmark:
         assert "Test Label:" in captured.out
         assert "P50:" in captured.out
         assert "42.15ms" in captured.out
-        assert "P99.9:" in captured.out
\ No newline at end of file
+        assert "P99.9:" in captured.out
+
+
+class TestMetrics:
+    """Tests for the Metrics record."""
+    
+    def test_dict_round_trip(self, _baseline_results):
+        """Test that as_dict/from_dict preserve the results-file keys."""
+        baseline = _baseline_results
+        
+        metrics = Metrics.from_dict(baseline)
+        
+        assert metrics.p995 == baseline["p99.5"]
+        assert metrics.p999 == baseline["p99.9"]
+        assert metrics.as_dict() == baseline
+    
+    def test_from_dict_without_p999(self):
+        """Test that older results without p99.9 still load."""
+        metrics = Metrics.from_dict(
+            {"avg": 1.0, "p50": 1.0, "p90": 1.0, "p95": 1.0, "p99": 1.0, "p99.5": 1.0}
+        )
+        
+        assert np.isnan(metrics.p999)
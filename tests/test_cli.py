@@ -3,9 +3,11 @@ Tests for CLI functionality.
 """
 
 import pytest
-from argparse import Namespace
 from unittest.mock import Mock, patch, MagicMock
 import json
+from matplotlib.figure import Figure
+
+from .conftest import CliArgs
 
 from qdrant_quantization_benchmark.cli import (
     cmd_generate_data,
@@ -18,185 +20,131 @@ from qdrant_quantization_benchmark.cli import (
 )
 
 
+DOMAIN_ARGS = {
+    'tech': 'tech',
+    'medical': 'medical',
+    'pharmaceutical': 'pharma',
+    'health_insurance': 'insurance'
+}
+
+
+def _domain_mix_args(domain_mix):
+    """Map a domain mix to the CLI's --tech/--medical/--pharma/--insurance values."""
+    return {arg: domain_mix.get(domain, 0.0) for domain, arg in DOMAIN_ARGS.items()}
+
+
+DOMAIN_MIX_CASES = [
+    ({'tech': 1.0}, {'tech'}),
+    ({'tech': 0.5, 'medical': 0.5}, {'tech', 'medical'}),
+    ({'pharmaceutical': 0.5, 'health_insurance': 0.5}, {'pharmaceutical', 'health_insurance'}),
+]
+
+
 class TestCmdGenerateData:
     """Tests for cmd_generate_data command."""
     
-    def test_generate_data_basic(self, tmp_path):
-        """Test basic dataset generation command."""
-        args = Namespace(
-            size=10,
+    @pytest.mark.parametrize("domain_mix,expected_domains", DOMAIN_MIX_CASES)
+    def test_generate_data(self, tmp_path, domain_mix, expected_domains):
+        """Test dataset generation across domain mixes."""
+        args = CliArgs(
+            size=20,
             output=str(tmp_path / "test.json"),
-            tech=1.0,
-            medical=0.0,
-            pharma=0.0,
-            insurance=0.0,
-            seed=42,
-            log_level="INFO",
-            json_logs=False,
-            verbose=False,
-            quiet=True  # Quiet to reduce output noise
-        )
+            **_domain_mix_args(domain_mix)
+        ).to_namespace()
         
         # Should not raise error
-        cmd_generate_data(args)
+        data = cmd_generate_data(args)
         
         # Check file was created
         assert (tmp_path / "test.json").exists()
         
-        # Verify content
-        with open(tmp_path / "test.json", 'r') as f:
-            data = json.load(f)
-        
-        assert len(data) == 10
-    
-    def test_generate_data_domain_mix(self, tmp_path):
-        """Test dataset generation with domain mix."""
-        args = Namespace(
-            size=20,
-            output=str(tmp_path / "mixed.json"),
-            tech=0.5,
-            medical=0.5,
-            pharma=0.0,
-            insurance=0.0,
-            seed=42,
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
-        
-        cmd_generate_data(args)
-        
-        with open(tmp_path / "mixed.json", 'r') as f:
-            data = json.load(f)
-        
-        # Check domains
-        domains = [item['domain'] for item in data]
-        assert 'tech' in domains
-        assert 'medical' in domains
+        # Verify content (disk round-trip is covered by test_save_dataset)
+        assert len(data) == 20
+        assert {item['domain'] for item in data} == expected_domains
 
 
 class TestCmdGenerateQueries:
     """Tests for cmd_generate_queries command."""
     
-    def test_generate_queries_basic(self, tmp_path):
-        """Test basic query generation command."""
-        args = Namespace(
-            num_queries=5,
-            output=str(tmp_path / "queries.json"),
-            tech=1.0,
-            medical=0.0,
-            pharma=0.0,
-            insurance=0.0,
-            seed=42,
-            display=False,
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
-        
-        cmd_generate_queries(args)
-        
-        assert (tmp_path / "queries.json").exists()
-        
-        with open(tmp_path / "queries.json", 'r') as f:
-            data = json.load(f)
-        
-        assert 'queries' in data
-        assert len(data['queries']) == 5
+    @pytest.mark.parametrize("domain_mix", [mix for mix, _ in DOMAIN_MIX_CASES])
+    def test_generate_queries(self, tmp_path, domain_mix):
+        """Test query generation across domain mixes."""
+        args = CliArgs(
+            num_queries=6,
+            output=str(tmp_path / "queries.jsonl"),
+            **_domain_mix_args(domain_mix)
+        ).to_namespace()
+        
+        queries = cmd_generate_queries(args)
+        
+        assert (tmp_path / "queries.jsonl").exists()
+        assert len(queries) == 6
 
 
-class TestCmdUpload:
+class QdrantClientPatched:
+    """Base class that patches the CLI's QdrantClient for every test."""
+    
+    @pytest.fixture(autouse=True)
+    def _patch_qdrant(self, mock_qdrant_client):
+        with patch('qdrant_quantization_benchmark.cli.QdrantClient') as mock_client_class:
+            self.mock_client_class = mock_client_class
+            self.mock_client = mock_qdrant_client
+            mock_client_class.return_value = self.mock_client
+            yield
+
+
+class TestCmdUpload(QdrantClientPatched):
     """Tests for cmd_upload command."""
     
-    @patch('qdrant_quantization_benchmark.cli.QdrantClient')
-    def test_upload_command(self, mock_client_class, temp_dataset_file, monkeypatch, mock_sentence_transformer):
+    def test_upload_command(self, temp_dataset_file, mock_sentence_transformer):
         """Test upload command."""
-        # Setup environment
-        monkeypatch.setenv("QDRANT_URL", "http://test:6333")
-        monkeypatch.setenv("QDRANT_API_KEY", "test-key")
+        self.mock_client.collection_exists.return_value = False
         
-        # Mock client
-        mock_client = Mock()
-        mock_client.collection_exists.return_value = False
-        mock_client_class.return_value = mock_client
-        
-        args = Namespace(
+        args = CliArgs(
             collection="test_collection",
             dataset=str(temp_dataset_file),
             batch_size=10,
-            enable_retry=False,
-            recreate=True,
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
+            recreate=True
+        ).to_namespace()
         
         # Should not raise error
         cmd_upload(args)
         
         # Verify client was called
-        mock_client.create_collection.assert_called()
-        mock_client.upsert.assert_called()
+        self.mock_client.create_collection.assert_called()
+        self.mock_client.upsert.assert_called()
 
 
-class TestCmdCreateQuantized:
+class TestCmdCreateQuantized(QdrantClientPatched):
     """Tests for cmd_create_quantized command."""
     
-    @patch('qdrant_quantization_benchmark.cli.QdrantClient')
-    def test_create_quantized_command(self, mock_client_class, temp_dataset_file, monkeypatch, mock_sentence_transformer):
+    def test_create_quantized_command(self, temp_dataset_file, mock_sentence_transformer):
         """Test creating quantized collections."""
-        monkeypatch.setenv("QDRANT_URL", "http://test:6333")
-        monkeypatch.setenv("QDRANT_API_KEY", "test-key")
-        
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        
-        args = Namespace(
-            dataset=str(temp_dataset_file),
-            methods=['scalar'],
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
+        args = CliArgs(dataset=str(temp_dataset_file), methods=['scalar']).to_namespace()
         
         cmd_create_quantized(args)
         
         # Should create collection
-        mock_client.create_collection.assert_called()
+        self.mock_client.create_collection.assert_called()
 
 
-class TestCmdBenchmark:
+class TestCmdBenchmark(QdrantClientPatched):
     """Tests for cmd_benchmark command."""
     
-    @patch('qdrant_quantization_benchmark.cli.QdrantClient')
-    def test_benchmark_command(self, mock_client_class, temp_queries_file, tmp_path, monkeypatch, mock_sentence_transformer):
+    def test_benchmark_command(self, temp_queries_file, tmp_path, mock_sentence_transformer):
         """Test benchmark command."""
-        monkeypatch.setenv("QDRANT_URL", "http://test:6333")
-        monkeypatch.setenv("QDRANT_API_KEY", "test-key")
-        
         # Setup mock client
-        mock_client = Mock()
         mock_response = Mock()
         mock_response.points = []
-        mock_client.query_points.return_value = mock_response
-        mock_client_class.return_value = mock_client
+        self.mock_client.query_points.return_value = mock_response
         
         output_file = tmp_path / "results.json"
         
-        args = Namespace(
+        args = CliArgs(
             collection="test_collection",
             queries=str(temp_queries_file),
-            quantization=None,
-            output=str(output_file),
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
+            output=str(output_file)
+        ).to_namespace()
         
         cmd_benchmark(args)
         
@@ -212,7 +160,7 @@ class TestCmdBenchmark:
 class TestCmdVisualize:
     """Tests for cmd_visualize command."""
     
-    def test_visualize_command(self, tmp_path, mock_benchmark_results, mocker):
+    def test_visualize_command(self, tmp_path, mock_benchmark_results):
         """Test visualize command."""
         baseline, quantization = mock_benchmark_results
         
@@ -226,44 +174,30 @@ class TestCmdVisualize:
         
         output_file = tmp_path / "plot.png"
         
-        # Mock savefig
-        mock_savefig = mocker.patch('matplotlib.pyplot.savefig')
-        
-        args = Namespace(
-            results=str(results_file),
-            output=str(output_file),
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
+        args = CliArgs(results=str(results_file), output=str(output_file)).to_namespace()
         
-        cmd_visualize(args)
+        with patch.object(Figure, "savefig") as mock_savefig:
+            cmd_visualize(args)
         
         # Should call savefig
         mock_savefig.assert_called_once()
     
-    def test_visualize_missing_data(self, tmp_path, capsys):
+    def test_visualize_missing_data(self, tmp_path):
         """Test visualize with incomplete results."""
         # Create results file with missing data
         results_file = tmp_path / "incomplete.json"
         with open(results_file, 'w') as f:
             json.dump({"baseline": {}}, f)  # Missing quantization
         
-        args = Namespace(
-            results=str(results_file),
-            output=str(tmp_path / "plot.png"),
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
+        args = CliArgs(results=str(results_file), output=str(tmp_path / "plot.png")).to_namespace()
         
-        cmd_visualize(args)
+        with patch('qdrant_quantization_benchmark.cli.setup_logging') as mock_setup_logging:
+            cmd_visualize(args)
+        log = mock_setup_logging.return_value
         
-        captured = capsys.readouterr()
-        # Should report error
-        assert "invalid_results_file" in captured.out or "error" in captured.out.lower()
+        # Should report error as a structured event
+        log.error.assert_called_once()
+        assert log.error.call_args.args[0] == "invalid_results_file"
 
 
 class TestAddLoggingArguments:
@@ -301,28 +235,23 @@ class TestAddLoggingArguments:
 class TestCLIIntegration:
     """Integration tests for CLI commands."""
     
-    def test_full_workflow(self, tmp_path, monkeypatch, mock_sentence_transformer):
+    def test_full_workflow(self, tmp_path, mock_sentence_transformer):
         """Test complete workflow from generation to visualization."""
-        monkeypatch.setenv("QDRANT_URL", "http://test:6333")
-        monkeypatch.setenv("QDRANT_API_KEY", "test-key")
-        
         # 1. Generate dataset
         dataset_file = tmp_path / "dataset.json"
-        data_args = Namespace(
+        data_args = CliArgs(
             size=10, output=str(dataset_file),
-            tech=1.0, medical=0.0, pharma=0.0, insurance=0.0,
-            seed=42, log_level="ERROR", json_logs=False, verbose=False, quiet=True
-        )
+            tech=1.0, medical=0.0, pharma=0.0, insurance=0.0
+        ).to_namespace()
         cmd_generate_data(data_args)
         assert dataset_file.exists()
         
         # 2. Generate queries
-        queries_file = tmp_path / "queries.json"
-        queries_args = Namespace(
+        queries_file = tmp_path / "queries.jsonl"
+        queries_args = CliArgs(
             num_queries=5, output=str(queries_file),
-            tech=1.0, medical=0.0, pharma=0.0, insurance=0.0,
-            seed=42, display=False, log_level="ERROR", json_logs=False, verbose=False, quiet=True
-        )
+            tech=1.0, medical=0.0, pharma=0.0, insurance=0.0
+        ).to_namespace()
         cmd_generate_queries(queries_args)
         assert queries_file.exists()
         
@@ -332,23 +261,14 @@ class TestCLIIntegration:
 class TestCLIErrorHandling:
     """Tests for CLI error handling."""
     
+    @pytest.mark.no_qdrant_env
     def test_upload_missing_env_vars(self, temp_dataset_file, monkeypatch):
         """Test upload fails gracefully without environment variables."""
         # Remove environment variables
         monkeypatch.delenv("QDRANT_URL", raising=False)
         monkeypatch.delenv("QDRANT_API_KEY", raising=False)
         
-        args = Namespace(
-            collection="test",
-            dataset=str(temp_dataset_file),
-            batch_size=50,
-            enable_retry=False,
-            recreate=False,
-            log_level="ERROR",
-            json_logs=False,
-            verbose=False,
-            quiet=True
-        )
+        args = CliArgs(collection="test", dataset=str(temp_dataset_file)).to_namespace()
         
         # Should raise ValueError about missing config
         with pytest.raises(ValueError):
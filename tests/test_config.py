@@ -51,6 +51,10 @@ class TestEmbeddingConfig:
         config = EmbeddingConfig()
         assert config.model_name == "all-MiniLM-L6-v2"
         assert config.vector_size == 384
+        assert config.device is None
+        assert config.fp16 is False
+        assert config.output_dim is None
+        assert config.effective_vector_size == 384
     
     def test_custom_model(self):
         """Test custom model configuration."""
@@ -60,6 +64,15 @@ class TestEmbeddingConfig:
         )
         assert config.model_name == "custom-model"
         assert config.vector_size == 768
+    
+    def test_output_dim(self):
+        """Test truncated output size and its validation."""
+        assert EmbeddingConfig(output_dim=128).effective_vector_size == 128
+        
+        with pytest.raises(ValueError, match="output_dim"):
+            EmbeddingConfig(output_dim=512)
+        with pytest.raises(ValueError, match="output_dim"):
+            EmbeddingConfig(output_dim=0)
 
 
 class TestCollectionConfig:
@@ -94,6 +107,8 @@ class TestUploadConfig:
         assert config.enable_retry is False  # Default is False in actual config
         assert config.max_retries == 3
         assert config.initial_backoff == 2.0
+        assert config.jitter is False
+        assert config.breaker_threshold == 0
     
     def test_custom_retry_settings(self):
         """Test custom retry configuration."""
@@ -117,7 +132,7 @@ class TestBenchmarkConfig:
         config = BenchmarkConfig()
         assert config.warmup_enabled is True
         assert config.limit == 10
-        assert config.oversampling_factors == [2.0, 3.0, 5.0, 8.0, 10.0]
+        assert config.oversampling_factors == (2.0, 3.0, 5.0, 8.0, 10.0)
         assert len(config.test_queries) == 5
     
     def test_custom_configuration(self):
@@ -3,10 +3,13 @@ Tests for dataset generation functionality.
 """
 
 import pytest
+import io
 import json
+import numpy as np
 from pathlib import Path
 
-from qdrant_quantization_benchmark.data_generator import DatasetGenerator
+from qdrant_quantization_benchmark import json_io
+from qdrant_quantization_benchmark.data_generator import DOMAINS, Dataset, DatasetGenerator
 
 
 class TestDatasetGenerator:
@@ -16,6 +19,7 @@ class TestDatasetGenerator:
         """Test basic initialization."""
         generator = DatasetGenerator(seed=42)
         assert generator is not None
+        assert tuple(generator.domains) == DOMAINS
     
     def test_initialization_with_seed(self):
         """Test that same seed produces reproducible core structure."""
@@ -25,17 +29,16 @@ class TestDatasetGenerator:
         dataset1 = gen1.generate(n=10, domain_mix={'tech': 1.0})
         dataset2 = gen2.generate(n=10, domain_mix={'tech': 1.0})
 
-        # With same seed, deterministic parts should match
-        for item1, item2 in zip(dataset1, dataset2):
-            # Domain should be same
-            assert item1['domain'] == item2['domain']
-        
-            # Metadata language and topic should be deterministic (based on index)
-            assert item1['metadata']['language'] == item2['metadata']['language']
-            assert item1['metadata']['topic'] == item2['metadata']['topic']
-        
-            # Title is built from language, topic, edition - should be same
-            assert item1['title'] == item2['title']
+        # With same seed, deterministic parts should match: domain, metadata
+        # language/topic (based on index) and title (built from those)
+        def columns(dataset):
+            return np.array([
+                (item['domain'], item['metadata']['language'],
+                 item['metadata']['topic'], item['title'])
+                for item in dataset
+            ])
+        
+        assert np.array_equal(columns(dataset1), columns(dataset2))
     
     def test_different_seeds_produce_different_data(self):
         """Test that different seeds produce different datasets."""
@@ -55,11 +58,12 @@ class TestDatasetGenerator:
         # Should have at least SOME differences (not all the same)
         assert different_count > 0, f"Expected some differences, but all {len(dataset1)} items were identical"
     
-    def test_generate_default_size(self):
-        """Test generating with default parameters."""
+    @pytest.mark.parametrize("n", [20, pytest.param(1000, marks=pytest.mark.slow)])
+    def test_generate_size(self, n):
+        """Test generating the requested number of items."""
         generator = DatasetGenerator()
-        dataset = generator.generate(n=100)
-        assert len(dataset) == 100
+        dataset = generator.generate(n=n)
+        assert len(dataset) == n
     
     def test_domain_distribution(self):
         """Test that domain mix is respected."""
@@ -67,26 +71,31 @@ class TestDatasetGenerator:
         
         # Generate with 50% tech, 50% medical
         dataset = generator.generate(
-            n=100,
+            n=40,
             domain_mix={'tech': 0.5, 'medical': 0.5}
         )
         
-        tech_count = sum(1 for item in dataset if item['domain'] == 'tech')
-        medical_count = sum(1 for item in dataset if item['domain'] == 'medical')
+        tech_count = np.count_nonzero(dataset.domains == 'tech')
+        medical_count = np.count_nonzero(dataset.domains == 'medical')
         
         # Should be roughly 50/50 (allow ±2 for rounding)
-        assert 48 <= tech_count <= 52
-        assert 48 <= medical_count <= 52
+        assert 18 <= tech_count <= 22
+        assert 18 <= medical_count <= 22
     
-    def test_all_domains_generated(self):
+    @pytest.mark.parametrize("domain", DOMAINS)
+    def test_all_domains_generated(self, domain):
         """Test that all domains can be generated."""
         generator = DatasetGenerator(seed=42)
         
-        domains = ['tech', 'medical', 'pharmaceutical', 'health_insurance']
+        dataset = generator.generate(n=5, domain_mix={domain: 1.0})
+        assert all(item['domain'] == domain for item in dataset)
+    
+    def test_zero_weight_domain_mix_raises(self):
+        """Test that weights summing to zero are rejected instead of yielding NaN counts."""
+        generator = DatasetGenerator(seed=42)
         
-        for domain in domains:
-            dataset = generator.generate(n=5, domain_mix={domain: 1.0})
-            assert all(item['domain'] == domain for item in dataset)
+        with pytest.raises(ValueError, match="domain_mix"):
+            generator.generate(n=5, domain_mix={'tech': 0.0, 'medical': 0.0})
     
     def test_generated_items_have_required_fields(self):
         """Test that generated items have all required fields."""
@@ -99,13 +108,26 @@ class TestDatasetGenerator:
             for field in required_fields:
                 assert field in item
     
-    def test_unique_ids(self):
+    @pytest.mark.parametrize("n", [20, pytest.param(1000, marks=pytest.mark.slow)])
+    def test_unique_ids(self, n):
         """Test that all items have unique IDs."""
         generator = DatasetGenerator()
-        dataset = generator.generate(n=100)
+        dataset = generator.generate(n=n)
         
-        ids = [item['id'] for item in dataset]
-        assert len(ids) == len(set(ids)), "IDs should be unique"
+        assert len(np.unique(dataset.ids)) == len(dataset.ids), "IDs should be unique"
+    
+    def test_dataset_views(self):
+        """Test that a Dataset indexes, slices and iterates as item dicts."""
+        generator = DatasetGenerator(seed=42)
+        dataset = generator.generate(n=10)
+        records = dataset.to_records()
+        
+        assert isinstance(dataset, Dataset)
+        assert dataset[3] == records[3]
+        assert isinstance(dataset[2:5], Dataset)
+        assert dataset[2:5] == records[2:5]
+        assert Dataset.from_records(records) == dataset
+        assert type(records[0]['id']) is int
     
     def test_save_dataset(self, tmp_path):
         """Test saving dataset to file."""
@@ -124,25 +146,51 @@ class TestDatasetGenerator:
         assert len(loaded_data) == 10
         assert loaded_data == dataset
     
-    def test_load_dataset(self, tmp_path):
-        """Test loading dataset from file."""
-        # Create test dataset
+    def test_save_dataset_serializes_numpy(self, tmp_path):
+        """Test that NumPy values in items are written as plain JSON."""
         generator = DatasetGenerator()
-        original_dataset = generator.generate(n=10)
+        filepath = tmp_path / "numpy_dataset.json"
+        generator.save_dataset([{"id": np.int64(1), "vector": np.zeros(2)}], str(filepath))
         
-        # Save it
-        filepath = tmp_path / "test_dataset.json"
-        generator.save_dataset(original_dataset, str(filepath))
+        assert DatasetGenerator.load_dataset(str(filepath)) == [{"id": 1, "vector": [0.0, 0.0]}]
+    
+    def test_load_dataset(self):
+        """Test loading dataset from an in-memory file object."""
+        generator = DatasetGenerator()
+        original_dataset = generator.generate(n=10)
         
-        # Load it back
-        loaded_dataset = DatasetGenerator.load_dataset(str(filepath))
+        buf = io.BytesIO(json_io.dumps(original_dataset.to_records()))
+        loaded_dataset = DatasetGenerator.load_dataset(buf)
         
         assert loaded_dataset == original_dataset
     
-    def test_even_distribution_with_none(self):
+    def test_save_and_load_dataset_seq(self, tmp_path):
+        """Test newline-delimited dataset round trip."""
+        generator = DatasetGenerator()
+        dataset = generator.generate(n=10)
+        
+        filepath = tmp_path / "test_dataset.jsonl"
+        generator.save_dataset_seq(iter(dataset), str(filepath))
+        
+        assert len(filepath.read_text().splitlines()) == 10
+        assert list(DatasetGenerator.load_dataset_seq(str(filepath))) == dataset
+    
+    def test_load_dataset_seq_is_lazy(self, tmp_path):
+        """Test that items can be counted without materializing the dataset."""
+        generator = DatasetGenerator()
+        filepath = tmp_path / "test_dataset.jsonl"
+        generator.save_dataset_seq(generator.generate(n=12), str(filepath))
+        
+        items = DatasetGenerator.load_dataset_seq(str(filepath))
+        
+        assert not isinstance(items, list)
+        assert sum(1 for _ in items) == 12
+    
+    @pytest.mark.parametrize("n", [40, pytest.param(1000, marks=pytest.mark.slow)])
+    def test_even_distribution_with_none(self, n):
         """Test even distribution when domain_mix is None."""
         generator = DatasetGenerator(seed=42)
-        dataset = generator.generate(n=100, domain_mix=None)
+        dataset = generator.generate(n=n, domain_mix=None)
         
         # Count domains
         domain_counts = {}
@@ -152,6 +200,6 @@ class TestDatasetGenerator:
         
         # Should have 4 domains with roughly equal distribution
         assert len(domain_counts) == 4
-        # Each should be around 25 (±3 for rounding)
+        # Each should be around n/4 (±3 for rounding)
         for count in domain_counts.values():
-            assert 22 <= count <= 28
\ No newline at end of file
+            assert n // 4 - 3 <= count <= n // 4 + 3
\ No newline at end of file
@@ -4,28 +4,71 @@ Tests for embedding generation service.
 
 import pytest
 import numpy as np
-from unittest.mock import Mock
+from unittest.mock import Mock, create_autospec, patch
+from sentence_transformers import SentenceTransformer
 
-from qdrant_quantization_benchmark.embeddings import EmbeddingService
+from qdrant_quantization_benchmark.embeddings import (
+    EmbeddingCache,
+    EmbeddingService,
+    OnnxEmbeddingBackend,
+)
 from qdrant_quantization_benchmark.config import EmbeddingConfig
+from qdrant_quantization_benchmark.data_generator import DatasetGenerator
+
+from .conftest import FakeDevice
+
+
+# Shared read-only embedding; a write through a returned view raises
+_SAMPLE_EMB = np.full(384, 0.1, dtype=np.float32)
+_SAMPLE_EMB.flags.writeable = False
+
+
+def _fake_encode(sentences, **kwargs):
+    """Mimic SentenceTransformer.encode output shapes without allocating."""
+    if isinstance(sentences, str):
+        return _SAMPLE_EMB
+    return np.broadcast_to(_SAMPLE_EMB, (len(sentences), 384))
+
+
+def _mock_model(device: str = "cpu"):
+    """Autospec'd SentenceTransformer on the given device, with shape-correct encode()."""
+    mock_model = create_autospec(SentenceTransformer, instance=True)
+    mock_model.encode.side_effect = _fake_encode
+    mock_model.device = FakeDevice(device)
+    return mock_model
+
+
+@pytest.fixture(scope="module")
+def _shared_embedding_service():
+    """EmbeddingService with mocked SentenceTransformer, built once per module."""
+    with patch(
+        'qdrant_quantization_benchmark.embeddings.SentenceTransformer',
+        return_value=_mock_model()
+    ):
+        return EmbeddingService(EmbeddingConfig(model_name="test-model"))
 
 
 @pytest.fixture
-def mock_embedding_service(mocker):
-    """Create EmbeddingService with mocked SentenceTransformer."""
-    # Mock the SentenceTransformer class
-    mock_model = mocker.Mock()
-    mock_model.encode.return_value = np.array([0.1] * 384)
-    
-    mocker.patch(
+def mock_embedding_service(_shared_embedding_service):
+    """Shared EmbeddingService with the model's call history cleared."""
+    # reset_mock keeps encode's side_effect
+    _shared_embedding_service.model.reset_mock()
+    return _shared_embedding_service
+
+
+@pytest.fixture
+def cached_embedding_service(tmp_path):
+    """Create EmbeddingService with mocked model and an on-disk cache."""
+    with patch(
         'qdrant_quantization_benchmark.embeddings.SentenceTransformer',
-        return_value=mock_model
-    )
-    
-    config = EmbeddingConfig(model_name="test-model")
-    service = EmbeddingService(config)
-    
-    return service
+        return_value=_mock_model()
+    ):
+        config = EmbeddingConfig(model_name="test-model", cache_path=str(tmp_path / "cache.db"))
+        service = EmbeddingService(config)
+        
+        yield service
+        
+        service.cache.close()
 
 
 @pytest.fixture
@@ -56,6 +99,48 @@ class TestEmbeddingService:
         config = EmbeddingConfig()
         service = EmbeddingService(config)
         assert service.config == config
+        assert service.device
+    
+    @pytest.mark.parametrize("device,halved", [("cuda", True), ("cpu", False)])
+    def test_fp16_only_on_cuda(self, device, halved):
+        """Test that fp16 halves the model on CUDA and is ignored on CPU."""
+        mock_model = _mock_model(device)
+        
+        with patch(
+            'qdrant_quantization_benchmark.embeddings.SentenceTransformer',
+            return_value=mock_model
+        ) as mock_class:
+            EmbeddingService(EmbeddingConfig(model_name="test-model", device=device, fp16=True))
+        
+        mock_class.assert_called_once_with("test-model", device=device)
+        assert mock_model.half.called is halved
+    
+    def test_model_reused_across_services(self):
+        """Test that services with the same model settings share one loaded model."""
+        with patch(
+            'qdrant_quantization_benchmark.embeddings.SentenceTransformer',
+            side_effect=lambda *args, **kwargs: _mock_model()
+        ) as mock_class:
+            first = EmbeddingService(EmbeddingConfig(model_name="test-model"))
+            second = EmbeddingService(EmbeddingConfig(model_name="test-model", output_dim=128))
+            other_device = EmbeddingService(EmbeddingConfig(model_name="test-model", device="cpu"))
+        
+        assert first.model is second.model
+        assert other_device.model is not first.model
+        assert mock_class.call_count == 2
+    
+    def test_onnx_backend(self):
+        """Test that the onnx backend loads the quantized export instead of SentenceTransformer."""
+        config = EmbeddingConfig(model_name="test-model", backend="onnx", onnx_dir="/tmp/onnx")
+        
+        with patch.object(OnnxEmbeddingBackend, "from_pretrained") as mock_load, \
+                patch('qdrant_quantization_benchmark.embeddings.SentenceTransformer') as mock_st:
+            service = EmbeddingService(config)
+        
+        mock_load.assert_called_once_with("test-model", "/tmp/onnx")
+        mock_st.assert_not_called()
+        assert service.model is mock_load.return_value
+        assert service.device == "cpu"
     
     def test_encode_text(self, mock_embedding_service):
         """Test single text encoding."""
@@ -68,8 +153,11 @@ class TestEmbeddingService:
         """Test batch encoding."""
         embeddings = mock_embedding_service.encode_batch(sample_texts)
         
-        assert len(embeddings) == len(sample_texts)
-        assert all(len(emb) == 384 for emb in embeddings)
+        assert embeddings.shape == (len(sample_texts), 384)
+        assert embeddings.dtype == np.float32
+        assert embeddings.flags.c_contiguous
+        # All texts go to the model in one call
+        mock_embedding_service.model.encode.assert_called_once()
     
     def test_encode_batch_without_progress(self, mock_embedding_service, sample_texts):
         """Test batch encoding without progress display."""
@@ -78,18 +166,229 @@ class TestEmbeddingService:
             show_progress=False
         )
         
-        assert len(embeddings) == len(sample_texts)
-        assert all(len(emb) == 384 for emb in embeddings)
+        assert embeddings.shape == (len(sample_texts), 384)
+        assert mock_embedding_service.model.encode.call_args.kwargs["show_progress_bar"] is False
+    
+    def test_encode_batch_preserves_input_order(self, mock_embedding_service):
+        """Test that rows line up with input texts regardless of text length."""
+        texts = ["a much longer text than the others", "short", "mid length"]
+        mock_embedding_service.model.encode.side_effect = lambda sentences, **kwargs: np.array(
+            [[len(text)] * 384 for text in sentences], dtype=np.float32
+        )
+        
+        embeddings = mock_embedding_service.encode_batch(texts)
+        
+        assert embeddings[:, 0].tolist() == [len(text) for text in texts]
+    
+    def test_encode_batch_multi_process(self, sample_texts):
+        """Test that multi_process dispatches CPU encoding to a process pool."""
+        mock_model = _mock_model()
+        mock_model.encode_multi_process.side_effect = lambda texts, pool, **kwargs: _fake_encode(texts)
+        config = EmbeddingConfig(model_name="test-model", multi_process=True, num_workers=3)
+        
+        with patch('qdrant_quantization_benchmark.embeddings.SentenceTransformer', return_value=mock_model):
+            service = EmbeddingService(config)
+            embeddings = service.encode_batch(sample_texts, show_progress=False, batch_size=16)
+        
+        mock_model.start_multi_process_pool.assert_called_once_with(target_devices=["cpu"] * 3)
+        pool = mock_model.start_multi_process_pool.return_value
+        mock_model.encode_multi_process.assert_called_once_with(
+            sample_texts, pool, batch_size=16, show_progress_bar=False
+        )
+        mock_model.stop_multi_process_pool.assert_called_once_with(pool)
+        mock_model.encode.assert_not_called()
+        assert embeddings.shape == (len(sample_texts), 384)
+        assert embeddings.dtype == np.float32
+    
+    @pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+    def test_output_dim_truncates_and_renormalizes(self, tmp_path, sample_texts, cached):
+        """Test Matryoshka truncation for batches and single texts."""
+        config = EmbeddingConfig(
+            model_name="test-model",
+            output_dim=128,
+            cache_path=str(tmp_path / "cache.db") if cached else None
+        )
+        
+        with patch('qdrant_quantization_benchmark.embeddings.SentenceTransformer', return_value=_mock_model()):
+            service = EmbeddingService(config)
+        
+        embeddings = service.encode_batch(sample_texts)
+        
+        assert service.vector_size == 128
+        assert embeddings.shape == (len(sample_texts), 128)
+        assert embeddings.flags.c_contiguous
+        assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0)
+        assert len(service.encode_text("test text")) == 128
+        assert service.encode_batch([]).shape == (0, 128)
+        
+        if service.cache is not None:
+            service.cache.close()
     
     def test_encode_dataset(self, mock_embedding_service, sample_dataset):
         """Test dataset encoding (combines title + description)."""
         embeddings = mock_embedding_service.encode_dataset(sample_dataset)
         
-        assert len(embeddings) == len(sample_dataset)
-        assert all(len(emb) == 384 for emb in embeddings)
+        assert embeddings.shape == (len(sample_dataset), 384)
+        texts = mock_embedding_service.model.encode.call_args.args[0]
+        assert texts[0] == "Title 1 Description 1"
+    
+    def test_encode_dataset_columns(self, mock_embedding_service):
+        """Test that a Dataset is encoded from its columns with the same texts."""
+        dataset = DatasetGenerator(seed=42).generate(n=4)
+        
+        mock_embedding_service.encode_dataset(dataset)
+        column_texts = mock_embedding_service.model.encode.call_args.args[0]
+        mock_embedding_service.encode_dataset(dataset.to_records())
+        record_texts = mock_embedding_service.model.encode.call_args.args[0]
+        
+        assert column_texts == record_texts
+        assert column_texts[0] == f"{dataset.titles[0]} {dataset.descriptions[0]}"
     
     def test_encode_empty_batch(self, mock_embedding_service):
         """Test encoding empty batch."""
         embeddings = mock_embedding_service.encode_batch([])
         
-        assert len(embeddings) == 0
\ No newline at end of file
+        assert len(embeddings) == 0
+    
+    def test_encode_batch_uses_cache(self, cached_embedding_service, sample_texts):
+        """Test that a repeated batch is served entirely from the cache."""
+        first = cached_embedding_service.encode_batch(sample_texts)
+        cached_embedding_service.model.encode.reset_mock()
+        
+        second = cached_embedding_service.encode_batch(sample_texts)
+        
+        cached_embedding_service.model.encode.assert_not_called()
+        assert np.array_equal(first, second)
+    
+    def test_encode_batch_encodes_only_misses(self, cached_embedding_service, sample_texts):
+        """Test that only uncached texts are sent to the model."""
+        cached_embedding_service.encode_batch(sample_texts[:2])
+        
+        embeddings = cached_embedding_service.encode_batch(sample_texts)
+        
+        assert embeddings.shape == (len(sample_texts), 384)
+        assert cached_embedding_service.model.encode.call_args.args[0] == sample_texts[2:]
+    
+    @pytest.mark.parametrize(
+        "other, shared",
+        [({"device": "cuda", "fp16": True}, False), ({"output_dim": 128}, True)],
+        ids=["fp16", "output_dim"]
+    )
+    def test_cache_variants(self, tmp_path, sample_texts, other, shared):
+        """Test fp16 vectors get their own entries while every output_dim shares full-size ones."""
+        cache_path = str(tmp_path / "cache.db")
+        services = []
+        for overrides in ({"device": "cuda"}, other):
+            config = EmbeddingConfig(model_name="test-model", cache_path=cache_path, **overrides)
+            with patch(
+                'qdrant_quantization_benchmark.embeddings.SentenceTransformer',
+                return_value=_mock_model("cuda")
+            ):
+                services.append(EmbeddingService(config))
+        
+        services[0].encode_batch(sample_texts)
+        embeddings = services[1].encode_batch(sample_texts)
+        
+        assert services[1].model.encode.called is not shared
+        assert (services[0]._cache_variant == services[1]._cache_variant) is shared
+        assert embeddings.shape == (len(sample_texts), services[1].vector_size)
+        for service in services:
+            service.cache.close()
+    
+    def test_cache_buffer_sized_from_model_output(self, tmp_path, sample_texts):
+        """Test a vector_size that disagrees with the model doesn't break cached encoding."""
+        config = EmbeddingConfig(
+            model_name="test-model",
+            vector_size=256,
+            cache_path=str(tmp_path / "cache.db")
+        )
+        with patch('qdrant_quantization_benchmark.embeddings.SentenceTransformer', return_value=_mock_model()):
+            service = EmbeddingService(config)
+        
+        service.encode_batch(sample_texts[:2])
+        embeddings = service.encode_batch(sample_texts)
+        
+        assert embeddings.shape == (len(sample_texts), 384)
+        assert service.encode_batch(sample_texts[:2]).shape == (2, 384)
+        service.cache.close()
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache class."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test storing and reading embeddings, keyed per model."""
+        cache = EmbeddingCache(str(tmp_path / "cache.db"))
+        keys = [EmbeddingCache.key("a"), EmbeddingCache.key("b")]
+        vectors = np.arange(6, dtype=np.float32).reshape(2, 3)
+        
+        cache.put_many("model-a", keys[:1], vectors[:1])
+        found, misses = cache.get_many("model-a", keys)
+        
+        assert list(found) == [0]
+        assert np.array_equal(found[0], vectors[0])
+        assert misses == [1]
+        assert cache.get_many("model-b", keys) == ({}, [0, 1])
+        cache.close()
+    
+    def test_variant_distinguishes_backend_and_precision(self):
+        """Test each backend/precision combination gets its own variant."""
+        variants = {
+            EmbeddingCache.variant("m", "sentence-transformers", "fp32"),
+            EmbeddingCache.variant("m", "sentence-transformers", "fp16"),
+            EmbeddingCache.variant("m", "onnx", "int8"),
+        }
+        
+        assert len(variants) == 3
+
+
+class TestOnnxEmbeddingBackend:
+    """Tests for OnnxEmbeddingBackend pooling."""
+    
+    def test_encode_mean_pools_and_normalizes(self):
+        """Test masked mean pooling, L2 normalization and input order."""
+        def tokenizer(batch, **kwargs):
+            lengths = [len(text) for text in batch]
+            mask = np.array([[1] * n + [0] * (max(lengths) - n) for n in lengths])
+            return {"input_ids": mask.copy(), "attention_mask": mask}
+        
+        def model(input_ids, attention_mask):
+            # Token t of every text embeds to [t + 1, 1]; padding is garbage
+            steps = np.arange(input_ids.shape[1], dtype=np.float32) + 1
+            hidden = np.stack([np.broadcast_to(steps, input_ids.shape), np.ones(input_ids.shape)], axis=-1)
+            hidden[attention_mask == 0] = 100.0
+            return Mock(last_hidden_state=hidden)
+        
+        backend = OnnxEmbeddingBackend(tokenizer, model)
+        texts = ["a", "abc", "ab"]
+        
+        embeddings = backend.encode(texts, batch_size=2)
+        
+        expected = np.array([[1.0, 1.0], [2.0, 1.0], [1.5, 1.0]], dtype=np.float32)
+        expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+        assert embeddings.dtype == np.float32
+        assert np.allclose(embeddings, expected)
+        assert np.allclose(backend.encode("abc"), expected[1])
+    
+    def test_from_pretrained_exports_once_and_logs(self, tmp_path, log_output):
+        """Test the first load exports, quantizes and logs it; later loads reuse the export."""
+        optimum = Mock()
+        optimum.ORTQuantizer.from_pretrained.return_value.quantize.side_effect = (
+            lambda save_dir, **kwargs: (save_dir / "model_quantized.onnx").touch()
+        )
+        modules = {
+            "optimum": Mock(),
+            "optimum.onnxruntime": optimum,
+            "optimum.onnxruntime.configuration": Mock(),
+            "transformers": Mock(),
+        }
+        
+        with patch.dict("sys.modules", modules):
+            OnnxEmbeddingBackend.from_pretrained("test-model", str(tmp_path))
+            OnnxEmbeddingBackend.from_pretrained("test-model", str(tmp_path))
+        
+        optimum.ORTQuantizer.from_pretrained.assert_called_once()
+        exported = [entry for entry in log_output if entry["event"] == "onnx_exported"]
+        assert len(exported) == 1
+        assert exported[0]["model"] == "sentence-transformers/test-model"
+        assert exported[0]["path"] == str(tmp_path)
@@ -76,6 +76,16 @@ class TestGetLogger:
         assert logger is not None
         assert callable(getattr(logger, 'info', None))
     
+    def test_get_logger_is_cached(self):
+        """Test that loggers are reused per name until logging is reconfigured."""
+        logger = get_logger("cached_module")
+        
+        assert get_logger("cached_module") is logger
+        assert get_logger("other_module") is not logger
+        
+        setup_logging()
+        assert get_logger("cached_module") is not logger
+    
     def test_logger_binds_name(self):
         """Test that logger properly binds module name."""
         logger = get_logger("my_module")
@@ -184,6 +194,17 @@ class TestProgressLogger:
         
         assert progress.processed == 100
     
+    def test_progress_logged_once_per_interval(self, log_output):
+        """Test that progress is logged when an interval boundary is reached or crossed."""
+        progress = ProgressLogger(get_logger(), operation="test", total=100, update_interval=30)
+        
+        for _ in range(10):
+            progress.update(7)
+        progress.update(30)
+        
+        logged = [entry["processed"] for entry in log_output if entry["event"] == "test_progress"]
+        assert logged == [35, 63, 100]
+    
     def test_final_progress_always_logged(self):
         """Test that final progress is always logged."""
         logger = get_logger()
@@ -264,6 +285,25 @@ class TestTimer:
         # Timer should have recorded duration even on failure
         assert timer.duration_ms is not None
     
+    def test_timer_logs_completion_only(self, log_output):
+        """Test that the timer logs once, on completion."""
+        with Timer(get_logger(), "op", batch=1):
+            pass
+        
+        assert [entry["event"] for entry in log_output] == ["op_completed"]
+        assert log_output[0]["batch"] == 1
+    
+    def test_timer_threshold(self, log_output):
+        """Test that completions under threshold_ms are not logged, failures always are."""
+        with Timer(get_logger(), "fast_op", threshold_ms=1000):
+            pass
+        
+        with pytest.raises(ValueError):
+            with Timer(get_logger(), "failing_op", threshold_ms=1000):
+                raise ValueError("Test error")
+        
+        assert [entry["event"] for entry in log_output] == ["failing_op_failed"]
+    
     def test_timer_start_time_set(self):
         """Test that start_time is set on entry."""
         logger = get_logger()
@@ -2,8 +2,10 @@
 Tests for Qdrant collection management operations.
 """
 
+import httpx
 import pytest
 from unittest.mock import Mock, call
+from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.models import Distance, VectorParams
 
 from qdrant_quantization_benchmark.qdrant_manager import QdrantCollectionManager
@@ -51,28 +53,44 @@ class TestQdrantCollectionManager:
         
         assert result is False
     
-    def test_delete_collection_when_exists(self, mock_qdrant_client, capsys):
+    def test_delete_collection_when_exists(self, mock_qdrant_client, log_output):
         """Test deleting an existing collection."""
-        mock_qdrant_client.collection_exists.return_value = True
+        mock_qdrant_client.delete_collection.return_value = True
         
         manager = QdrantCollectionManager(mock_qdrant_client)
         manager.delete_collection("test_collection")
         
+        mock_qdrant_client.collection_exists.assert_not_called()
         mock_qdrant_client.delete_collection.assert_called_once_with("test_collection")
-        captured = capsys.readouterr()
-        assert "Deleted existing collection" in captured.out
+        assert log_output[-1]["event"] == "collection_deleted"
+        assert log_output[-1]["collection"] == "test_collection"
+        assert log_output[-1]["module"] == "QdrantCollectionManager"
     
     def test_delete_collection_when_not_exists(self, mock_qdrant_client):
-        """Test deleting a non-existent collection."""
-        mock_qdrant_client.collection_exists.return_value = False
+        """Test that a 404 from deleting a non-existent collection is swallowed."""
+        mock_qdrant_client.delete_collection.side_effect = UnexpectedResponse(
+            404, "Not Found", b"", httpx.Headers()
+        )
         
         manager = QdrantCollectionManager(mock_qdrant_client)
         manager.delete_collection("nonexistent")
         
-        # Should not call delete
-        mock_qdrant_client.delete_collection.assert_not_called()
+        # Delete is attempted directly, without an existence check
+        mock_qdrant_client.collection_exists.assert_not_called()
+        mock_qdrant_client.delete_collection.assert_called_once_with("nonexistent")
+    
+    def test_delete_collection_other_errors_raise(self, mock_qdrant_client):
+        """Test that errors other than 404 propagate."""
+        mock_qdrant_client.delete_collection.side_effect = UnexpectedResponse(
+            500, "Internal Server Error", b"", httpx.Headers()
+        )
+        
+        manager = QdrantCollectionManager(mock_qdrant_client)
+        
+        with pytest.raises(UnexpectedResponse):
+            manager.delete_collection("test_collection")
     
-    def test_create_hybrid_collection(self, mock_qdrant_client, capsys):
+    def test_create_hybrid_collection(self, mock_qdrant_client, log_output):
         """Test creating a hybrid collection."""
         manager = QdrantCollectionManager(mock_qdrant_client)
         manager.create_hybrid_collection("test_hybrid")
@@ -85,10 +103,11 @@ class TestQdrantCollectionManager:
         assert 'dense' in call_args[1]['vectors_config']
         assert 'sparse' in call_args[1]['sparse_vectors_config']
         
-        captured = capsys.readouterr()
-        assert "Created hybrid collection" in captured.out
+        assert log_output[-1]["event"] == "collection_created"
+        assert log_output[-1]["collection"] == "test_hybrid"
+        assert log_output[-1]["type"] == "hybrid"
     
-    def test_create_standard_collection(self, mock_qdrant_client, capsys):
+    def test_create_standard_collection(self, mock_qdrant_client, log_output):
         """Test creating a standard collection."""
         manager = QdrantCollectionManager(mock_qdrant_client)
         manager.create_standard_collection("test_standard")
@@ -99,10 +118,11 @@ class TestQdrantCollectionManager:
         assert call_args[1]['collection_name'] == "test_standard"
         assert isinstance(call_args[1]['vectors_config'], VectorParams)
         
-        captured = capsys.readouterr()
-        assert "Created standard collection" in captured.out
+        assert log_output[-1]["event"] == "collection_created"
+        assert log_output[-1]["collection"] == "test_standard"
+        assert log_output[-1]["type"] == "standard"
     
-    def test_create_quantized_collection(self, mock_qdrant_client, quantization_config, capsys):
+    def test_create_quantized_collection(self, mock_qdrant_client, quantization_config, log_output):
         """Test creating a quantized collection."""
         manager = QdrantCollectionManager(mock_qdrant_client)
         
@@ -115,17 +135,17 @@ class TestQdrantCollectionManager:
         assert call_args[1]['collection_name'] == "test_quantized"
         assert call_args[1]['quantization_config'] == quant_config
         
-        captured = capsys.readouterr()
-        assert "Created quantized collection" in captured.out
+        assert log_output[-1]["event"] == "collection_created"
+        assert log_output[-1]["collection"] == "test_quantized"
+        assert log_output[-1]["type"] == "quantized"
     
     def test_recreate_collection_standard(self, mock_qdrant_client):
         """Test recreating a standard collection."""
-        mock_qdrant_client.collection_exists.return_value = True
-        
         manager = QdrantCollectionManager(mock_qdrant_client)
         manager.recreate_collection("test_collection", collection_type="standard")
         
-        # Should delete then create
+        # Should delete then create, with no existence check round trip
+        mock_qdrant_client.collection_exists.assert_not_called()
         mock_qdrant_client.delete_collection.assert_called_once_with("test_collection")
         mock_qdrant_client.create_collection.assert_called_once()
     
@@ -211,6 +231,17 @@ class TestQdrantCollectionManager:
         vectors_config = call_args[1]['vectors_config']
         assert vectors_config.size == 512
     
+    def test_vector_size_from_output_dim(self, mock_qdrant_client):
+        """Test that collections are sized for truncated embeddings."""
+        manager = QdrantCollectionManager(
+            mock_qdrant_client,
+            embedding_config=EmbeddingConfig(output_dim=128)
+        )
+        manager.create_hybrid_collection("test")
+        
+        call_args = mock_qdrant_client.create_collection.call_args
+        assert call_args[1]['vectors_config']['dense'].size == 128
+    
     def test_distance_metric_from_collection_config(self, mock_qdrant_client):
         """Test that distance metric comes from collection config."""
         collection_config = CollectionConfig(distance=Distance.EUCLID)
@@ -5,6 +5,7 @@ Tests for query generation functionality.
 import pytest
 import json
 
+from qdrant_quantization_benchmark import query_generator
 from qdrant_quantization_benchmark.query_generator import QueryGenerator
 
 
@@ -50,6 +51,22 @@ class TestQueryGenerator:
         assert all(isinstance(q, str) for q in queries)
         assert all(len(q) > 0 for q in queries)
     
+    def test_domain_mix_counts(self):
+        """Test that each domain gets its quota and the remainder fills up to n."""
+        generator = QueryGenerator(seed=42)
+        
+        queries = generator.generate_auto_queries(
+            n=7,
+            domain_mix={'tech': 1, 'medical': 1, 'pharmaceutical': 1}
+        )
+        
+        assert len(queries) == 7
+        assert generator.generate_auto_queries(n=0) == []
+        with pytest.raises(ValueError, match="domain_mix"):
+            generator.generate_auto_queries(n=5, domain_mix={'cooking': 1.0})
+        with pytest.raises(ValueError, match="positive"):
+            generator.generate_auto_queries(n=5, domain_mix={'tech': 0, 'medical': 0})
+    
     def test_domain_mix_distribution(self):
         """Test that domain mix is respected."""
         generator = QueryGenerator(seed=42)
@@ -103,6 +120,30 @@ class TestQueryGenerator:
         assert len(generator.queries) == 2
         assert "query 2" not in generator.queries
     
+    def test_remove_duplicate_query(self):
+        """Test that duplicates are kept and removed one occurrence at a time."""
+        generator = QueryGenerator()
+        generator.add_manual_queries(["query 1", "query 2", "query 1"])
+        
+        assert len(generator) == 3
+        
+        generator.remove_query("query 1")
+        
+        # Like list.remove, the first occurrence goes and order is kept
+        assert generator.queries == ["query 2", "query 1"]
+    
+    def test_queries_is_live_list(self):
+        """Test get_queries() and queries return the stored list, in insertion order."""
+        generator = QueryGenerator()
+        generator.add_manual_queries(["a", "b", "a"])
+        
+        generator.get_queries().append("c")
+        generator.queries.remove("b")
+        
+        assert generator.get_queries() is generator.queries
+        assert generator.queries == ["a", "a", "c"]
+        assert len(generator) == 3
+    
     def test_remove_nonexistent_query(self):
         """Test removing query that doesn't exist."""
         generator = QueryGenerator()
@@ -137,17 +178,17 @@ class TestQueryGenerator:
         queries = ["query 1", "query 2", "query 3"]
         generator.add_manual_queries(queries)
         
-        filepath = tmp_path / "test_queries.json"
+        filepath = tmp_path / "test_queries.jsonl"
         generator.save_queries(str(filepath))
         
         assert filepath.exists()
         
-        # Verify content
+        # Verify content: header line, then one query per line
         with open(filepath) as f:
-            data = json.load(f)
+            lines = [json.loads(line) for line in f]
         
-        assert data['queries'] == queries
-        assert data['count'] == 3
+        assert lines[0] == {'metadata': {}, 'count': 3}
+        assert lines[1:] == queries
     
     def test_load_queries(self, tmp_path):
         """Test loading queries from file."""
@@ -156,7 +197,7 @@ class TestQueryGenerator:
         original_queries = ["q1", "q2", "q3"]
         generator.add_manual_queries(original_queries)
         
-        filepath = tmp_path / "test_queries.json"
+        filepath = tmp_path / "test_queries.jsonl"
         generator.save_queries(str(filepath))
         
         # Load with new generator
@@ -166,6 +207,19 @@ class TestQueryGenerator:
         assert loaded_queries == original_queries
         assert new_generator.queries == original_queries
     
+    @pytest.mark.parametrize("content", [
+        '{\n  "queries": ["q1", "q2", "q1"],\n  "metadata": {},\n  "count": 3\n}',
+        '{"queries": ["q1", "q2", "q1"], "count": 3}',
+        '["q1", "q2", "q1"]',
+        '"q1"\n"q2"\n"q1"\n',
+    ], ids=["legacy-indented", "legacy-compact", "legacy-list", "jsonl-no-header"])
+    def test_load_queries_formats(self, tmp_path, content):
+        """Test loading legacy JSON files and header-less JSON Lines."""
+        filepath = tmp_path / "queries.json"
+        filepath.write_text(content)
+        
+        assert QueryGenerator().load_queries(str(filepath)) == ["q1", "q2", "q1"]
+    
     def test_get_domain_distribution(self):
         """Test domain distribution analysis."""
         generator = QueryGenerator()
@@ -181,4 +235,28 @@ class TestQueryGenerator:
         assert 'tech' in distribution
         assert 'medical' in distribution
         assert 'pharmaceutical' in distribution
-        assert 'health_insurance' in distribution
\ No newline at end of file
+        assert 'health_insurance' in distribution
+    
+    @pytest.mark.parametrize("use_automaton", [True, False], ids=["aho-corasick", "fallback"])
+    def test_domain_distribution_counts(self, use_automaton, monkeypatch):
+        """Test exact counts, including multi-domain and unknown queries."""
+        if use_automaton:
+            pytest.importorskip("ahocorasick")
+        else:
+            monkeypatch.setattr(query_generator, "_keyword_automaton", lambda: None)
+        
+        generator = QueryGenerator()
+        generator.add_manual_queries([
+            "Python machine learning",
+            "cardiology treatment",
+            "prescription coverage plan",
+            "cooking recipes"
+        ])
+        
+        assert generator.get_domain_distribution() == {
+            'tech': 1,
+            'medical': 1,
+            'pharmaceutical': 1,
+            'health_insurance': 1,
+            'unknown': 1
+        }
\ No newline at end of file
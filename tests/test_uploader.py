@@ -2,16 +2,37 @@
 Tests for data upload operations with retry logic.
 """
 
+import asyncio
 import pytest
+import random
+import threading
 import time
-from unittest.mock import Mock
+import numpy as np
+from unittest.mock import AsyncMock, Mock, patch
+from qdrant_client import QdrantClient, grpc, models
+from qdrant_client.conversions.conversion import RestToGrpc
 from qdrant_client.http.exceptions import ResponseHandlingException
 from qdrant_client.models import PointStruct
 
-from qdrant_quantization_benchmark.uploader import DataUploader
+from qdrant_quantization_benchmark.uploader import (
+    CircuitOpenError,
+    DataUploader,
+    _SHARED_CLIENTS_MAX,
+    close_shared_clients,
+)
 from qdrant_quantization_benchmark.config import UploadConfig
 
 
+@pytest.fixture
+def client_cls():
+    """Patch QdrantClient and isolate the shared-client cache."""
+    close_shared_clients()
+    with patch("qdrant_quantization_benchmark.uploader.QdrantClient") as client_cls:
+        client_cls.side_effect = lambda **kwargs: Mock()
+        yield client_cls
+        close_shared_clients()
+
+
 class TestDataUploader:
     """Tests for DataUploader class."""
     
@@ -76,6 +97,42 @@ class TestDataUploader:
         # Should be called 4 times (20 items / 5 batch_size)
         assert mock_qdrant_client.upsert.call_count == 4
     
+    def test_upload_batch_concurrent(self, mock_qdrant_client, sample_dataset, sample_embeddings):
+        """Test that a pool uploads every batch exactly once."""
+        config = UploadConfig(batch_size=3, pool_size=4)
+        uploader = DataUploader(mock_qdrant_client, config)
+        
+        result = uploader.upload_batch(
+            collection_name="test",
+            dataset=sample_dataset,
+            embeddings=sample_embeddings,
+            show_progress=False
+        )
+        
+        assert result == len(sample_dataset)
+        assert mock_qdrant_client.upsert.call_count == 7  # ceil(20 / 3)
+        ids = sorted(
+            point.id
+            for call in mock_qdrant_client.upsert.call_args_list
+            for point in call.kwargs['points']
+        )
+        assert ids == list(range(len(sample_dataset)))
+    
+    def test_upload_batch_concurrent_error_propagates(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings
+    ):
+        """Test that a failed upsert in the pool is raised to the caller."""
+        mock_qdrant_client.upsert.side_effect = [None, ResponseHandlingException("boom")] + [None] * 5
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=3, pool_size=4))
+        
+        with pytest.raises(ResponseHandlingException):
+            uploader.upload_batch(
+                collection_name="test",
+                dataset=sample_dataset,
+                embeddings=sample_embeddings,
+                show_progress=False
+            )
+    
     def test_upload_batch_named_vectors(self, mock_qdrant_client, sample_dataset, sample_embeddings):
         """Test upload with named vectors."""
         uploader = DataUploader(mock_qdrant_client)
@@ -116,11 +173,62 @@ class TestDataUploader:
         # Check first point has list vector
         assert isinstance(points[0].vector, list)
     
+    def test_upload_batch_adaptive_grows(self, mock_qdrant_client):
+        """Test adaptive batches double after each success up to the cap."""
+        dataset = [{"id": i} for i in range(100)]
+        embeddings = np.zeros((100, 4), dtype=np.float32)
+        config = UploadConfig(batch_size=5, adaptive=True, max_batch_size=20)
+        uploader = DataUploader(mock_qdrant_client, config)
+        
+        result = uploader.upload_batch("test", dataset, embeddings, show_progress=False)
+        
+        sizes = [len(c.kwargs["points"]) for c in mock_qdrant_client.upsert.call_args_list]
+        assert result == 100
+        assert sizes == [5, 10, 20, 20, 20, 20, 5]
+    
+    def test_upload_batch_adaptive_halves_on_failure(self, mock_qdrant_client, log_output):
+        """Test adaptive batches halve after a failed upsert and retry the same items."""
+        dataset = [{"id": i} for i in range(40)]
+        embeddings = np.zeros((40, 4), dtype=np.float32)
+        
+        def upsert(collection_name, points):
+            if len(points) > 12:
+                raise ResponseHandlingException("Timeout")
+        
+        mock_qdrant_client.upsert.side_effect = upsert
+        config = UploadConfig(batch_size=10, adaptive=True, max_batch_size=40, breaker_threshold=0)
+        uploader = DataUploader(mock_qdrant_client, config)
+        
+        result = uploader.upload_batch("test", dataset, embeddings, show_progress=False)
+        
+        calls = mock_qdrant_client.upsert.call_args_list
+        sizes = [len(c.kwargs["points"]) for c in calls]
+        # 10 ok -> 20 fails -> 10 ok -> 20 fails -> 10 ok -> last 10 ok
+        assert sizes == [10, 20, 10, 20, 10, 10]
+        assert result == 40
+        sent = [p.id for c, size in zip(calls, sizes) if size <= 12 for p in c.kwargs["points"]]
+        assert sent == list(range(40))
+        shrunk = [e for e in log_output if e["event"] == "upload_batch_shrunk"]
+        assert [(e["batch"], e["batch_size"]) for e in shrunk] == [(2, 10), (3, 10)]
+        assert uploader.stats == {"uploaded": 40, "retried": 2, "failed": 0}
+    
+    def test_upload_batch_adaptive_raises_at_size_one(self, mock_qdrant_client, sample_dataset, sample_embeddings):
+        """Test a failure that persists down to single points is raised."""
+        mock_qdrant_client.upsert.side_effect = ResponseHandlingException("Timeout")
+        config = UploadConfig(batch_size=4, adaptive=True, breaker_threshold=0)
+        uploader = DataUploader(mock_qdrant_client, config)
+        
+        with pytest.raises(ResponseHandlingException):
+            uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        
+        sizes = [len(c.kwargs["points"]) for c in mock_qdrant_client.upsert.call_args_list]
+        assert sizes == [4, 2, 1]
+    
     def test_upload_batch_progress(self, mock_qdrant_client, capsys):
         """Test progress output during upload."""
         # Create larger dataset to trigger progress
         dataset = [{"id": i, "title": f"Item {i}", "description": f"Desc {i}"} for i in range(1500)]
-        embeddings = [[0.1] * 384 for _ in range(1500)]
+        embeddings = np.full((1500, 384), 0.1, dtype=np.float32)
         
         config = UploadConfig(batch_size=50)
         uploader = DataUploader(mock_qdrant_client, config)
@@ -136,6 +244,150 @@ class TestDataUploader:
         assert "Progress:" in captured.out
         assert "1000" in captured.out  # Should show 1000 milestone
     
+    def test_upload_batch_async_progress_uneven_batches(self, mock_qdrant_client, capsys):
+        """Test async progress reports each 1000 mark when batch size doesn't divide 1000."""
+        dataset = [{"id": i} for i in range(2100)]
+        embeddings = np.full((2100, 8), 0.1, dtype=np.float32)
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=300))
+        
+        asyncio.run(uploader.upload_batch_async("test", dataset, embeddings))
+        
+        captured = capsys.readouterr()
+        assert "  Progress: 1200/2100 points...\n  Progress: 2100/2100 points...\n" in captured.out
+    
+    def test_upload_batch_shm(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings, shm_embeddings
+    ):
+        """Test uploading embeddings read in place from shared memory."""
+        shm_name, shape, dtype = shm_embeddings
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=8))
+        
+        result = uploader.upload_batch_shm(
+            "test", shm_name, shape, dtype, sample_dataset, show_progress=False
+        )
+        
+        assert result == 20
+        points = [p for c in mock_qdrant_client.upsert.call_args_list for p in c.kwargs["points"]]
+        assert [p.vector["dense"] for p in points] == sample_embeddings.tolist()
+    
+    def test_upload_batch_shm_failure_leaves_block_usable(
+        self, mock_qdrant_client, sample_dataset, shm_embeddings
+    ):
+        """Test an upload error propagates and the block can be mapped again."""
+        shm_name, shape, dtype = shm_embeddings
+        mock_qdrant_client.upsert.side_effect = [ResponseHandlingException("boom"), None]
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=20))
+        
+        with pytest.raises(ResponseHandlingException):
+            uploader.upload_batch_shm("test", shm_name, shape, dtype, sample_dataset, show_progress=False)
+        
+        assert uploader.upload_batch_shm(
+            "test", shm_name, shape, dtype, sample_dataset, show_progress=False
+        ) == 20
+    
+    def test_upload_stream(self, mock_qdrant_client, sample_dataset):
+        """Test upload_stream batches (item, vector) pairs from a generator."""
+        config = UploadConfig(batch_size=8)
+        uploader = DataUploader(mock_qdrant_client, config)
+        items = ((item, np.full(384, 0.5, dtype=np.float32)) for item in sample_dataset)
+        
+        result = uploader.upload_stream("test", items, show_progress=False)
+        
+        assert result == 20
+        # 20 items in batches of 8: 8, 8, 4
+        calls = mock_qdrant_client.upsert.call_args_list
+        assert [len(c[1]["points"]) for c in calls] == [8, 8, 4]
+        last_points = calls[-1][1]["points"]
+        assert [p.id for p in last_points] == [16, 17, 18, 19]
+        assert last_points[0].payload == sample_dataset[16]
+        assert last_points[0].vector["dense"] == [0.5] * 384
+    
+    def test_upload_stream_consumes_lazily(self, mock_qdrant_client, sample_dataset):
+        """Test upload_stream pulls one batch ahead of the upserts at most."""
+        config = UploadConfig(batch_size=5)
+        uploader = DataUploader(mock_qdrant_client, config)
+        consumed = []
+        upserted_when_consumed = []
+    
+        def items():
+            for item in sample_dataset:
+                consumed.append(item)
+                upserted_when_consumed.append(mock_qdrant_client.upsert.call_count)
+                yield item, [0.1] * 384
+        
+        uploader.upload_stream("test", items(), show_progress=False)
+        
+        assert len(consumed) == 20
+        # Item i is pulled only after the previous batches were upserted
+        assert upserted_when_consumed == [i // 5 for i in range(20)]
+    
+    def test_upload_stream_empty(self, mock_qdrant_client):
+        """Test upload_stream with no items uploads nothing."""
+        uploader = DataUploader(mock_qdrant_client)
+        
+        assert uploader.upload_stream("test", iter([]), show_progress=False) == 0
+        mock_qdrant_client.upsert.assert_not_called()
+    
+    def test_upload_batch_skips_repeated_ids(self, mock_qdrant_client, sample_dataset, sample_embeddings):
+        """Test that with skip_seen a repeated upload sends nothing."""
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=5, skip_seen=True))
+        
+        first = uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        second = uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        
+        assert first == 20
+        assert second == 0
+        assert mock_qdrant_client.upsert.call_count == 4
+    
+    def test_skip_seen_is_per_collection_and_partial(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings
+    ):
+        """Test that only fully seen batches in the same collection are skipped."""
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=5, skip_seen=True))
+        uploader.upload_batch("a", sample_dataset[:10], sample_embeddings[:10], show_progress=False)
+        mock_qdrant_client.upsert.reset_mock()
+        
+        assert uploader.upload_batch("b", sample_dataset, sample_embeddings, show_progress=False) == 20
+        assert uploader.upload_batch("a", sample_dataset, sample_embeddings, show_progress=False) == 10
+        sent_to_a = [
+            call.kwargs["points"][0].id
+            for call in mock_qdrant_client.upsert.call_args_list
+            if call.kwargs["collection_name"] == "a"
+        ]
+        assert sent_to_a == [10, 15]
+    
+    def test_skip_seen_sends_changed_points(self, mock_qdrant_client, sample_dataset, sample_embeddings):
+        """Test that another dataset upserted under the same positional IDs is not skipped."""
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=5, skip_seen=True))
+        uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        
+        other_dataset = [{**item, "title": f"Other {item['title']}"} for item in sample_dataset]
+        other_embeddings = sample_embeddings[::-1]
+        
+        assert uploader.upload_batch("test", other_dataset, sample_embeddings, show_progress=False) == 20
+        assert uploader.upload_batch("test", sample_dataset, other_embeddings, show_progress=False) == 20
+        assert uploader.upload_batch("test", other_dataset, sample_embeddings, show_progress=False) == 0
+        assert mock_qdrant_client.upsert.call_count == 12
+    
+    def test_skip_seen_failed_batch_not_recorded(self, mock_qdrant_client, sample_dataset, sample_embeddings):
+        """Test that a batch that failed to upload is sent again."""
+        mock_qdrant_client.upsert.side_effect = [ResponseHandlingException("boom"), None]
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=20, skip_seen=True))
+        
+        with pytest.raises(ResponseHandlingException):
+            uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        
+        assert uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False) == 20
+    
+    def test_skip_seen_disabled_by_default(self, mock_qdrant_client, sample_dataset, sample_embeddings):
+        """Test that repeated uploads are re-sent unless skip_seen is set."""
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=20))
+        
+        uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        
+        assert mock_qdrant_client.upsert.call_count == 2
+    
     def test_prepare_points(self, mock_qdrant_client, sample_dataset, sample_embeddings):
         """Test _prepare_points creates correct PointStruct objects."""
         uploader = DataUploader(mock_qdrant_client)
@@ -154,6 +406,89 @@ class TestDataUploader:
         assert points[4].id == 4
         assert all(isinstance(p.vector, dict) for p in points)
     
+    def test_prepare_points_from_ndarray(self, mock_qdrant_client, sample_dataset):
+        """Test _prepare_points accepts a 2D float32 embedding array."""
+        uploader = DataUploader(mock_qdrant_client)
+        embeddings = np.zeros((5, 384), dtype=np.float32)
+        
+        points = uploader._prepare_points(
+            batch_dataset=sample_dataset[:5],
+            batch_embeddings=embeddings,
+            start_id=0,
+            named_vector=True,
+            vector_name="dense"
+        )
+        
+        assert len(points) == 5
+        assert points[0].vector["dense"] == [0.0] * 384
+    
+    @pytest.mark.parametrize("named_vector", [True, False])
+    def test_prepare_points_matches_validated_points(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings, named_vector
+    ):
+        """Test unvalidated construction gives the same points and JSON as PointStruct()."""
+        uploader = DataUploader(mock_qdrant_client)
+        
+        points = uploader._prepare_points(
+            sample_dataset, sample_embeddings, 7, named_vector, "dense"
+        )
+        
+        validated = [
+            PointStruct(
+                id=7 + i,
+                vector={"dense": embedding} if named_vector else embedding,
+                payload=item
+            )
+            for i, (item, embedding) in enumerate(zip(sample_dataset, sample_embeddings.tolist()))
+        ]
+        assert points == validated
+        assert [p.model_dump_json() for p in points] == [p.model_dump_json() for p in validated]
+    
+    def test_prepare_points_np_converts_dtype_and_layout(self, mock_qdrant_client, sample_dataset):
+        """Test _prepare_points_np accepts float64 and non-contiguous arrays."""
+        uploader = DataUploader(mock_qdrant_client)
+        embeddings = np.arange(5 * 768, dtype=np.float64).reshape(5, 768)[:, ::2]
+        
+        points = uploader._prepare_points_np(
+            batch_dataset=sample_dataset[:5],
+            batch_embeddings=embeddings,
+            start_id=0,
+            named_vector=False,
+            vector_name="dense"
+        )
+        
+        assert points[1].vector == embeddings[1].astype(np.float32).tolist()
+    
+    def test_upload_batch_ndarray_matches_lists(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings
+    ):
+        """Test uploading an array sends the same points as its list form."""
+        config = UploadConfig(batch_size=6)
+        uploader = DataUploader(mock_qdrant_client, config)
+        
+        uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        uploader.upload_batch(
+            "test", sample_dataset, sample_embeddings.tolist(), show_progress=False
+        )
+        
+        calls = mock_qdrant_client.upsert.call_args_list
+        assert len(calls) == 8  # ceil(20 / 6) per upload
+        for from_array, from_lists in zip(calls[:4], calls[4:]):
+            assert from_array[1]["points"] == from_lists[1]["points"]
+    
+    def test_upload_batch_list_of_ndarray_rows(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings
+    ):
+        """Test a list of NumPy rows is sent as serializable list vectors."""
+        uploader = DataUploader(mock_qdrant_client)
+        
+        uploader.upload_batch("test", sample_dataset, list(sample_embeddings), show_progress=False)
+        
+        points = mock_qdrant_client.upsert.call_args.kwargs["points"]
+        assert points[3].vector["dense"] == sample_embeddings[3].tolist()
+        # Serializes like the REST client does, without PydanticSerializationError
+        assert '"dense":[' in points[3].model_dump_json()
+    
     def test_prepare_points_with_offset(self, mock_qdrant_client, sample_dataset, sample_embeddings):
         """Test _prepare_points with start_id offset."""
         uploader = DataUploader(mock_qdrant_client)
@@ -199,7 +534,7 @@ class TestDataUploader:
         assert result == len(sample_dataset)
         mock_qdrant_client.upsert.assert_called()
     
-    def test_retry_succeeds_after_one_failure(self, mock_qdrant_client, capsys):
+    def test_retry_succeeds_after_one_failure(self, mock_qdrant_client, log_output):
         """Test retry logic succeeds on second attempt."""
         config = UploadConfig(enable_retry=True, max_retries=3)
         uploader = DataUploader(mock_qdrant_client, config)
@@ -216,8 +551,11 @@ class TestDataUploader:
         assert result == 1
         assert mock_qdrant_client.upsert.call_count == 2
         
-        captured = capsys.readouterr()
-        assert "retrying" in captured.out.lower()
+        retries = [e for e in log_output if e["event"] == "upload_retry"]
+        assert len(retries) == 1
+        assert retries[0]["batch"] == 1
+        assert retries[0]["attempt"] == 1
+        assert uploader.stats == {"uploaded": 1, "retried": 1, "failed": 0}
     
     def test_retry_fails_after_max_attempts(self, mock_qdrant_client):
         """Test retry logic fails after max retries."""
@@ -234,29 +572,241 @@ class TestDataUploader:
         
         assert mock_qdrant_client.upsert.call_count == 2
     
-    def test_retry_exponential_backoff(self, mock_qdrant_client, mocker):
-        """Test that retry uses exponential backoff."""
-        config = UploadConfig(enable_retry=True, max_retries=3, initial_backoff=1.0)
+    def test_retry_failure_logged_and_counted(self, mock_qdrant_client, log_output):
+        """Test a batch failing every attempt logs upload_failed and counts it."""
+        config = UploadConfig(enable_retry=True, max_retries=2, breaker_threshold=0)
         uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = ResponseHandlingException("Timeout")
+        
+        with pytest.raises(ResponseHandlingException):
+            uploader._upload_with_retry("test", [Mock(spec=PointStruct)], batch_num=4)
         
-        # Mock time.sleep
-        mock_sleep = mocker.patch('time.sleep')
+        assert log_output[-1]["event"] == "upload_failed"
+        assert log_output[-1]["batch"] == 5
+        assert log_output[-1]["attempts"] == 2
+        assert uploader.stats == {"uploaded": 0, "retried": 1, "failed": 1}
+    
+    def test_flush_stats_logs_counters(self, mock_qdrant_client, sample_dataset,
+                                       sample_embeddings, log_output):
+        """Test flush_stats logs the uploaded point count as one event."""
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=5))
+        uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False)
+        
+        stats = uploader.flush_stats()
+        
+        assert stats == {"uploaded": len(sample_dataset), "retried": 0, "failed": 0}
+        assert log_output[-1]["event"] == "upload_stats"
+        assert log_output[-1]["uploaded"] == len(sample_dataset)
+    
+    def test_retry_exponential_backoff(self, mock_qdrant_client):
+        """Test that retry waits a jittered time within an exponential, capped bound."""
+        config = UploadConfig(
+            enable_retry=True, max_retries=4, initial_backoff=1.0, max_backoff=3.0, jitter=True
+        )
+        uploader = DataUploader(mock_qdrant_client, config)
         
-        # First two calls fail, third succeeds
+        # First three calls fail, fourth succeeds
         mock_qdrant_client.upsert.side_effect = [
+            ResponseHandlingException("Timeout"),
             ResponseHandlingException("Timeout"),
             ResponseHandlingException("Timeout"),
             None  # Success
         ]
         
         points = [Mock(spec=PointStruct)]
-        uploader._upload_with_retry("test", points, batch_num=0)
         
-        # Check sleep was called with increasing durations
-        assert mock_sleep.call_count == 2
-        sleep_calls = [call[0][0] for call in mock_sleep.call_args_list]
-        assert sleep_calls[0] == 1.0  # First retry: 1.0 * 1
-        assert sleep_calls[1] == 2.0  # Second retry: 1.0 * 2
+        with patch.object(time, "sleep") as mock_sleep, \
+                patch.object(random, "uniform", return_value=0.5) as mock_uniform:
+            uploader._upload_with_retry("test", points, batch_num=0)
+        
+        # Full jitter over 1.0 * 2**attempt, capped at max_backoff
+        assert [call.args for call in mock_uniform.call_args_list] == [(0, 1.0), (0, 2.0), (0, 3.0)]
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 0.5, 0.5]
+    
+    def test_retry_exponential_backoff_async(self, mock_qdrant_client):
+        """Test the async retry awaits asyncio.sleep with the same backoff."""
+        config = UploadConfig(
+            enable_retry=True, max_retries=4, initial_backoff=1.0, max_backoff=3.0, jitter=False
+        )
+        uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = [
+            ResponseHandlingException("Timeout"),
+            ResponseHandlingException("Timeout"),
+            ResponseHandlingException("Timeout"),
+            None  # Success
+        ]
+        points = [Mock(spec=PointStruct)]
+        
+        with patch.object(asyncio, "sleep", new_callable=AsyncMock) as mock_sleep, \
+                patch.object(time, "sleep") as mock_blocking_sleep:
+            result = asyncio.run(uploader._upload_with_retry_async("test", points, batch_num=0))
+        
+        assert result == 1
+        assert mock_qdrant_client.upsert.call_count == 4
+        waits = [call.args[0] for call in mock_sleep.await_args_list]
+        assert waits == pytest.approx([1.0, 2.0, 3.0], abs=0.05)
+        mock_blocking_sleep.assert_not_called()
+    
+    def test_upload_batch_async_does_not_block_event_loop(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings
+    ):
+        """Test other tasks run while an async upload waits to retry."""
+        config = UploadConfig(batch_size=20, enable_retry=True, initial_backoff=0.2, jitter=False)
+        uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = [ResponseHandlingException("Timeout"), None]
+        ticks = []
+        
+        async def ticker():
+            for _ in range(5):
+                ticks.append(mock_qdrant_client.upsert.call_count)
+                await asyncio.sleep(0.02)
+        
+        async def main():
+            return await asyncio.gather(
+                uploader.upload_batch_async(
+                    "test", sample_dataset, sample_embeddings, show_progress=False
+                ),
+                ticker()
+            )
+        
+        uploaded, _ = asyncio.run(main())
+        
+        assert uploaded == 20
+        # The ticker kept running after the first failure, during the backoff
+        assert ticks[-1] == 1
+    
+    def test_upload_batch_async_overlaps_up_to_pool_size(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings
+    ):
+        """Test async upserts run concurrently, never more than pool_size at once."""
+        uploader = DataUploader(mock_qdrant_client, UploadConfig(batch_size=2, pool_size=3))
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+        
+        def upsert(collection_name, points):
+            with lock:
+                in_flight.append(points)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(points)
+        
+        mock_qdrant_client.upsert.side_effect = upsert
+        
+        uploaded = asyncio.run(uploader.upload_batch_async(
+            "test", sample_dataset, sample_embeddings, show_progress=False
+        ))
+        
+        assert uploaded == 20
+        assert max(peak) == 3
+        sent = sorted(p.id for c in mock_qdrant_client.upsert.call_args_list for p in c.kwargs["points"])
+        assert sent == list(range(20))
+    
+    def test_upload_batch_async_stops_after_failure(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings
+    ):
+        """Test a failed batch stops new batches and its error is raised."""
+        config = UploadConfig(batch_size=2, pool_size=2, breaker_threshold=0)
+        uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = ResponseHandlingException("Timeout")
+        
+        with pytest.raises(ResponseHandlingException):
+            asyncio.run(uploader.upload_batch_async(
+                "test", sample_dataset, sample_embeddings, show_progress=False
+            ))
+        
+        assert mock_qdrant_client.upsert.call_count < 10
+    
+    def test_retry_backoff_without_jitter(self, mock_qdrant_client):
+        """Test that disabling jitter gives deterministic exponential waits."""
+        config = UploadConfig(enable_retry=True, max_retries=3, initial_backoff=1.0, jitter=False)
+        uploader = DataUploader(mock_qdrant_client, config)
+        
+        mock_qdrant_client.upsert.side_effect = [
+            ResponseHandlingException("Timeout"),
+            ResponseHandlingException("Timeout"),
+            None  # Success
+        ]
+        
+        with patch.object(time, "sleep") as mock_sleep:
+            uploader._upload_with_retry("test", [Mock(spec=PointStruct)], batch_num=0)
+        
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1.0, 2.0]
+    
+    def test_breaker_opens_and_fails_fast(self, mock_qdrant_client):
+        """Test that consecutive failures open the breaker before retries run out."""
+        config = UploadConfig(enable_retry=True, max_retries=5, breaker_threshold=2)
+        uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = ResponseHandlingException("Timeout")
+        points = [Mock(spec=PointStruct)]
+        
+        with patch.object(time, "sleep"):
+            with pytest.raises(CircuitOpenError):
+                uploader._upload_with_retry("test", points, batch_num=0)
+            
+            # Later batches are rejected without touching the client
+            with pytest.raises(CircuitOpenError):
+                uploader._upload_with_retry("test", points, batch_num=1)
+        
+        assert mock_qdrant_client.upsert.call_count == 2
+    
+    def test_breaker_half_open_probe(self, mock_qdrant_client):
+        """Test that a successful probe after the cooldown closes the breaker."""
+        config = UploadConfig(breaker_threshold=1, breaker_cooldown=10.0)
+        uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = [ResponseHandlingException("Timeout"), None, None]
+        points = [Mock(spec=PointStruct)]
+        
+        with patch.object(time, "monotonic", return_value=100.0) as mock_clock:
+            with pytest.raises(ResponseHandlingException):
+                uploader._upload_points("test", points, batch_num=0)
+            with pytest.raises(CircuitOpenError):
+                uploader._upload_points("test", points, batch_num=1)
+            
+            mock_clock.return_value = 110.0
+            assert uploader._upload_points("test", points, batch_num=1) == 1
+            assert uploader._upload_points("test", points, batch_num=2) == 1
+        
+        assert mock_qdrant_client.upsert.call_count == 3
+    
+    def test_breaker_reopens_after_other_probe_error(self, mock_qdrant_client):
+        """Test a probe failing with a non-ResponseHandlingException reopens the breaker."""
+        config = UploadConfig(breaker_threshold=1, breaker_cooldown=10.0)
+        uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = [
+            ResponseHandlingException("Timeout"), ValueError("bad response"), None
+        ]
+        points = [Mock(spec=PointStruct)]
+        
+        with patch.object(time, "monotonic", return_value=100.0) as mock_clock:
+            with pytest.raises(ResponseHandlingException):
+                uploader._upload_points("test", points, batch_num=0)
+            
+            mock_clock.return_value = 110.0
+            with pytest.raises(ValueError):
+                uploader._upload_points("test", points, batch_num=1)
+            with pytest.raises(CircuitOpenError):
+                uploader._upload_points("test", points, batch_num=2)
+            
+            # Not stuck half-open: the next cooldown allows another probe
+            mock_clock.return_value = 120.0
+            assert uploader._upload_points("test", points, batch_num=2) == 1
+        
+        assert mock_qdrant_client.upsert.call_count == 3
+    
+    def test_breaker_disabled(self, mock_qdrant_client):
+        """Test that breaker_threshold=0 retries every batch fully."""
+        config = UploadConfig(enable_retry=True, max_retries=3, breaker_threshold=0)
+        uploader = DataUploader(mock_qdrant_client, config)
+        mock_qdrant_client.upsert.side_effect = ResponseHandlingException("Timeout")
+        
+        with patch.object(time, "sleep"):
+            for batch_num in range(2):
+                with pytest.raises(ResponseHandlingException):
+                    uploader._upload_with_retry("test", [Mock(spec=PointStruct)], batch_num=batch_num)
+        
+        assert mock_qdrant_client.upsert.call_count == 6
     
     def test_collection_name_passed_correctly(self, mock_qdrant_client, sample_dataset, sample_embeddings):
         """Test that collection name is passed to client."""
@@ -287,4 +837,94 @@ class TestDataUploader:
         points = call_args[1]['points']
         
         # Check first point payload matches first dataset item
-        assert points[0].payload == sample_dataset[0]
\ No newline at end of file
+        assert points[0].payload == sample_dataset[0]
+    
+    @pytest.mark.parametrize("named_vector", [True, False])
+    def test_grpc_raw_points_match_client_conversion(
+        self, mock_qdrant_client, sample_dataset, sample_embeddings, named_vector
+    ):
+        """Test gRPC points equal what the client would convert REST points to."""
+        rest = DataUploader(mock_qdrant_client)._prepare_points(
+            sample_dataset[:5], sample_embeddings[:5], 10, named_vector, "dense"
+        )
+        config = UploadConfig(use_grpc_raw=True)
+        raw = DataUploader(mock_qdrant_client, config, prefer_grpc=True)._prepare_points(
+            sample_dataset[:5], sample_embeddings[:5], 10, named_vector, "dense"
+        )
+        
+        assert all(isinstance(p, grpc.PointStruct) for p in raw)
+        assert raw == [RestToGrpc.convert_point_struct(p) for p in rest]
+    
+    def test_upload_batch_grpc_raw(self, mock_qdrant_client, sample_dataset, sample_embeddings):
+        """Test upload_batch sends gRPC points and skip_seen reads their IDs."""
+        config = UploadConfig(batch_size=10, use_grpc_raw=True, skip_seen=True)
+        uploader = DataUploader(mock_qdrant_client, config, prefer_grpc=True)
+        
+        assert uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False) == 20
+        assert uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False) == 0
+        
+        points = mock_qdrant_client.upsert.call_args_list[1][1]["points"]
+        assert mock_qdrant_client.upsert.call_count == 2
+        assert [p.id.num for p in points] == list(range(10, 20))
+        assert points[0].payload["title"].string_value == sample_dataset[10]["title"]
+    
+    def test_grpc_raw_falls_back_for_local_client(
+        self, sample_dataset, sample_embeddings, log_output
+    ):
+        """Test an in-memory client gets REST points even with use_grpc_raw."""
+        client = QdrantClient(":memory:")
+        client.create_collection(
+            "test",
+            vectors_config={"dense": models.VectorParams(size=384, distance=models.Distance.COSINE)}
+        )
+        uploader = DataUploader(client, UploadConfig(use_grpc_raw=True))
+        
+        assert uploader.upload_batch("test", sample_dataset, sample_embeddings, show_progress=False) == 20
+        assert client.count("test").count == 20
+        assert log_output[0]["event"] == "grpc_raw_unsupported"
+    
+    def test_from_endpoint_reuses_client(self, client_cls):
+        """Test repeated from_endpoint calls share one client per endpoint."""
+        first = DataUploader.from_endpoint("https://a.example:6333", api_key="key")
+        second = DataUploader.from_endpoint(
+            "https://a.example:6333", api_key="key", config=UploadConfig(batch_size=10)
+        )
+        other = DataUploader.from_endpoint("https://b.example:6333", api_key="key")
+        
+        assert first.client is second.client
+        assert other.client is not first.client
+        assert second.config.batch_size == 10
+        assert client_cls.call_count == 2
+        client_cls.assert_any_call(
+            url="https://a.example:6333", api_key="key",
+            prefer_grpc=True, pool_size=100, timeout=None
+        )
+    
+    @pytest.mark.parametrize("prefer_grpc", [True, False])
+    def test_from_endpoint_records_transport(self, client_cls, prefer_grpc):
+        """Test use_grpc_raw follows the prefer_grpc the shared client was created with."""
+        uploader = DataUploader.from_endpoint(
+            "https://a.example:6333", config=UploadConfig(use_grpc_raw=True), prefer_grpc=prefer_grpc
+        )
+        
+        assert uploader._grpc_raw is prefer_grpc
+    
+    def test_from_endpoint_pool_covers_upload_concurrency(self, client_cls):
+        """Test the connection pool is at least the configured upload pool."""
+        DataUploader.from_endpoint("https://a.example:6333", config=UploadConfig(pool_size=200))
+        
+        assert client_cls.call_args.kwargs["pool_size"] == 200
+    
+    def test_shared_clients_bounded_and_closeable(self, client_cls):
+        """Test the shared-client cache evicts the oldest client and closes on request."""
+        first = DataUploader.from_endpoint("https://0.example:6333").client
+        for i in range(1, _SHARED_CLIENTS_MAX + 1):
+            DataUploader.from_endpoint(f"https://{i}.example:6333")
+        
+        # The first endpoint was evicted, so it gets a new client
+        assert DataUploader.from_endpoint("https://0.example:6333").client is not first
+        
+        latest = DataUploader.from_endpoint("https://0.example:6333").client
+        close_shared_clients()
+        latest.close.assert_called_once()
+        first.close.assert_not_called()
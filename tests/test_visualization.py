@@ -5,29 +5,29 @@ Tests for visualization and analysis functionality.
 import pytest
 from unittest.mock import Mock, patch
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
-from qdrant_quantization_benchmark.visualization import BenchmarkVisualizer
+from qdrant_quantization_benchmark.visualization import BenchmarkVisualizer, _to_arrays
 
 
 class TestBenchmarkVisualizer:
     """Tests for BenchmarkVisualizer class."""
     
-    def test_plot_quantization_results(self, mock_benchmark_results, tmp_path, mocker):
+    def test_plot_quantization_results(self, mock_benchmark_results, tmp_path):
         """Test generating quantization results plot."""
         baseline, quantization = mock_benchmark_results
         
-        # Mock plt.savefig to avoid actually creating file
-        mock_savefig = mocker.patch('matplotlib.pyplot.savefig')
-        mock_tight_layout = mocker.patch('matplotlib.pyplot.tight_layout')
-        
         output_path = str(tmp_path / "test_plot.png")
         
-        # Should not raise error
-        BenchmarkVisualizer.plot_quantization_results(
-            baseline_metrics=baseline,
-            quantization_results=quantization,
-            output_path=output_path
-        )
+        # Mock Figure.savefig to avoid actually creating file
+        with patch.object(Figure, "savefig") as mock_savefig, \
+                patch.object(Figure, "tight_layout") as mock_tight_layout:
+            # Should not raise error
+            BenchmarkVisualizer.plot_quantization_results(
+                baseline_metrics=baseline,
+                quantization_results=quantization,
+                output_path=output_path
+            )
         
         # Verify savefig was called
         mock_savefig.assert_called_once()
@@ -53,6 +53,16 @@ class TestBenchmarkVisualizer:
         assert "P95:" in captured.out
         assert "ms" in captured.out
     
+    def test_print_analysis_summary_invalid_results_print_nothing(self, mock_benchmark_results, capsys):
+        """Test that results missing a mode raise before any of the summary is printed."""
+        baseline, quantization = mock_benchmark_results
+        broken = {"scalar": {"no_rescoring": quantization["scalar"]["no_rescoring"]}}
+        
+        with pytest.raises(KeyError):
+            BenchmarkVisualizer.print_analysis_summary(baseline, broken)
+        
+        assert capsys.readouterr().out == ""
+    
     def test_print_analysis_shows_speedup(self, mock_benchmark_results, capsys):
         """Test that analysis summary shows speedup calculations."""
         baseline, quantization = mock_benchmark_results
@@ -92,7 +102,27 @@ class TestBenchmarkVisualizer:
         assert "avg latency" in captured.out
         assert "avg accuracy retention" in captured.out
     
-    def test_plot_with_empty_quantization_results(self, tmp_path, mocker):
+    def test_print_oversampling_analysis_format_and_order(self, capsys):
+        """Test factors are printed in ascending order with fixed-precision values."""
+        latency_results = {
+            5.0: {"avg_latency": 32.891, "p95_latency": 38.2},
+            2.0: {"avg_latency": 28.45, "p95_latency": 34.7},
+        }
+        accuracy_results = {2.0: {"avg_accuracy": 0.851}, 5.0: {"avg_accuracy": 0.97}}
+        
+        BenchmarkVisualizer.print_oversampling_analysis(latency_results, accuracy_results)
+        
+        captured = capsys.readouterr()
+        assert captured.out.endswith(
+            "\n  2.0x:\n"
+            "    28.45ms avg latency, 34.70ms P95 latency\n"
+            "    0.85 avg accuracy retention\n"
+            "\n  5.0x:\n"
+            "    32.89ms avg latency, 38.20ms P95 latency\n"
+            "    0.97 avg accuracy retention\n"
+        )
+    
+    def test_plot_with_empty_quantization_results(self, tmp_path):
         """Test plotting with minimal quantization results."""
         baseline = {
             "avg": 45.23,
@@ -112,19 +142,29 @@ class TestBenchmarkVisualizer:
             }
         }
         
-        mock_savefig = mocker.patch('matplotlib.pyplot.savefig')
-        
         output_path = str(tmp_path / "minimal_plot.png")
         
         # Should handle minimal data
-        BenchmarkVisualizer.plot_quantization_results(
-            baseline_metrics=baseline,
-            quantization_results=quantization,
-            output_path=output_path
-        )
+        with patch.object(Figure, "savefig") as mock_savefig:
+            BenchmarkVisualizer.plot_quantization_results(
+                baseline_metrics=baseline,
+                quantization_results=quantization,
+                output_path=output_path
+            )
         
         mock_savefig.assert_called_once()
     
+    def test_plot_writes_file_without_pyplot_figures(self, mock_benchmark_results, tmp_path):
+        """Test the figure is saved without registering a pyplot figure."""
+        baseline, quantization = mock_benchmark_results
+        output_path = tmp_path / "plot.png"
+        open_before = plt.get_fignums()
+        
+        BenchmarkVisualizer.plot_quantization_results(baseline, quantization, str(output_path))
+        
+        assert output_path.read_bytes().startswith(b"\x89PNG")
+        assert plt.get_fignums() == open_before
+    
     def test_print_analysis_with_multiple_methods(self, capsys):
         """Test analysis with multiple quantization methods."""
         baseline = {"avg": 50.0, "p50": 48.0, "p90": 55.0, "p95": 58.0, "p99": 62.0, "p99.5": 63.0}
@@ -169,52 +209,82 @@ class TestBenchmarkVisualizer:
         
         # Should show 2.0x speedup (100/50 = 2.0)
         assert "2.0x" in captured.out
+    
+    def test_speedups_per_metric_and_mode(self, capsys):
+        """Test average and P95 speedups are computed per rescoring mode."""
+        baseline = {"avg": 100.0, "p50": 100.0, "p90": 100.0, "p95": 80.0, "p99": 100.0, "p99.5": 100.0}
+        fast = {"avg": 50.0, "p50": 50.0, "p90": 50.0, "p95": 20.0, "p99": 50.0, "p99.5": 50.0}
+        
+        BenchmarkVisualizer.print_analysis_summary(
+            baseline, {"scalar": {"no_rescoring": fast, "with_rescoring": baseline}}
+        )
+        
+        captured = capsys.readouterr()
+        assert "Average: 50.00ms (2.0x)" in captured.out
+        assert "P95:     20.00ms (4.0x)" in captured.out
+        assert "Average: 100.00ms (1.0x)" in captured.out
+    
+    def test_print_analysis_without_quantization_results(self, capsys):
+        """Test the summary prints the baseline when there are no methods."""
+        baseline = {"avg": 100.0, "p50": 100.0, "p90": 100.0, "p95": 100.0, "p99": 100.0, "p99.5": 100.0}
+        
+        BenchmarkVisualizer.print_analysis_summary(baseline, {})
+        
+        captured = capsys.readouterr()
+        assert "Baseline Performance:" in captured.out
+        assert "x)" not in captured.out
 
 
 class TestVisualizationHelpers:
     """Tests for visualization helper methods."""
     
-    def test_plot_percentile_comparison_callable(self, mock_benchmark_results, mocker):
+    def test_plot_percentile_comparison_callable(self, mock_benchmark_results):
         """Test that _plot_percentile_comparison doesn't raise errors."""
         baseline, quantization = mock_benchmark_results
         
-        # Create a mock axes object
-        fig, ax = plt.subplots()
+        # Create an axes object without going through pyplot
+        ax = Figure().subplots()
         
         # Should not raise error
-        BenchmarkVisualizer._plot_percentile_comparison(ax, baseline, quantization)
-        
-        plt.close(fig)
+        BenchmarkVisualizer._plot_percentile_comparison(ax, _to_arrays(baseline, quantization))
     
     def test_plot_speedup_comparison_callable(self, mock_benchmark_results):
         """Test that _plot_speedup_comparison doesn't raise errors."""
         baseline, quantization = mock_benchmark_results
         
-        fig, ax = plt.subplots()
+        ax = Figure().subplots()
         
         # Should not raise error
-        BenchmarkVisualizer._plot_speedup_comparison(ax, baseline, quantization)
-        
-        plt.close(fig)
+        BenchmarkVisualizer._plot_speedup_comparison(ax, _to_arrays(baseline, quantization))
     
     def test_plot_rescoring_impact_callable(self, mock_benchmark_results):
         """Test that _plot_rescoring_impact doesn't raise errors."""
         baseline, quantization = mock_benchmark_results
         
-        fig, ax = plt.subplots()
+        ax = Figure().subplots()
         
         # Should not raise error
-        BenchmarkVisualizer._plot_rescoring_impact(ax, baseline, quantization)
-        
-        plt.close(fig)
+        BenchmarkVisualizer._plot_rescoring_impact(ax, _to_arrays(baseline, quantization))
     
     def test_plot_p95_table_callable(self, mock_benchmark_results):
         """Test that _plot_p95_table doesn't raise errors."""
         baseline, quantization = mock_benchmark_results
         
-        fig, ax = plt.subplots()
+        ax = Figure().subplots()
         
         # Should not raise error
-        BenchmarkVisualizer._plot_p95_table(ax, baseline, quantization)
+        BenchmarkVisualizer._plot_p95_table(ax, _to_arrays(baseline, quantization))
+    
+    def test_to_arrays_shapes_and_speedups(self, mock_benchmark_results):
+        """Test results are converted once into aligned latency and speedup arrays."""
+        baseline, quantization = mock_benchmark_results
         
-        plt.close(fig)
\ No newline at end of file
+        data = _to_arrays(baseline, quantization)
+        
+        assert data.methods == list(quantization)
+        assert data.latencies.shape == (len(quantization), 2, 7)
+        first = quantization[data.methods[0]]
+        assert data.latencies[0, 1, 0] == first["with_rescoring"]["avg"]
+        assert data.speedups[0, 0, 3] == pytest.approx(
+            baseline["p95"] / first["no_rescoring"]["p95"]
+        )